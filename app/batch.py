@@ -0,0 +1,235 @@
+import os
+import sys
+import glob
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
+
+def collect_images(inputs):
+    """Expand directories and glob patterns into a sorted list of image paths
+
+    Args:
+        inputs: Iterable of directories, glob patterns or file paths
+
+    Returns:
+        list: Absolute image paths, de-duplicated and sorted
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            candidates = glob.glob(os.path.join(item, '**', '*'), recursive=True)
+        else:
+            candidates = glob.glob(item, recursive=True)
+
+        for candidate in candidates:
+            if os.path.isfile(candidate) and candidate.lower().endswith(IMAGE_EXTENSIONS):
+                paths.add(os.path.abspath(candidate))
+
+    return sorted(paths)
+
+
+def load_checkpoint(output_path):
+    """Return the set of image paths already processed successfully in output_path"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A partially written last line from an interrupted run
+                continue
+            if not record.get('error'):
+                done.add(record.get('path'))
+
+    return done
+
+
+def init_worker(max_pixels, workers=1):
+    """Process pool initializer: apply settings once per worker process"""
+    from app.core.image_analysis import ImageAnalyzer
+    from app.core.rate_limit import RateLimiter, BATCH
+    from app.core.clients import ClientRegistry
+
+    if max_pixels is not None:
+        ImageAnalyzer.max_pixels = max_pixels
+
+    # The pool already runs one image per process; a multi-engine OCR backend in
+    # every worker would load up to [OCR] workers Tesseract engines each.
+    # Only this process's in-memory settings change, config.ini is not written.
+    config = ClientRegistry().config_manager().config
+    if not config.has_section('OCR'):
+        config.add_section('OCR')
+    config.set('OCR', 'workers', '1')
+
+    # Each worker has its own limiter, so together they stay within the quota
+    RateLimiter.quota_share = 1.0 / workers
+    RateLimiter.default_priority = BATCH
+
+
+def error_record(path, mode, error):
+    """Record for an image that could not be processed"""
+    return {
+        'path': path,
+        'mode': mode,
+        'type': None,
+        'text': None,
+        'is_code': False,
+        'analysis': None,
+        'speculation': None,
+        'error': error
+    }
+
+
+def process_path(path, mode, use_ai):
+    """Run the OCR/analysis pipeline on a single image file (executed in a worker process)
+
+    Args:
+        path: Image file path
+        mode: Processing mode ('auto', 'code', 'general', 'image')
+        use_ai: bool, whether image analysis may call the vision API
+
+    Returns:
+        dict: JSON-serialisable record for the image
+    """
+    from PIL import Image
+    from app.core.ocr import OCRProcessor
+
+    record = error_record(path, mode, None)
+
+    try:
+        with Image.open(path) as image:
+            result = OCRProcessor.process_image(image.convert('RGB'), mode, use_ai=use_ai)
+
+        record['type'] = result['type']
+        record['speculation'] = result.get('speculation')
+        if result['type'] == 'image_analysis':
+            record['analysis'] = result['content']
+        else:
+            record['text'] = result['content']
+            record['is_code'] = bool(result.get('is_code'))
+    except Exception as e:
+        record['error'] = str(e)
+
+    return record
+
+
+def run_batch(paths, output_path, mode='auto', workers=None, use_ai=False, resume=True, max_pixels=None):
+    """Process images on a process pool and append one JSONL record per image
+
+    Args:
+        paths: List of image paths
+        output_path: JSONL file to append records to (also used as the checkpoint)
+        mode: Processing mode passed to OCRProcessor.process_image
+        workers: Number of worker processes (defaults to the CPU count)
+        use_ai: bool, whether image analysis may call the vision API
+        resume: bool, skip images already recorded without error in output_path
+        max_pixels: Image analysis resolution budget (None keeps the default)
+
+    Returns:
+        tuple: (processed, failed, skipped) counts
+    """
+    done = load_checkpoint(output_path) if resume else set()
+    pending = [path for path in paths if path not in done]
+    skipped = len(paths) - len(pending)
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    processed = failed = 0
+
+    mode_flag = 'a' if resume else 'w'
+    with open(output_path, mode_flag, encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(max_pixels, workers)) as executor:
+        queue = iter(pending)
+        # future -> image path, so a crashed pool can report what was lost
+        in_flight = {}
+
+        while True:
+            # Keep a bounded number of images in flight so huge archives don't
+            # queue every task up front
+            for path in queue:
+                in_flight[executor.submit(process_path, path, mode, use_ai)] = path
+                if len(in_flight) >= max_in_flight:
+                    break
+
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            records = []
+            broken = None
+            for future in finished:
+                path = in_flight.pop(future)
+                try:
+                    records.append(future.result())
+                except BrokenProcessPool as e:
+                    broken = e
+                    records.append(error_record(path, mode, f"Worker process died: {e}"))
+
+            if broken is not None:
+                # A worker crashed (e.g. out of memory); the pool can't run anything else.
+                # The lost images are recorded as failed so a resumed run retries them.
+                lost = list(in_flight.values()) + list(queue)
+                in_flight.clear()
+                records.extend(error_record(path, mode, f"Worker process died: {broken}") for path in lost)
+
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                if record['error']:
+                    failed += 1
+                else:
+                    processed += 1
+            out.flush()
+
+            print(f"\rProcessed {processed + failed}/{len(pending)} ({failed} failed)", end='', flush=True)
+
+    if pending:
+        print()
+
+    return processed, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run OCR and image analysis over directories of images")
+    parser.add_argument('inputs', nargs='+', help="Image directories, glob patterns or files")
+    parser.add_argument('-o', '--output', default='results.jsonl', help="JSONL output file (default: results.jsonl)")
+    parser.add_argument('-m', '--mode', default='auto', choices=['auto', 'code', 'general', 'image'],
+                        help="Processing mode (default: auto)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--use-ai', action='store_true', help="Allow image analysis to call the vision API")
+    parser.add_argument('--max-pixels', type=int, default=None,
+                        help="Downscale frames above this many pixels for image analysis (0 = full resolution)")
+    parser.add_argument('--no-resume', action='store_true', help="Overwrite the output instead of resuming from it")
+    args = parser.parse_args(argv)
+
+    paths = collect_images(args.inputs)
+    if not paths:
+        print("No images found.")
+        return 1
+
+    processed, failed, skipped = run_batch(
+        paths, args.output,
+        mode=args.mode,
+        workers=args.workers,
+        use_ai=args.use_ai,
+        resume=not args.no_resume,
+        max_pixels=args.max_pixels
+    )
+    print(f"Done: {processed} processed, {failed} failed, {skipped} skipped (already in {args.output})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
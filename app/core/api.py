@@ -1,9 +1,67 @@
 import json
-import requests
+import time
+import threading
+from .http_session import PooledSession
+from .cache import ResponseCache, normalize_text
+from .clients import ClientRegistry
+from .prompt import DEFAULT_TOKEN_BUDGET, compact_text
+from .code_classifier import classify_code, language_label, DEFAULT_THRESHOLD as DEFAULT_CODE_THRESHOLD
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+DEFAULT_MODEL = "gemini-2.0-flash"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+CODE_PROMPT_TEMPLATE = (
+    "The following text contains a coding question or code-related problem. "
+    "Please analyze it and provide a helpful, detailed response that includes:\n"
+    "1. A clear explanation of the problem or question\n"
+    "2. A complete solution with working code examples\n"
+    "3. An explanation of how the code works\n"
+    "4. If there are errors in the original code, identify and fix them\n\n"
+    "Text to analyze:\n{text}"
+)
+# Added to the coding prompt when the language of the text was recognised
+LANGUAGE_HINT_TEMPLATE = "\n\nThe code is most likely {language}; answer in {language} unless asked otherwise."
+GENERAL_PROMPT_TEMPLATE = "Please analyze the following text extracted from a screenshot and provide a helpful response:\n\n{text}"
 
 class GeminiAPI:
     def __init__(self, config_manager):
         self.config_manager = config_manager
+        self.http = PooledSession.from_config(config_manager)
+        self.cache = ClientRegistry().response_cache()
+        self._urls = {}
+        self._local = threading.local()
+
+    @property
+    def model(self):
+        return self.config_manager.get('API', 'model', fallback=DEFAULT_MODEL)
+
+    @property
+    def last_timings(self):
+        """Connect/TTFB/total timings of the last request made on this thread"""
+        return getattr(self._local, 'timings', None)
+
+    @property
+    def last_cache_hit(self):
+        """Whether the last query on this thread was answered from the response cache"""
+        return getattr(self._local, 'cache_hit', False)
+
+    @property
+    def last_prompt_stats(self):
+        """Token counts before and after compaction of the last prompt built on this thread"""
+        return getattr(self._local, 'prompt_stats', None)
+
+    def cache_enabled(self):
+        return self.config_manager.getboolean('Cache', 'enabled', fallback=True)
+
+    def _endpoint_url(self, api_key, method):
+        """Return the endpoint URL, rebuilding it only when the key or model changes"""
+        cache_key = (api_key, self.model, method)
+        url = self._urls.get(cache_key)
+        if url is None:
+            url = f"{GEMINI_BASE_URL}/{self.model}:{method}?key={api_key}"
+            self._urls[cache_key] = url
+        return url
 
     def format_image_analysis(self, analysis):
         """Format image analysis results into a descriptive response"""
@@ -19,6 +77,9 @@ class GeminiAPI:
         colors = analysis['color_analysis']
         response.append("Colors:")
         response.append(f"- Dominant colors: {', '.join(colors['dominant_colors'])}")
+        if colors.get('palette'):
+            palette = ', '.join(f"{c['name']} {c['hex']} ({c['coverage']}%)" for c in colors['palette'])
+            response.append(f"- Palette: {palette}")
         response.append(f"- Overall brightness: {colors['brightness']}\n")
 
         # Composition analysis
@@ -38,59 +99,179 @@ class GeminiAPI:
 
         return '\n'.join(response)
 
-    def query_gemini(self, text, is_code_related=False):
+    def _prepare_prompt(self, text, is_code_related, use_cache, language=None):
+        """Build the prompt and look it up in the response cache
+
+        The OCR text is compacted to the [Prompt] token budget first, so
+        captures that differ only in noise share a cache entry. Coding
+        prompts name the language of the text; when the caller doesn't pass
+        one it is classified here.
+
+        Returns:
+            tuple: (prompt, cache_key or None, cached response or None)
+        """
+        self._local.prompt_stats = None
+        if self.config_manager.getboolean('Prompt', 'compact', fallback=True):
+            token_budget = self.config_manager.getint('Prompt', 'token_budget', fallback=DEFAULT_TOKEN_BUDGET)
+            text, self._local.prompt_stats = compact_text(text, token_budget)
+
+        # Choose a prompt based on whether this is code-related
+        template = CODE_PROMPT_TEMPLATE if is_code_related else GENERAL_PROMPT_TEMPLATE
+        prompt = template.format(text=text)
+        if is_code_related:
+            if not language:
+                threshold = self.config_manager.getfloat('Analysis', 'code_threshold', fallback=DEFAULT_CODE_THRESHOLD)
+                language = classify_code(text, threshold)['language']
+            if language:
+                prompt += LANGUAGE_HINT_TEMPLATE.format(language=language_label(language))
+        else:
+            language = None
+
+        # Repeated captures of the same content are answered from the cache
+        cache_key = None
+        cached = None
+        if use_cache and self.cache_enabled():
+            mode = 'code' if is_code_related else 'general'
+            if language:
+                mode = f"{mode}:{language}"
+            cache_key = ResponseCache.make_key(normalize_text(text), mode, template, self.model)
+            cached = self.cache.get(cache_key)
+
+        return prompt, cache_key, cached
+
+    @staticmethod
+    def _build_body(prompt):
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }]
+        }
+        # Serialise once; retries re-send the same bytes
+        return json.dumps(payload).encode('utf-8')
+
+    @staticmethod
+    def _error_message(response):
+        error_msg = f"API Error: {response.status_code}"
+        try:
+            error_details = response.json()
+            if "error" in error_details:
+                error_msg += f" - {error_details['error']['message']}"
+        except:
+            error_msg += f" - {response.text}"
+        return error_msg
+
+    def limiter(self):
+        """Rate limiter for the configured model, shared across the process"""
+        return ClientRegistry().rate_limiter(self.model)
+
+    def query_gemini(self, text, is_code_related=False, use_cache=True, priority=None, language=None):
         try:
             api_key = self.config_manager.get('API', 'gemini_api_key')
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
+            self._local.timings = None
+            self._local.cache_hit = False
+            self._local.prompt_stats = None
 
             # Handle image analysis results
             if isinstance(text, dict) and 'type' in text and text['type'] == 'image_analysis':
                 return self.format_image_analysis(text['content'])
 
-            # Choose a prompt based on whether this is code-related
-            if is_code_related:
-                prompt = (
-                    "The following text contains a coding question or code-related problem. "
-                    "Please analyze it and provide a helpful, detailed response that includes:\n"
-                    "1. A clear explanation of the problem or question\n"
-                    "2. A complete solution with working code examples\n"
-                    "3. An explanation of how the code works\n"
-                    "4. If there are errors in the original code, identify and fix them\n\n"
-                    f"Text to analyze:\n{text}"
-                )
-            else:
-                prompt = f"Please analyze the following text extracted from a screenshot and provide a helpful response:\n\n{text}"
-
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": prompt
-                    }]
-                }]
-            }
+            prompt, cache_key, cached = self._prepare_prompt(text, is_code_related, use_cache, language)
+            if cached is not None:
+                self._local.cache_hit = True
+                return cached
 
-            headers = {
-                "Content-Type": "application/json"
-            }
-
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
+            response, timings = self.http.post(
+                self._endpoint_url(api_key, 'generateContent'), self._build_body(prompt), JSON_HEADERS,
+                limiter=self.limiter(), priority=priority
+            )
+            self._local.timings = timings
 
             if response.status_code == 200:
                 data = response.json()
                 if "candidates" in data and len(data["candidates"]) > 0:
                     # Extract the text from the response
-                    return data["candidates"][0]["content"]["parts"][0]["text"]
+                    result = data["candidates"][0]["content"]["parts"][0]["text"]
+                    if cache_key:
+                        self.cache.put(cache_key, result)
+                    return result
                 else:
                     return "No response content found in the API result."
             else:
-                error_msg = f"API Error: {response.status_code}"
-                try:
-                    error_details = response.json()
-                    if "error" in error_details:
-                        error_msg += f" - {error_details['error']['message']}"
-                except:
-                    error_msg += f" - {response.text}"
-                return error_msg
+                return self._error_message(response)
 
         except Exception as e:
             return f"Error connecting to Gemini API: {str(e)}"
+
+    def stream_gemini(self, text, is_code_related=False, use_cache=True, priority=None, language=None):
+        """Yield the response text in chunks as they arrive
+
+        Uses the server-sent events variant of streamGenerateContent so the
+        first tokens can be shown long before the full answer is complete.
+        Errors are yielded as text, the same way query_gemini returns them.
+        The timings of the call gain a 'ttft' (time to first token) entry.
+
+        Args:
+            text: OCR text to analyze
+            is_code_related: bool, whether to use the coding prompt
+            use_cache: bool, whether a cached response may be returned
+            priority: rate_limit.INTERACTIVE or BATCH; requests over the model's
+                      quota wait in priority order
+            language: classify_code language of the text for the coding prompt;
+                      classified from the text when None
+
+        Yields:
+            str: Response text fragments in order
+        """
+        self._local.timings = None
+        self._local.cache_hit = False
+
+        try:
+            prompt, cache_key, cached = self._prepare_prompt(text, is_code_related, use_cache, language)
+            if cached is not None:
+                self._local.cache_hit = True
+                yield cached
+                return
+
+            api_key = self.config_manager.get('API', 'gemini_api_key')
+            call_start = time.perf_counter()
+            response, timings = self.http.post(
+                self._endpoint_url(api_key, 'streamGenerateContent') + "&alt=sse",
+                self._build_body(prompt), JSON_HEADERS, stream=True,
+                limiter=self.limiter(), priority=priority
+            )
+            self._local.timings = timings
+
+            if response.status_code != 200:
+                yield self._error_message(response)
+                return
+
+            # SSE responses don't always declare a charset
+            response.encoding = 'utf-8'
+            parts = []
+            with response:
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith('data:'):
+                        continue
+
+                    data = json.loads(line[5:])
+                    for candidate in data.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            chunk = part.get("text")
+                            if not chunk:
+                                continue
+                            if not parts:
+                                timings['ttft'] = time.perf_counter() - call_start
+                            parts.append(chunk)
+                            yield chunk
+
+            timings['total'] = time.perf_counter() - call_start
+
+            if not parts:
+                yield "No response content found in the API result."
+            elif cache_key:
+                self.cache.put(cache_key, ''.join(parts))
+
+        except Exception as e:
+            yield f"\n\nError connecting to Gemini API: {str(e)}"
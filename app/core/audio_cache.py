@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import wave
+import hashlib
+import sqlite3
+import threading
+
+DEFAULT_AUDIO_CACHE_DIR = os.path.join('cache', 'audio')
+
+# How often playback checks whether it should stop
+PLAYBACK_POLL_INTERVAL = 0.02
+
+
+class AudioCache:
+    """Disk cache of synthesised speech, one WAV file per text chunk
+
+    Files are keyed on the chunk and the voice settings it was synthesised
+    with. A small SQLite index records each file's size, the time its
+    synthesis took and when it was last played; once the files exceed
+    max_bytes the least recently played are deleted.
+    """
+
+    def __init__(self, directory=DEFAULT_AUDIO_CACHE_DIR, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.db'), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS clips ("
+            " key TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " synthesis_ms REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_clips_last_access ON clips (last_access)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create a cache using the [Speech] section of the configuration"""
+        return cls(
+            directory=config_manager.get('Speech', 'cache_dir', fallback=DEFAULT_AUDIO_CACHE_DIR),
+            max_bytes=int(config_manager.getfloat('Speech', 'cache_max_size_mb', fallback=200) * 1024 * 1024)
+        )
+
+    @staticmethod
+    def make_key(text, voice, rate, volume):
+        """Build the cache key of a chunk spoken with the given voice settings
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        for part in (str(voice), str(rate), f"{float(volume):.3f}", text):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + '.wav')
+
+    def temp_path(self, key):
+        """Path the engine writes a new clip to before store() moves it into place"""
+        return os.path.join(self.directory, key + '.tmp.wav')
+
+    def contains(self, key):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM clips WHERE key = ?", (key,)).fetchone() is not None
+
+    def lookup(self, key):
+        """Return the path of the clip for key, or None on a miss
+
+        A hit counts the clip's recorded synthesis time as saved.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT synthesis_ms FROM clips WHERE key = ?", (key,)).fetchone()
+            path = self.path_for(key)
+            if row is not None and not os.path.exists(path):
+                self._conn.execute("DELETE FROM clips WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE clips SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            self.saved_ms += row[0]
+            return path
+
+    def store(self, key, temp_path, synthesis_ms):
+        """Move a clip written to temp_path into the cache and evict over the size budget"""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clips (key, size, synthesis_ms, last_access) VALUES (?, ?, ?, ?)",
+                (key, size, synthesis_ms, time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def discard(self, key):
+        """Forget a clip that turned out to be unplayable"""
+        with self._lock:
+            self._conn.execute("DELETE FROM clips WHERE key = ?", (key,))
+            self._conn.commit()
+        self._remove(self.path_for(key))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM clips").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM clips ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM clips WHERE key = ?", stale)
+        for (key,) in stale:
+            self._remove(self.path_for(key))
+
+    def clear(self):
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute("SELECT key FROM clips")]
+            self._conn.execute("DELETE FROM clips")
+            self._conn.commit()
+        for key in keys:
+            self._remove(self.path_for(key))
+
+    def stats(self):
+        """Return hit/miss counters and synthesis time saved in this process, and the cache size"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'saved_ms': self.saved_ms,
+            'entries': entries,
+            'size_bytes': size
+        }
+
+
+def wav_duration(path):
+    with wave.open(path, 'rb') as clip:
+        return clip.getnframes() / float(clip.getframerate())
+
+
+class WinsoundPlayer:
+    """Plays WAV clips with the winsound module that ships with Python on Windows"""
+
+    def __init__(self):
+        import winsound
+        self._winsound = winsound
+
+    def play(self, path, should_stop):
+        """Play a clip, polling should_stop() to cut it short
+
+        Returns:
+            bool: False if playback was stopped
+        """
+        duration = wav_duration(path)
+        self._winsound.PlaySound(path, self._winsound.SND_FILENAME | self._winsound.SND_ASYNC)
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            if should_stop():
+                self._winsound.PlaySound(None, self._winsound.SND_PURGE)
+                return False
+            time.sleep(PLAYBACK_POLL_INTERVAL)
+        return True
+
+
+class SimpleAudioPlayer:
+    """Plays WAV clips with the optional simpleaudio package"""
+
+    def __init__(self):
+        import simpleaudio
+        self._simpleaudio = simpleaudio
+
+    def play(self, path, should_stop):
+        playback = self._simpleaudio.WaveObject.from_wave_file(path).play()
+        while playback.is_playing():
+            if should_stop():
+                playback.stop()
+                return False
+            time.sleep(PLAYBACK_POLL_INTERVAL)
+        return True
+
+
+def create_audio_player():
+    """Return a player for cached clips, or None when this platform has none
+
+    Without a player the speech worker doesn't cache audio at all.
+    """
+    candidates = [WinsoundPlayer] if sys.platform == 'win32' else []
+    candidates.append(SimpleAudioPlayer)
+    for player in candidates:
+        try:
+            return player()
+        except ImportError:
+            continue
+    return None
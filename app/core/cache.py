@@ -0,0 +1,168 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_CACHE_PATH = os.path.join('cache', 'responses.db')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """Normalise OCR text for cache lookups so spacing differences still hit"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def image_digest(image, max_pixels=None):
+    """Exact content digest of a Frame or PIL image, for caching vision responses
+
+    Hashes the pixels of the frame downscaled to max_pixels, i.e. the image
+    that is actually uploaded, so any visible difference (other text in the
+    same dialog) gives a different key.
+
+    Args:
+        image: Frame or PIL Image object
+        max_pixels: Upload resolution budget (None hashes full resolution)
+
+    Returns:
+        str: SHA-256 hex digest including the image dimensions
+    """
+    import numpy as np
+    from .frame import Frame
+
+    frame = Frame.coerce(image).resize(max_pixels)
+    digest = hashlib.sha256()
+    width, height = frame.size
+    digest.update(f"{width}x{height}:{frame.channel_order}:".encode('ascii'))
+    digest.update(memoryview(np.ascontiguousarray(frame.pixels)).cast('B'))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Persistent, size-bounded LRU cache for API responses backed by SQLite"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=50 * 1024 * 1024, ttl=7 * 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create a cache using the [Cache] section of the configuration"""
+        return cls(
+            path=config_manager.get('Cache', 'path', fallback=DEFAULT_CACHE_PATH),
+            max_bytes=int(config_manager.getfloat('Cache', 'max_size_mb', fallback=50) * 1024 * 1024),
+            ttl=config_manager.getfloat('Cache', 'ttl_hours', fallback=168) * 3600
+        )
+
+    @staticmethod
+    def make_key(content, mode, prompt_template, model):
+        """Build a content-addressed cache key
+
+        Args:
+            content: Normalised OCR text, or image_digest() of the uploaded image
+            mode: Processing mode the response was generated for
+            prompt_template: Prompt template used for the request
+            model: Model name
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        digest = hashlib.sha256()
+        for part in (model, mode, prompt_template, content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created = row
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store value under key and evict least recently used entries over the size budget"""
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_access, hits)"
+                " VALUES (?, ?, ?, ?, ?, 0)",
+                (key, value, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters for this process and the number of stored entries"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': size
+        }
@@ -0,0 +1,125 @@
+import threading
+
+import numpy as np
+
+BACKEND_NAMES = ('auto', 'mss', 'pil')
+
+
+def region_to_box(region):
+    """Convert an (x1, y1, x2, y2) region to (left, top, width, height)"""
+    x1, y1, x2, y2 = region
+    return x1, y1, x2 - x1, y2 - y1
+
+
+class CaptureBackend:
+    """Interface for screen capture implementations
+
+    grab() returns pixels as a NumPy array in the backend's channel_order
+    ('RGB' or 'BGRA'), which may be a view of a buffer owned by the backend.
+    """
+    name = 'base'
+    channel_order = 'RGB'
+
+    def grab(self, region=None, monitor=None):
+        """Capture pixels
+
+        Args:
+            region: Optional (x1, y1, x2, y2) screen coordinates
+            monitor: Optional monitor index (1-based; 0 = all monitors);
+                     ignored when region is given
+
+        Returns:
+            numpy.ndarray: H x W x channels uint8 array
+        """
+        raise NotImplementedError
+
+    def monitors(self):
+        """Return monitor geometries as (left, top, width, height), index 0 = all monitors"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PILCaptureBackend(CaptureBackend):
+    """PIL.ImageGrab; allocates a new image on every call"""
+    name = 'pil'
+    channel_order = 'RGB'
+
+    def __init__(self):
+        from PIL import ImageGrab
+        self._image_grab = ImageGrab
+
+    def grab(self, region=None, monitor=None):
+        if region is None and monitor:
+            left, top, width, height = self.monitors()[monitor]
+            region = (left, top, left + width, top + height)
+        image = self._image_grab.grab(bbox=region) if region else self._image_grab.grab()
+        return np.asarray(image.convert('RGB'))
+
+    def monitors(self):
+        width, height = self._image_grab.grab().size
+        return [(0, 0, width, height), (0, 0, width, height)]
+
+
+class MSSCaptureBackend(CaptureBackend):
+    """Shared-memory capture through mss (XShmGetImage on X11, BitBlt on Windows)
+
+    The returned array is a zero-copy BGRA view of the buffer mss filled for
+    that grab; no extra conversion or copy happens here. mss handles are not
+    thread-safe, so a single long-lived handle (with its display connection
+    and shared-memory segment) is shared by all threads behind a lock rather
+    than opening one per thread that would stay open for the process's life.
+    """
+    name = 'mss'
+    channel_order = 'BGRA'
+
+    def __init__(self):
+        import mss
+        self._mss = mss
+        self._handle = None
+        self._lock = threading.Lock()
+
+    def _get_handle(self):
+        # Called with self._lock held
+        if self._handle is None:
+            self._handle = self._mss.mss()
+        return self._handle
+
+    def grab(self, region=None, monitor=None):
+        with self._lock:
+            handle = self._get_handle()
+            if region is not None:
+                left, top, width, height = region_to_box(region)
+                area = {'left': left, 'top': top, 'width': width, 'height': height}
+            else:
+                # Like ImageGrab.grab(), capture the primary monitor unless told otherwise
+                area = handle.monitors[1 if monitor is None else monitor]
+
+            shot = handle.grab(area)
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def monitors(self):
+        with self._lock:
+            return [(m['left'], m['top'], m['width'], m['height']) for m in self._get_handle().monitors]
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def create_capture_backend(config_manager):
+    """Create the capture backend selected by [Capture] backend ('auto' prefers mss)"""
+    name = config_manager.get('Capture', 'backend', fallback='auto').strip().lower()
+    if name not in BACKEND_NAMES:
+        raise ValueError(f"Unknown capture backend '{name}', expected one of: {', '.join(BACKEND_NAMES)}")
+
+    if name in ('auto', 'mss'):
+        try:
+            return MSSCaptureBackend()
+        except ImportError:
+            pass
+    return PILCaptureBackend()
+
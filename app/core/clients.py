@@ -0,0 +1,122 @@
+from threading import Lock, RLock
+
+
+class ClientRegistry:
+    """Process-wide, lazily initialised configuration and API clients
+
+    Every part of core shares one ConfigManager and one instance of each
+    client. A client is rebuilt only when the settings it was built from
+    (API key, model) change.
+    """
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(ClientRegistry, cls).__new__(cls)
+                cls._instance._initialize()
+            return cls._instance
+
+    def _initialize(self):
+        self._config_manager = None
+        self._clients = {}  # name -> (signature, client)
+        self._clients_lock = RLock()
+
+    def set_config_manager(self, config_manager):
+        """Use an existing ConfigManager (e.g. the one owned by the main window)"""
+        with self._clients_lock:
+            self._config_manager = config_manager
+
+    def config_manager(self):
+        """Return the shared ConfigManager, reading config.ini on first use"""
+        with self._clients_lock:
+            if self._config_manager is None:
+                from ..utils.config import ConfigManager
+                self._config_manager = ConfigManager()
+            return self._config_manager
+
+    def _get(self, name, signature, factory):
+        with self._clients_lock:
+            entry = self._clients.get(name)
+            if entry is None or entry[0] != signature:
+                entry = (signature, factory())
+                self._clients[name] = entry
+            return entry[1]
+
+    def response_cache(self):
+        from .cache import ResponseCache, DEFAULT_CACHE_PATH
+
+        config = self.config_manager()
+        path = config.get('Cache', 'path', fallback=DEFAULT_CACHE_PATH)
+        return self._get('response_cache', path, lambda: ResponseCache.from_config(config))
+
+    def history_store(self):
+        from .history import HistoryStore, DEFAULT_HISTORY_PATH
+
+        config = self.config_manager()
+        path = config.get('History', 'path', fallback=DEFAULT_HISTORY_PATH)
+        with self._clients_lock:
+            previous = self._clients.get('history_store')
+            store = self._get('history_store', path, lambda: HistoryStore.from_config(config))
+            if previous is not None and previous[1] is not store:
+                previous[1].close()
+            return store
+
+    def gemini_api(self):
+        from .api import GeminiAPI
+
+        # GeminiAPI reads the key and model per request, so one instance (and
+        # its connection pool) serves the whole process
+        config = self.config_manager()
+        return self._get('gemini_api', None, lambda: GeminiAPI(config))
+
+    def vision_analyzer(self):
+        from .vision_analysis import VisionAnalyzer, VISION_MODEL
+
+        config = self.config_manager()
+        signature = (
+            config.get('API', 'gemini_api_key'),
+            config.get('API', 'vision_model', fallback=VISION_MODEL)
+        )
+        return self._get('vision_analyzer', signature, lambda: VisionAnalyzer(config))
+
+    def rate_limiter(self, model):
+        """Return the limiter shared by every request to model"""
+        from .rate_limit import RateLimiter
+
+        config = self.config_manager()
+        signature = (
+            config.get('RateLimit', 'requests_per_minute', fallback=None),
+            config.get('RateLimit', model, fallback=None),
+            config.get('RateLimit', 'burst', fallback=None)
+        )
+        return self._get(('rate_limiter', model), signature, lambda: RateLimiter.from_config(config, model))
+
+    def ocr_backend(self):
+        from .ocr_backends import create_ocr_backend
+
+        config = self.config_manager()
+        signature = (
+            config.get('OCR', 'backend', fallback='auto'),
+            config.get('OCR', 'workers', fallback=None),
+            config.get('OCR', 'lang', fallback='eng')
+        )
+        with self._clients_lock:
+            previous = self._clients.get('ocr_backend')
+            backend = self._get('ocr_backend', signature, lambda: create_ocr_backend(config))
+            if previous is not None and previous[1] is not backend:
+                previous[1].close()
+            return backend
+
+    def capture_backend(self):
+        from .capture import create_capture_backend
+
+        config = self.config_manager()
+        signature = config.get('Capture', 'backend', fallback='auto')
+        return self._get('capture_backend', signature, lambda: create_capture_backend(config))
+
+    def reset(self):
+        """Drop all clients so they are rebuilt on next use"""
+        with self._clients_lock:
+            self._clients.clear()
@@ -0,0 +1,237 @@
+from collections import Counter
+
+# Text scoring at least this is treated as code or a coding question
+DEFAULT_THRESHOLD = 0.35
+
+# Tokens that are only common in code, with their weight
+CODE_TOKENS = {
+    '{': 0.5, '}': 0.5, ';': 0.5, '[': 0.2, ']': 0.2, '=': 0.7, '$': 0.5, '@': 0.3, '*': 0.3, '%': 0.5,
+    '===': 2, '!==': 2, '==': 1.5, '!=': 1.5, '=>': 1.5, '->': 1.5, '::': 1.5, ':=': 2,
+    '&&': 1.5, '||': 1.5, '+=': 1.5, '-=': 1.5, '<=': 0.7, '>=': 0.7, '++': 1.5, '<<': 1,
+    'return': 1.5, 'else': 0.5, 'elif': 2, 'def': 2, 'self': 1.5, 'lambda': 1.5, 'None': 1,
+    'null': 1.5, 'nil': 1.5, 'undefined': 1.5, 'true': 1, 'false': 1, 'True': 0.5, 'False': 0.5,
+    'const': 1.5, 'var': 1, 'let': 0.5, 'function': 0.5, 'func': 2, 'fn': 2, 'int': 1, 'void': 2,
+    'struct': 2, 'public': 1, 'private': 1, 'static': 1, 'async': 1, 'await': 1.5, 'try': 0.5,
+    'catch': 1, 'except': 1, 'throw': 1, 'raise': 0.5, 'new': 0.3, 'this': 0.2, 'typeof': 2,
+    'printf(': 2, 'print(': 1.5, 'len(': 1.5, 'range(': 1.5, 'println!': 2, 'std': 1.5,
+    'SELECT': 2, 'FROM': 1, 'WHERE': 1.5, 'JOIN': 1.5, 'INSERT': 2, 'VALUES': 1.5,
+    'Traceback': 3, 'Exception': 1, 'NullPointerException': 3, 'TypeError': 2, 'KeyError': 2,
+    'ValueError': 2, 'Uncaught': 2, 'import': 1, 'sudo': 2, 'echo': 1, 'grep': 1.5, 'chmod': 2, 'fi': 1,
+}
+
+# Words of a programming question written in prose
+QUESTION_TOKENS = {
+    'code': 1, 'program': 1, 'programming': 1.5, 'algorithm': 1, 'array': 1.5, 'arrays': 1.5,
+    'integer': 1.5, 'integers': 1.5, 'string': 1, 'substring': 2, 'loop': 1, 'recursion': 2,
+    'compile': 1.5, 'compiler': 1.5, 'debug': 1.5, 'bug': 1, 'syntax': 1.5, 'runtime': 1.5,
+    'complexity': 1.5, 'implement': 1.5, 'Implement': 1.5, 'variable': 1, 'method': 1,
+    'function': 0.5, 'list': 0.5, 'object': 0.5, 'error': 0.5, 'singly': 2,
+    'query': 1, 'null': 0.5, 'segmentation': 1, 'linked': 1, 'binary': 1, 'sorted': 0.5,
+    'Input': 1, 'Output': 1, 'Constraints': 2, 'Example': 0.5, 'indices': 1, 'index': 0.5,
+    'Python': 3, 'JavaScript': 3, 'Java': 3, 'SQL': 3, 'TypeScript': 3, 'Rust': 1.5, 'PHP': 3,
+}
+
+# Common English words; their share of the text pulls the score towards prose
+PROSE_TOKENS = frozenset((
+    'the', 'The', 'and', 'of', 'to', 'a', 'A', 'is', 'in', 'that', 'with', 'for', 'on', 'at',
+    'by', 'was', 'are', 'be', 'it', 'It', 'as', 'or', 'we', 'We', 'you', 'You', 'your', 'our',
+    'they', 'their', 'will', 'can', 'have', 'has', 'this', 'This', 'from', 'an', 'she', 'he',
+    'her', 'his', 'please', 'Please', 'would', 'should', 'there', 'which', 'about', 'more',
+    'than', 'may', 'also', 'into', 'after', 'before', 'were', 'been', 'all', 'any',
+))
+
+# Tokens characteristic of one language: token -> (language, weight)
+LANGUAGE_TOKENS = {
+    'python': {
+        'def': 3, 'elif': 4, 'self': 2, 'None': 2, 'lambda': 2, 'print(': 2, 'len(': 2, 'range(': 2,
+        'import': 1, '__init__': 4, 'Traceback': 4, 'KeyError': 3, 'ValueError': 3, 'NoneType': 4,
+        'TypeError': 1, 'True': 1, 'False': 1, 'pip': 2, '.py': 4, 'Python': 4, 'except': 2, 'async': 0.5,
+    },
+    'javascript': {
+        'const': 2, 'let': 2, 'var': 1, 'function': 2, 'function(': 2, '=>': 1.5, '===': 3, '!==': 3,
+        'console': 3, 'undefined': 2, 'document': 2, 'require(': 3, 'useState(': 4, 'await': 1,
+        'export': 1.5, 'npm': 2, 'JavaScript': 4, 'TypeScript': 4, 'Uncaught': 4, 'TypeError': 1,
+        'null': 0.5, 'typeof': 3, 'this': 0.5, '.js': 4, '.jsx': 4, '.ts': 4, '.tsx': 4,
+    },
+    'java': {
+        'public': 2, 'private': 1.5, 'static': 1, 'void': 1, 'String': 1.5, 'System': 3, 'new': 1,
+        'extends': 2, 'implements': 3, 'Override': 3, 'instanceof': 3, 'ArrayList': 3, 'HashMap': 3,
+        'Integer': 2, 'NullPointerException': 4, 'Java': 4, 'java': 2, 'boolean': 3, 'final': 2,
+        '.java': 4,
+    },
+    'c': {
+        '#include': 2, 'printf(': 4, 'malloc(': 4, 'free(': 3, 'sizeof(': 3, 'struct': 3, 'int': 1,
+        '->': 1, 'void': 1, 'char': 2, 'scanf(': 4, 'NULL': 2, 'segmentation': 1, '.c': 3, '.h': 2,
+    },
+    'cpp': {
+        '#include': 2, 'std': 4, 'cout': 4, 'cin': 4, 'nullptr': 4, 'template': 3, 'typename': 4,
+        'vector': 2, 'auto': 2, '::': 1, 'namespace': 1, 'class': 1, 'const': 0.5, '<<': 1,
+        '.cpp': 4, '.hpp': 4,
+    },
+    'csharp': {
+        'using': 2, 'namespace': 2, 'Console': 4, 'WriteLine(': 4, 'var': 1, 'get': 1, 'set': 1,
+        'string': 1, 'static': 0.5, 'void': 0.5, 'public': 1, 'Linq': 4, 'Main(': 2, '.cs': 4,
+    },
+    'go': {
+        'func': 4, 'package': 3, ':=': 3, 'fmt': 4, 'nil': 2, 'chan': 4, 'go': 1, 'err': 1.5,
+        'make(': 2, 'Errorf(': 4, 'Println(': 2, '.go': 4,
+    },
+    'rust': {
+        'fn': 4, 'mut': 4, 'impl': 4, 'println!': 4, 'Vec': 3, 'unwrap(': 4, 'Option': 1, 'Some(': 2,
+        'crate': 4, 'cargo': 3, 'usize': 4, 'u32': 3, 'i32': 3, 'f64': 3, 'Rust': 3, '->': 0.5,
+        '.rs': 4,
+    },
+    'sql': {
+        'SELECT': 3, 'FROM': 2, 'WHERE': 2, 'JOIN': 3, 'GROUP': 2, 'ORDER': 1, 'INSERT': 3,
+        'INTO': 2, 'VALUES': 3, 'UPDATE': 2, 'DELETE': 2, 'CREATE': 2, 'TABLE': 3, 'PRIMARY': 3,
+        'SQL': 4, 'COUNT(': 2, 'NOT': 1, 'NULL': 1, 'query': 1,
+    },
+    'html': {
+        '<html': 4, '<div': 3, '</div': 3, '<body': 4, '<head': 4, '<a': 2, '</a': 2, '<input': 3,
+        '<form': 3, '</form': 3, '<button': 3, '<span': 3, '<script': 3, '<link': 3, 'href': 3,
+        '<p': 1, '<title': 3, 'DOCTYPE': 4,
+    },
+    'shell': {
+        '#!': 4, 'sudo': 3, 'echo': 2, 'grep': 3, 'fi': 3, 'done': 1, 'do': 0.5, 'esac': 4,
+        'chmod': 4, 'apt': 3, 'cd': 2, 'export': 1, 'curl': 2, 'systemctl': 4, 'git': 1, '$': 1,
+        'bash': 3, '.sh': 4,
+    },
+    'php': {
+        '<?php': 6, '$': 1, '->': 1, 'echo': 1, 'PDO(': 4, 'PHP': 4, 'function': 0.5, '.php': 4,
+    },
+}
+
+# How strongly each common English word counts against code
+PROSE_WEIGHT = 0.6
+# Keeps a handful of tokens (a menu, a caption) from scoring as code
+SMOOTHING = 4.0
+# A language must collect at least this much weight to be reported
+MIN_LANGUAGE_SCORE = 3.0
+
+# Weights of token shapes that are rare outside code
+CALL_WEIGHT = 0.7        # name(...), obj.method(
+IDENTIFIER_WEIGHT = 0.7  # snake_case or camelCase
+LINE_END_WEIGHT = 1.0    # statement ending in ; or a block opening with {
+TAG_WEIGHT = 1.5         # <tag or </tag
+ATTRIBUTE_WEIGHT = 0.7   # name=value, type="text"
+DOTTED_WEIGHT = 0.5      # java.lang.String, module.py:12
+
+# Punctuation stuck to words in prose ("Python?", "(see", "below.")
+_WORD_PUNCTUATION = '.,?!:;"\'()'
+
+
+def _build_weights():
+    """Merge the tables into token -> (code weight, is prose word, ((language, weight), ...))"""
+    tokens = set(CODE_TOKENS) | set(QUESTION_TOKENS) | PROSE_TOKENS
+    for language_tokens in LANGUAGE_TOKENS.values():
+        tokens.update(language_tokens)
+
+    weights = {}
+    for token in tokens:
+        languages = tuple(
+            (language, language_tokens[token])
+            for language, language_tokens in LANGUAGE_TOKENS.items() if token in language_tokens
+        )
+        code = CODE_TOKENS.get(token, 0.0) + QUESTION_TOKENS.get(token, 0.0)
+        if token[0] == '<' and len(token) > 1 and (token[1].isalpha() or token[1] in '/?!'):
+            code += TAG_WEIGHT
+        weights[token] = (code, token in PROSE_TOKENS, languages)
+    return weights
+
+
+_WEIGHTS = _build_weights()
+
+
+def classify_code(text, threshold=DEFAULT_THRESHOLD):
+    """Decide whether text is code (or a question about code) and guess its language
+
+    The text is split into whitespace-separated tokens once and counted;
+    every distinct token is then scored with a single lookup in a merged
+    table of code syntax, programming vocabulary, common English words and
+    per-language keywords, or, if it isn't listed, by its shape (a call, a
+    snake_case/camelCase identifier, a statement end, an HTML tag). Isolated
+    hits such as a word followed by parentheses or the word "function" in a
+    sentence are outweighed by the surrounding English.
+
+    Args:
+        text: OCR text
+        threshold: Score from which the text counts as code
+
+    Returns:
+        dict: 'is_code' bool, 'language' (e.g. 'python') or None, and
+              'confidence', a 0-1 score of how code-like the text is
+    """
+    weights = _WEIGHTS
+    code = 0.0
+    prose = 0
+    languages = {}
+
+    for token, count in Counter(text.split()).items():
+        entry = weights.get(token)
+        if entry is None:
+            if token.isalpha():
+                # Most unlisted tokens are plain words
+                if token[0].islower() and not token.islower():
+                    code += IDENTIFIER_WEIGHT * count
+                continue
+            if token[0] == '<' and len(token) > 1 and (token[1].isalpha() or token[1] in '/?!'):
+                code += TAG_WEIGHT * count
+                entry = weights.get(token.rstrip('>'))
+            elif token.startswith('#!'):
+                entry = weights.get('#!')
+            elif '(' in token and token[0] != '(':
+                # name(args) or obj.method(args): score the name as well
+                name, _, args = token.partition('(')
+                if name[-1:].isalnum() or name[-1:] == '_':
+                    code += CALL_WEIGHT * count
+                    name = name.rsplit('.', 1)[-1].rsplit('::', 1)[-1]
+                    entry = weights.get(name + '(') or weights.get(name)
+                    if entry is None and '.' in args:
+                        # A stack frame: Service.total(Service.java:42)
+                        entry = weights.get('.' + args.rsplit('.', 1)[-1].split(':', 1)[0].rstrip(')'))
+            elif token[-1] in ';{':
+                code += LINE_END_WEIGHT * count
+                entry = weights.get(token[:-1])
+            elif '_' in token[1:-1] or '::' in token or '->' in token:
+                code += IDENTIFIER_WEIGHT * count
+                entry = weights.get(token.split('::', 1)[0])
+            elif '=' in token[1:-1]:
+                code += ATTRIBUTE_WEIGHT * count
+            else:
+                stripped = token.strip(_WORD_PUNCTUATION)
+                if '.' in stripped:
+                    # A qualified name or a file: score the last part
+                    code += DOTTED_WEIGHT * count
+                    last = stripped.rsplit('.', 1)[-1].split(':', 1)[0]
+                    entry = weights.get(last) or weights.get('.' + last)
+                elif stripped != token:
+                    entry = weights.get(stripped)
+            if entry is None:
+                continue
+
+        token_code, is_prose, token_languages = entry
+        code += token_code * count
+        if is_prose:
+            prose += count
+        for language, weight in token_languages:
+            languages[language] = languages.get(language, 0.0) + weight * count
+
+    confidence = code / (code + PROSE_WEIGHT * prose + SMOOTHING)
+    is_code = confidence >= threshold
+
+    language = None
+    if is_code and languages:
+        best = max(languages, key=languages.get)
+        if languages[best] >= MIN_LANGUAGE_SCORE:
+            language = best
+
+    return {'is_code': is_code, 'language': language, 'confidence': round(confidence, 3)}
+
+
+def language_label(language):
+    """Human-readable name of a classify_code language, for prompts"""
+    return {
+        'python': 'Python', 'javascript': 'JavaScript', 'java': 'Java', 'c': 'C', 'cpp': 'C++',
+        'csharp': 'C#', 'go': 'Go', 'rust': 'Rust', 'sql': 'SQL', 'html': 'HTML',
+        'shell': 'shell script', 'php': 'PHP'
+    }.get(language, language)
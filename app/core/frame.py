@@ -0,0 +1,171 @@
+import io
+import threading
+
+import numpy as np
+
+CHANNEL_ORDERS = ('RGB', 'BGR', 'BGRA')
+MIME_TYPES = {'PNG': 'image/png', 'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+
+
+class LazyViews:
+    """Base for objects exposing derived representations computed at most once
+
+    Concurrent requests for the same view wait for a single computation;
+    requests for different views proceed in parallel.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _derive(self, name, compute):
+        value = self._cache.get(name)
+        if value is not None:
+            return value
+
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        with lock:
+            value = self._cache.get(name)
+            if value is None:
+                value = compute()
+                self._cache[name] = value
+        return value
+
+
+class Frame(LazyViews):
+    """A captured image owning a single pixel buffer
+
+    Every other representation (RGB/BGR/gray arrays, PIL image, encoded
+    PNG/JPEG bytes) is produced lazily on first use and cached, so each
+    conversion or encode happens at most once per capture no matter how many
+    of capture, OCR, analysis and the vision request ask for it.
+    """
+
+    def __init__(self, pixels, channel_order='RGB'):
+        super().__init__()
+        if channel_order not in CHANNEL_ORDERS:
+            raise ValueError(f"Unsupported channel order '{channel_order}'")
+        self.pixels = pixels
+        self.channel_order = channel_order
+
+    @classmethod
+    def from_pil(cls, image):
+        """Wrap a PIL image (converted to RGB if needed)"""
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        frame = cls(np.asarray(image), 'RGB')
+        frame._cache['pil'] = image
+        return frame
+
+    @classmethod
+    def coerce(cls, image):
+        """Return image as a Frame; accepts a Frame, PIL image or RGB NumPy array"""
+        if isinstance(image, Frame):
+            return image
+        if isinstance(image, np.ndarray):
+            return cls(image, 'RGB')
+        return cls.from_pil(image)
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    @property
+    def size(self):
+        """(width, height), like PIL's Image.size"""
+        return self.width, self.height
+
+    def _convert(self, codes):
+        import cv2
+        code = codes.get(self.channel_order)
+        if code is None:
+            return self.pixels
+        return cv2.cvtColor(np.ascontiguousarray(self.pixels), code)
+
+    @property
+    def rgb(self):
+        import cv2
+        return self._derive('rgb', lambda: self._convert({
+            'BGR': cv2.COLOR_BGR2RGB,
+            'BGRA': cv2.COLOR_BGRA2RGB
+        }))
+
+    @property
+    def bgr(self):
+        import cv2
+        return self._derive('bgr', lambda: self._convert({
+            'RGB': cv2.COLOR_RGB2BGR,
+            'BGRA': cv2.COLOR_BGRA2BGR
+        }))
+
+    @property
+    def gray(self):
+        import cv2
+        return self._derive('gray', lambda: self._convert({
+            'RGB': cv2.COLOR_RGB2GRAY,
+            'BGR': cv2.COLOR_BGR2GRAY,
+            'BGRA': cv2.COLOR_BGRA2GRAY
+        }))
+
+    @property
+    def pil(self):
+        def to_pil():
+            from PIL import Image
+            if self.channel_order == 'BGRA':
+                # Decode straight from the capture buffer without an RGB array in between
+                return Image.frombuffer('RGB', self.size, np.ascontiguousarray(self.pixels), 'raw', 'BGRX', 0, 1)
+            return Image.fromarray(np.ascontiguousarray(self.rgb))
+        return self._derive('pil', to_pil)
+
+    def encode(self, format='PNG', quality=None):
+        """Encode the frame, caching the bytes per (format, quality)
+
+        Args:
+            format: PIL format name ('PNG', 'JPEG', 'WEBP')
+            quality: Optional quality for lossy formats
+
+        Returns:
+            bytes: Encoded image
+        """
+        format = format.upper()
+
+        def encode():
+            buffer = io.BytesIO()
+            options = {'quality': quality} if quality is not None and format != 'PNG' else {}
+            if format == 'JPEG':
+                # Full-resolution chroma keeps coloured text and syntax highlighting crisp
+                options['subsampling'] = 0
+            self.pil.save(buffer, format=format, **options)
+            return buffer.getvalue()
+        return self._derive(('encoded', format, quality), encode)
+
+    def resize(self, max_pixels):
+        """Return this frame downscaled to at most max_pixels, keeping the aspect ratio
+
+        Area interpolation averages source pixels, which keeps downscaled text
+        legible. The result is cached per max_pixels; the frame itself is
+        returned when it is already small enough.
+        """
+        width, height = self.size
+        if not max_pixels or width * height <= max_pixels:
+            return self
+
+        def downscale():
+            import cv2
+            factor = np.sqrt(max_pixels / (width * height))
+            size = (max(1, int(width * factor)), max(1, int(height * factor)))
+            pixels = cv2.resize(np.ascontiguousarray(self.pixels), size, interpolation=cv2.INTER_AREA)
+            return Frame(pixels, self.channel_order)
+        return self._derive(('resized', max_pixels), downscale)
+
+    def crop(self, box):
+        """Return a Frame viewing the (x, y, width, height) box of this frame (no copy)"""
+        x, y, w, h = box
+        return Frame(self.pixels[y:y + h, x:x + w], self.channel_order)
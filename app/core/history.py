@@ -0,0 +1,342 @@
+import os
+import re
+import time
+import queue
+import sqlite3
+import itertools
+import threading
+
+DEFAULT_HISTORY_PATH = os.path.join('cache', 'history.db')
+
+# Thumbnails are small, lossy previews; the full capture is never stored
+THUMBNAIL_MAX_PIXELS = 320 * 200
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_QUALITY = 60
+
+# Writes are grouped into one transaction per batch
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.5
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS captures ("
+    " id INTEGER PRIMARY KEY,"
+    " created REAL NOT NULL,"
+    " mode TEXT NOT NULL,"
+    " kind TEXT NOT NULL,"
+    " text TEXT NOT NULL DEFAULT '',"
+    " response TEXT NOT NULL DEFAULT '')",
+    "CREATE TABLE IF NOT EXISTS thumbnails ("
+    " capture_id INTEGER PRIMARY KEY,"
+    " mime TEXT NOT NULL,"
+    " data BLOB NOT NULL)",
+    "CREATE TRIGGER IF NOT EXISTS captures_thumbnail_delete AFTER DELETE ON captures BEGIN"
+    " DELETE FROM thumbnails WHERE capture_id = old.id; END",
+)
+
+# External-content FTS5 index: the text lives once, in captures, and the
+# triggers keep the index in step with it
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS captures_fts USING fts5("
+    " text, response, content='captures', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS captures_fts_insert AFTER INSERT ON captures BEGIN"
+    " INSERT INTO captures_fts (rowid, text, response) VALUES (new.id, new.text, new.response); END",
+    "CREATE TRIGGER IF NOT EXISTS captures_fts_delete AFTER DELETE ON captures BEGIN"
+    " INSERT INTO captures_fts (captures_fts, rowid, text, response)"
+    " VALUES ('delete', old.id, old.text, old.response); END",
+    "CREATE TRIGGER IF NOT EXISTS captures_fts_update AFTER UPDATE ON captures BEGIN"
+    " INSERT INTO captures_fts (captures_fts, rowid, text, response)"
+    " VALUES ('delete', old.id, old.text, old.response);"
+    " INSERT INTO captures_fts (rowid, text, response) VALUES (new.id, new.text, new.response); END",
+)
+
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_query(query):
+    """Turn free text typed by the user into a safe FTS5 query
+
+    Every word must match, and the last one matches as a prefix so results
+    narrow while the user is still typing. FTS5 operators and punctuation in
+    the input are treated as plain text.
+
+    Returns:
+        str: FTS5 MATCH expression, or '' when the query has no words
+    """
+    words = _WORD_PATTERN.findall(query)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def make_thumbnail(frame, max_pixels=THUMBNAIL_MAX_PIXELS, format=THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY):
+    """Encode a small preview of a capture
+
+    Returns:
+        tuple: (bytes, mime type)
+    """
+    from .frame import Frame, MIME_TYPES
+
+    thumbnail = Frame.coerce(frame).resize(max_pixels)
+    return thumbnail.encode(format, quality), MIME_TYPES[format.upper()]
+
+
+class HistoryStore:
+    """Persistent, searchable history of captures and their responses
+
+    Captures, their OCR text and the Gemini responses are kept in SQLite with
+    an FTS5 index over text and responses; compressed thumbnails sit in a
+    separate table so listing and searching never read image data.
+
+    record() and set_response() only queue the write and return immediately.
+    A background writer encodes thumbnails and commits queued writes in
+    batches, one transaction each. Reads use their own connection, which WAL
+    mode lets run alongside the writer.
+
+    Write failures happen on the writer thread, after record() has returned;
+    on_error, if set, is called there with a message describing each one.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, max_entries=100_000,
+                 thumbnail_max_pixels=THUMBNAIL_MAX_PIXELS, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 on_error=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.thumbnail_max_pixels = thumbnail_max_pixels
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._write_conn = self._connect()
+        for statement in _SCHEMA:
+            self._write_conn.execute(statement)
+        self._write_conn.execute("CREATE INDEX IF NOT EXISTS idx_captures_created ON captures (created)")
+
+        # Python builds of SQLite without FTS5 still get history, searched with LIKE
+        try:
+            for statement in _FTS_SCHEMA:
+                self._write_conn.execute(statement)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self.full_text = False
+        self._write_conn.commit()
+
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+
+        # Ids are handed out up front so a response can be attached to a
+        # capture whose insert is still queued
+        last_id = self._write_conn.execute("SELECT COALESCE(MAX(id), 0) FROM captures").fetchone()[0]
+        self._ids = itertools.count(last_id + 1)
+        self._ids_lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='history-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create a store using the [History] section of the configuration"""
+        return cls(
+            path=config_manager.get('History', 'path', fallback=DEFAULT_HISTORY_PATH),
+            max_entries=config_manager.getint('History', 'max_entries', fallback=100_000),
+            thumbnail_max_pixels=config_manager.getint('History', 'thumbnail_max_pixels',
+                                                       fallback=THUMBNAIL_MAX_PIXELS)
+        )
+
+    def record(self, mode, kind, text, response='', frame=None):
+        """Queue a capture for storage
+
+        Args:
+            mode: Processing mode the capture was taken in
+            kind: Result type ('ocr', 'vision', 'image_analysis')
+            text: Extracted text or analysis shown to the user
+            response: Gemini response, if already known
+            frame: Optional capture to store a thumbnail of; encoded on the writer thread
+
+        Returns:
+            int: Id of the capture, usable with set_response() straight away
+        """
+        with self._ids_lock:
+            capture_id = next(self._ids)
+        self._queue.put(('record', (capture_id, time.time(), mode, kind, text or '', response or '', frame)))
+        return capture_id
+
+    def set_response(self, capture_id, response):
+        """Queue attaching a Gemini response to a recorded capture"""
+        self._queue.put(('response', (capture_id, response or '')))
+
+    def flush(self, timeout=None):
+        """Block until every write queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit pending writes and stop the writer"""
+        if self._writer.is_alive():
+            self._queue.put(('close', None))
+            self._writer.join()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            # Keep collecting until the batch is full, the interval is over or a caller waits on it
+            while len(batch) < self.batch_size and batch[-1][0] not in ('flush', 'close'):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except sqlite3.Error as e:
+                self._report(f"Error writing capture history: {str(e)}")
+
+            for kind, payload in batch:
+                if kind == 'flush':
+                    payload.set()
+            if batch[-1][0] == 'close':
+                self._write_conn.close()
+                return
+
+    def _report(self, message):
+        if self.on_error:
+            self.on_error(message)
+
+    def _write_batch(self, batch):
+        captures, thumbnails, responses = [], [], []
+        for kind, payload in batch:
+            if kind == 'record':
+                capture_id, created, mode, capture_kind, text, response, frame = payload
+                captures.append((capture_id, created, mode, capture_kind, text, response))
+                if frame is not None:
+                    try:
+                        data, mime = make_thumbnail(frame, self.thumbnail_max_pixels)
+                        thumbnails.append((capture_id, mime, sqlite3.Binary(data)))
+                    except Exception as e:
+                        self._report(f"Error creating history thumbnail: {str(e)}")
+            elif kind == 'response':
+                capture_id, response = payload
+                responses.append((response, capture_id))
+
+        if not (captures or responses):
+            return
+
+        with self._write_conn:
+            self._write_conn.executemany(
+                "INSERT INTO captures (id, created, mode, kind, text, response) VALUES (?, ?, ?, ?, ?, ?)",
+                captures
+            )
+            self._write_conn.executemany(
+                "INSERT INTO thumbnails (capture_id, mime, data) VALUES (?, ?, ?)", thumbnails
+            )
+            self._write_conn.executemany("UPDATE captures SET response = ? WHERE id = ?", responses)
+            if captures and self.max_entries:
+                self._prune()
+
+    def _prune(self):
+        """Delete the oldest captures beyond max_entries (their index rows and thumbnails follow via triggers)"""
+        row = self._write_conn.execute(
+            "SELECT id FROM captures ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_entries,)
+        ).fetchone()
+        if row is not None:
+            self._write_conn.execute("DELETE FROM captures WHERE id <= ?", (row[0],))
+
+    def search(self, query, limit=50, offset=0):
+        """Find captures whose text or response matches query, newest first
+
+        Results are ordered by recency rather than relevance: FTS5 can then walk
+        its index backwards and stop after one page instead of scoring every
+        match, which keeps common words fast on large histories. An empty
+        query lists the most recent captures.
+
+        Args:
+            query: Words to look for
+            limit: Page size
+            offset: Number of results to skip, for loading further pages
+
+        Returns:
+            list: dicts with 'id', 'created', 'mode', 'kind' and a short 'snippet'
+        """
+        match = fts_query(query)
+        with self._read_lock:
+            if not match:
+                rows = self._read_conn.execute(
+                    "SELECT id, created, mode, kind, substr(CASE WHEN text != '' THEN text ELSE response END, 1, 160)"
+                    " FROM captures ORDER BY id DESC LIMIT ? OFFSET ?",
+                    (limit, offset)
+                ).fetchall()
+            elif self.full_text:
+                rows = self._read_conn.execute(
+                    "SELECT c.id, c.created, c.mode, c.kind,"
+                    " snippet(captures_fts, -1, '', '', '...', 16)"
+                    " FROM captures_fts JOIN captures c ON c.id = captures_fts.rowid"
+                    " WHERE captures_fts MATCH ? ORDER BY captures_fts.rowid DESC LIMIT ? OFFSET ?",
+                    (match, limit, offset)
+                ).fetchall()
+            else:
+                words = _WORD_PATTERN.findall(query)
+                condition = ' AND '.join(["(text LIKE ? OR response LIKE ?)"] * len(words))
+                parameters = [f'%{word}%' for word in words for _ in range(2)]
+                rows = self._read_conn.execute(
+                    "SELECT id, created, mode, kind, substr(CASE WHEN text != '' THEN text ELSE response END, 1, 160)"
+                    f" FROM captures WHERE {condition} ORDER BY id DESC LIMIT ? OFFSET ?",
+                    parameters + [limit, offset]
+                ).fetchall()
+
+        return [
+            {'id': row[0], 'created': row[1], 'mode': row[2], 'kind': row[3],
+             'snippet': ' '.join(row[4].split())}
+            for row in rows
+        ]
+
+    def get(self, capture_id):
+        """Return the full text and response of a capture, or None if it doesn't exist"""
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT id, created, mode, kind, text, response FROM captures WHERE id = ?", (capture_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'created': row[1], 'mode': row[2], 'kind': row[3], 'text': row[4], 'response': row[5]}
+
+    def thumbnail(self, capture_id):
+        """Return (bytes, mime type) of a capture's thumbnail, or None"""
+        with self._read_lock:
+            row = self._read_conn.execute(
+                "SELECT data, mime FROM thumbnails WHERE capture_id = ?", (capture_id,)
+            ).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def clear(self):
+        """Delete all stored captures (after pending writes are committed)"""
+        self.flush()
+        with self._read_lock:
+            with self._read_conn:
+                self._read_conn.execute("DELETE FROM captures")
+                self._read_conn.execute("DELETE FROM thumbnails")
+
+    def stats(self):
+        with self._read_lock:
+            entries = self._read_conn.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+        return {
+            'entries': entries,
+            'pending': self._queue.qsize(),
+            'full_text': self.full_text
+        }
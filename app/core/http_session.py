@@ -0,0 +1,208 @@
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from .rate_limit import parse_retry_after
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Longest server Retry-After honoured, in seconds; larger values are capped
+DEFAULT_MAX_RETRY_AFTER = 60.0
+
+# Time spent establishing connections (TCP + TLS) on the current thread
+_connect_times = threading.local()
+
+
+def _record_connect_time(start):
+    _connect_times.value = getattr(_connect_times, 'value', 0.0) + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect_time(start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _record_connect_time(start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record how long connect/handshake takes"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+class PooledSession:
+    """Long-lived keep-alive HTTP session with retries and jittered exponential backoff"""
+
+    def __init__(self, pool_size=4, connect_timeout=5.0, read_timeout=60.0,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, max_retry_after=DEFAULT_MAX_RETRY_AFTER):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+
+        # Retries are handled here rather than by urllib3 so that every attempt
+        # is timed and Retry-After can be honoured
+        adapter = _TimedAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create a session using the [Network] section of the configuration"""
+        return cls(
+            pool_size=config_manager.getint('Network', 'pool_size', fallback=4),
+            connect_timeout=config_manager.getfloat('Network', 'connect_timeout', fallback=5.0),
+            read_timeout=config_manager.getfloat('Network', 'read_timeout', fallback=60.0),
+            max_retries=config_manager.getint('Network', 'max_retries', fallback=3),
+            backoff_base=config_manager.getfloat('Network', 'backoff_base', fallback=0.5),
+            backoff_max=config_manager.getfloat('Network', 'backoff_max', fallback=8.0),
+            max_retry_after=config_manager.getfloat('Network', 'max_retry_after', fallback=DEFAULT_MAX_RETRY_AFTER)
+        )
+
+    def retry_after(self, header):
+        """Seconds requested by a Retry-After header, capped at max_retry_after (None if absent)"""
+        delay = parse_retry_after(header)
+        if delay is None:
+            return None
+        return min(delay, self.max_retry_after)
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """Return the delay before retry number attempt (0-based)
+
+        A Retry-After header from the server takes precedence (capped at
+        max_retry_after so one header can't hold a worker for minutes),
+        otherwise "full jitter" exponential backoff is used so that
+        concurrent clients don't retry in lockstep.
+        """
+        delay = self.retry_after(retry_after)
+        if delay is not None:
+            return delay
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post(self, url, data, headers=None, stream=False, limiter=None, priority=None):
+        """POST data to url, retrying connection failures and retryable status codes
+
+        Args:
+            url: Request URL
+            data: Request body (bytes or str)
+            headers: Optional request headers
+            stream: bool, leave the response body unread for the caller to iterate
+            limiter: Optional RateLimiter every attempt must acquire a token from;
+                     a 429 response throttles it for all callers
+            priority: Priority passed to the limiter
+
+        Returns:
+            tuple: (requests.Response, timings dict with 'connect', 'ttfb', 'total',
+                   'queued' and 'attempts'; 'total' is None for streamed responses)
+        """
+        _connect_times.value = 0.0
+        call_start = time.perf_counter()
+        queued = 0.0
+
+        attempt = 0
+        while True:
+            if limiter is not None:
+                queued += limiter.acquire(priority)
+            attempt_start = time.perf_counter()
+            try:
+                # Always stream at the transport level so the time to first byte
+                # can be measured separately from reading the body
+                response = self.session.post(
+                    url, data=data, headers=headers, stream=True,
+                    timeout=(self.connect_timeout, self.read_timeout)
+                )
+            except (requests.ConnectTimeout, requests.ConnectionError):
+                # A read timeout is not retried: the server may already be generating
+                # (and billing) the answer, and each retry could wait read_timeout again
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            ttfb = time.perf_counter() - attempt_start
+
+            # A disabled limiter ([RateLimit] requests_per_minute = 0) doesn't hold requests back
+            limited = limiter is not None and limiter.enabled
+            if response.status_code == 429 and limited:
+                limiter.throttle(self.retry_after(response.headers.get('Retry-After')))
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                if response.status_code == 429 and limited:
+                    # The limiter holds every request (this retry included) until the quota resets
+                    delay = 0.0
+                else:
+                    delay = self.backoff_delay(attempt, response.headers.get('Retry-After'))
+                # Drain the (small) error body so the connection goes back to the pool
+                response.content
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if not stream:
+                response.content
+
+            timings = {
+                'connect': _connect_times.value,
+                'ttfb': ttfb,
+                'total': None if stream else time.perf_counter() - call_start,
+                'queued': queued,
+                'attempts': attempt + 1
+            }
+            return response, timings
+
+    def warm_up(self, url):
+        """Open a pooled connection to url's host (TCP + TLS) ahead of the first real request
+
+        Returns:
+            float: Seconds spent connecting
+        """
+        _connect_times.value = 0.0
+        # Any response will do; once the (empty) body is read the connection returns to the pool
+        self.session.head(url, timeout=(self.connect_timeout, self.read_timeout))
+        return _connect_times.value
+
+    def close(self):
+        self.session.close()
+
+
+def format_timings(timings):
+    """Format a timings dict from PooledSession.post for the status bar"""
+    if not timings:
+        return ""
+    parts = [f"connect {timings['connect'] * 1000:.0f} ms", f"TTFB {timings['ttfb'] * 1000:.0f} ms"]
+    if timings.get('queued'):
+        parts.insert(0, f"queued {timings['queued'] * 1000:.0f} ms")
+    if timings.get('ttft') is not None:
+        parts.append(f"first token {timings['ttft'] * 1000:.0f} ms")
+    if timings.get('total') is not None:
+        parts.append(f"total {timings['total'] * 1000:.0f} ms")
+    if timings.get('attempts', 1) > 1:
+        parts.append(f"{timings['attempts']} attempts")
+    return ', '.join(parts)
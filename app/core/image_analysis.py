@@ -1,84 +1,290 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
 import cv2
 import numpy as np
 from PIL import Image
 
+from .frame import Frame, LazyViews
+
+# Color buckets: six hue ranges plus achromatic buckets for dark and unsaturated pixels
+COLOR_NAMES = ['red', 'yellow', 'green', 'cyan', 'blue', 'magenta', 'black', 'gray', 'white']
+BLACK_BUCKET, GRAY_BUCKET, WHITE_BUCKET = 6, 7, 8
+
+# OpenCV hue is 0-179 (degrees / 2); red wraps around both ends
+HUE_BUCKET_LUT = np.zeros(180, dtype=np.intp)
+HUE_BUCKET_LUT[:15] = 0
+HUE_BUCKET_LUT[15:45] = 1
+HUE_BUCKET_LUT[45:75] = 2
+HUE_BUCKET_LUT[75:105] = 3
+HUE_BUCKET_LUT[105:135] = 4
+HUE_BUCKET_LUT[135:165] = 5
+HUE_BUCKET_LUT[165:] = 0
+
+BLACK_VALUE = 50         # V below this is black regardless of hue
+GRAY_SATURATION = 40     # S below this is gray/white
+WHITE_VALUE = 200        # Unsaturated pixels brighter than this are white
+
+# Statistics are computed on a downscaled copy of frames larger than this;
+# 0 disables the budget. OCR always sees the full-resolution capture.
+DEFAULT_MAX_ANALYSIS_PIXELS = 1_000_000
+
+# How often a cancellable analysis checks its cancel event while waiting (seconds)
+CANCEL_POLL_INTERVAL = 0.05
+
+MAX_COLOR_SAMPLES = 65536
+PALETTE_MIN_COVERAGE = 0.01
+DOMINANT_COVERAGE = 0.1
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _analysis_executor():
+    """Shared thread pool for analyzers; OpenCV releases the GIL in its kernels"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix='image-analysis'
+            )
+        return _executor
+
+
+class FrameContext(LazyViews):
+    """Derived representations of one captured frame, each computed at most once
+
+    Analyzers running concurrently on the same frame share the BGR, grayscale,
+    HSV, blurred and edge images instead of converting the frame themselves.
+    All of these are at analysis resolution: frames above max_pixels are
+    downscaled once with area interpolation. full_bgr and size always refer
+    to the original capture.
+    """
+
+    def __init__(self, image, max_pixels=0):
+        super().__init__()
+        self.frame = Frame.coerce(image)
+        self.max_pixels = max_pixels
+
+    @classmethod
+    def from_bgr(cls, bgr, max_pixels=0):
+        """Create a context from an OpenCV BGR array"""
+        return cls(Frame(bgr, 'BGR'), max_pixels=max_pixels)
+
+    @property
+    def downscaled(self):
+        height, width = self.frame.height, self.frame.width
+        return bool(self.max_pixels) and height * width > self.max_pixels
+
+    @property
+    def size(self):
+        """(width, height) of the original capture"""
+        return self.frame.size
+
+    @property
+    def shape(self):
+        """Shape of the analysis-resolution image"""
+        return self.bgr.shape
+
+    @property
+    def scale(self):
+        """Factor from original to analysis resolution (1.0 when not downscaled)"""
+        return self.bgr.shape[1] / self.full_bgr.shape[1]
+
+    @property
+    def full_bgr(self):
+        return self.frame.bgr
+
+    @property
+    def bgr(self):
+        def downscale():
+            full = self.full_bgr
+            if not self.downscaled:
+                return full
+            height, width = full.shape[:2]
+            factor = np.sqrt(self.max_pixels / (height * width))
+            size = (max(1, int(width * factor)), max(1, int(height * factor)))
+            return cv2.resize(full, size, interpolation=cv2.INTER_AREA)
+        return self._derive('bgr', downscale)
+
+    @property
+    def gray(self):
+        if not self.downscaled:
+            # Shared with OCR and anything else holding the same Frame
+            return self.frame.gray
+        return self._derive('gray', lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def hsv(self):
+        return self._derive('hsv', lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2HSV))
+
+    @property
+    def blurred(self):
+        return self._derive('blurred', lambda: cv2.GaussianBlur(self.gray, (5, 5), 0))
+
+    @property
+    def edges(self):
+        return self._derive('edges', lambda: cv2.Canny(self.gray, 100, 200))
+
+    @property
+    def color_sample(self):
+        """BGR pixels sampled on a regular grid of at most MAX_COLOR_SAMPLES points"""
+        def sample():
+            height, width = self.bgr.shape[:2]
+            step = max(1, int(np.sqrt(height * width / MAX_COLOR_SAMPLES)))
+            return np.ascontiguousarray(self.bgr[::step, ::step])
+        return self._derive('color_sample', sample)
+
+
 class ImageAnalyzer:
+    # Registered analyzers: result key -> function taking a FrameContext
+    _analyzers = {}
+
+    # Pixel budget for analysis statistics, see configure()
+    max_pixels = DEFAULT_MAX_ANALYSIS_PIXELS
+
+    @classmethod
+    def configure(cls, config_manager):
+        """Apply the [Analysis] section of the configuration"""
+        cls.max_pixels = config_manager.getint('Analysis', 'max_pixels', fallback=DEFAULT_MAX_ANALYSIS_PIXELS)
+
+    @classmethod
+    def register_analyzer(cls, name, analyzer=None):
+        """Register an analyzer whose result is stored under name in analyze_image's output
+
+        Can be used directly or as a decorator:
+
+            @ImageAnalyzer.register_analyzer('text_density')
+            def text_density(ctx):
+                ...
+        """
+        if analyzer is None:
+            def decorator(fn):
+                cls._analyzers[name] = fn
+                return fn
+            return decorator
+
+        cls._analyzers[name] = analyzer
+        return analyzer
+
     @staticmethod
-    def analyze_image(image, use_ai=True):
+    def analyze_image(image, use_ai=True, max_pixels=None, cancel_event=None):
         """Analyze image content and provide insights
 
         Args:
-            image: PIL Image object
+            image: Frame, PIL Image object or FrameContext
             use_ai: bool, whether to use AI-powered content analysis
+            max_pixels: Analysis resolution budget (defaults to ImageAnalyzer.max_pixels)
+            cancel_event: Optional threading.Event; once set, pending analyzers and
+                          the vision request are skipped and None is returned
 
         Returns:
             dict: Analysis results including colors, objects, composition and AI description
         """
-        # Convert PIL image to OpenCV format
-        cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        if max_pixels is None:
+            max_pixels = ImageAnalyzer.max_pixels
+        ctx = image if isinstance(image, FrameContext) else FrameContext(image, max_pixels=max_pixels)
+        executor = _analysis_executor()
 
-        analysis = {
-            'color_analysis': ImageAnalyzer._analyze_colors(cv_image),
-            'composition': ImageAnalyzer._analyze_composition(cv_image),
-            'objects': ImageAnalyzer._detect_objects(cv_image)
-        }
+        # Add AI-powered content analysis if requested; the API round-trip
+        # overlaps with the local analyzers
+        if cancel_event is not None and cancel_event.is_set():
+            return None
 
-        # Add AI-powered content analysis if requested
+        ai_future = None
         if use_ai:
-            from .vision_analysis import VisionAnalyzer
-            from ..utils.config import ConfigManager
+            ai_future = executor.submit(ImageAnalyzer._describe_content, ctx.frame, cancel_event)
 
-            config = ConfigManager()
-            vision_analyzer = VisionAnalyzer(config)
-            ai_analysis = vision_analyzer.analyze_image_content(image)
-            analysis['content_description'] = ai_analysis
+        futures = {
+            name: executor.submit(analyzer, ctx)
+            for name, analyzer in ImageAnalyzer._analyzers.items()
+        }
+        if ai_future is not None:
+            futures['content_description'] = ai_future
+
+        analysis = {}
+        poll_interval = CANCEL_POLL_INTERVAL if cancel_event is not None else None
+        for name, future in futures.items():
+            while name not in analysis:
+                if cancel_event is not None and cancel_event.is_set():
+                    for pending in futures.values():
+                        pending.cancel()
+                    return None
+                try:
+                    analysis[name] = future.result(timeout=poll_interval)
+                except FuturesTimeoutError:
+                    continue
 
         return analysis
 
     @staticmethod
-    def _analyze_colors(image):
-        """Analyze the color distribution in the image"""
-        # Convert to HSV for better color analysis
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-
-        # Calculate color histogram
-        hist = cv2.calcHist([hsv], [0], None, [180], [0, 180])
-
-        # Find dominant colors
-        dominant_colors = []
-        threshold = 0.1 * image.shape[0] * image.shape[1]  # 10% of image pixels
-
-        for i in range(len(hist)):
-            if hist[i] > threshold:
-                # Convert HSV value back to color name
-                hue = i * 2  # Scale back to 0-360 range
-                if 0 <= hue <= 30 or 330 <= hue <= 360:
-                    dominant_colors.append('red')
-                elif 30 < hue <= 90:
-                    dominant_colors.append('yellow')
-                elif 90 < hue <= 150:
-                    dominant_colors.append('green')
-                elif 150 < hue <= 210:
-                    dominant_colors.append('cyan')
-                elif 210 < hue <= 270:
-                    dominant_colors.append('blue')
-                elif 270 < hue < 330:
-                    dominant_colors.append('magenta')
+    def _describe_content(image, cancel_event=None):
+        from .clients import ClientRegistry
+
+        return ClientRegistry().vision_analyzer().analyze_image_content(image, cancel_event=cancel_event)
+
+    @staticmethod
+    def _analyze_colors(ctx):
+        """Analyze the color distribution in the image
+
+        Pixels are sampled on a regular grid and bucketed by hue, saturation and
+        value in a single vectorised pass, so low-saturation UI chrome is
+        reported as black/gray/white rather than as a hue.
+
+        Args:
+            ctx: FrameContext of the image
+
+        Returns:
+            dict: 'dominant_colors' (names covering at least 10% of the image),
+                  'palette' (ranked list of name/hex/coverage entries) and 'brightness'
+        """
+        sample = ctx.color_sample
+        hsv = cv2.cvtColor(sample, cv2.COLOR_BGR2HSV).reshape(-1, 3)
+        hue, saturation, value = hsv[:, 0], hsv[:, 1], hsv[:, 2]
+
+        # Chromatic bucket from the hue lookup table, overridden for dark and
+        # unsaturated pixels
+        buckets = HUE_BUCKET_LUT[hue]
+        achromatic = np.where(value > WHITE_VALUE, WHITE_BUCKET, GRAY_BUCKET)
+        buckets = np.where(saturation < GRAY_SATURATION, achromatic, buckets)
+        buckets = np.where(value < BLACK_VALUE, BLACK_BUCKET, buckets)
+
+        counts = np.bincount(buckets, minlength=len(COLOR_NAMES))
+        pixels = sample.reshape(-1, 3)
+        # Mean BGR colour of each bucket
+        sums = np.stack([
+            np.bincount(buckets, weights=pixels[:, channel], minlength=len(COLOR_NAMES))
+            for channel in range(3)
+        ], axis=1)
+        means = sums / np.maximum(counts, 1)[:, None]
+
+        coverage = counts / buckets.size
+        palette = []
+        for index in np.argsort(counts)[::-1]:
+            if coverage[index] < PALETTE_MIN_COVERAGE:
+                break
+            blue, green, red = (int(round(c)) for c in means[index])
+            palette.append({
+                'name': COLOR_NAMES[index],
+                'hex': f'#{red:02x}{green:02x}{blue:02x}',
+                'coverage': round(float(coverage[index]) * 100, 1)
+            })
 
         return {
-            'dominant_colors': list(set(dominant_colors)),
-            'brightness': ImageAnalyzer._calculate_brightness(image)
+            'dominant_colors': [entry['name'] for entry in palette if entry['coverage'] >= DOMINANT_COVERAGE * 100],
+            'palette': palette,
+            'brightness': ImageAnalyzer._calculate_brightness(ctx)
         }
 
     @staticmethod
-    def _analyze_composition(image):
+    def _analyze_composition(ctx):
         """Analyze the composition and layout of the image"""
-        height, width = image.shape[:2]
+        width, height = ctx.size
 
-        # Detect edges
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 100, 200)
-        edge_density = np.count_nonzero(edges) / (height * width)
+        # Detect edges (at analysis resolution)
+        edge_density = np.count_nonzero(ctx.edges) / ctx.edges.size
 
         # Analyze image complexity
         complexity = 'high' if edge_density > 0.1 else 'medium' if edge_density > 0.05 else 'low'
@@ -90,12 +296,11 @@ class ImageAnalyzer:
         }
 
     @staticmethod
-    def _detect_objects(image):
+    def _detect_objects(ctx):
         """Detect common objects in the image using pre-trained models"""
         # Initialize YOLO or similar object detection model here
         # For now, return basic shape detection
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        blurred = ctx.blurred
 
         # Detect circles
         circles = cv2.HoughCircles(
@@ -125,10 +330,9 @@ class ImageAnalyzer:
         }
 
     @staticmethod
-    def _calculate_brightness(image):
+    def _calculate_brightness(ctx):
         """Calculate the overall brightness of the image"""
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        brightness = np.mean(gray)
+        brightness = np.mean(ctx.gray)
 
         if brightness < 85:
             return 'dark'
@@ -136,3 +340,8 @@ class ImageAnalyzer:
             return 'bright'
         else:
             return 'medium'
+
+
+ImageAnalyzer.register_analyzer('color_analysis', ImageAnalyzer._analyze_colors)
+ImageAnalyzer.register_analyzer('composition', ImageAnalyzer._analyze_composition)
+ImageAnalyzer.register_analyzer('objects', ImageAnalyzer._detect_objects)
@@ -0,0 +1,105 @@
+import time
+
+from .frame import Frame, MIME_TYPES
+
+DEFAULT_MAX_PIXELS = 1_600_000
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_FORMAT = 'JPEG'
+DEFAULT_QUALITY = 85
+
+# Lossy quality is lowered in these steps before resorting to downscaling
+QUALITY_STEP = 10
+MIN_QUALITY = 60
+# Extra shrink applied on top of the estimated scale so a retry usually fits
+SHRINK_MARGIN = 0.9
+MAX_ATTEMPTS = 8
+
+
+class EncodeBudget:
+    """Size budget for images uploaded to the vision API
+
+    Frames are downscaled to max_pixels, then encoded in the configured
+    format. When the result is over max_bytes, lossy formats first give up
+    quality (down to MIN_QUALITY) and only then is the frame shrunk further,
+    because resolution matters more than compression artefacts for
+    text-heavy screenshots.
+    """
+
+    def __init__(self, max_pixels=DEFAULT_MAX_PIXELS, max_bytes=DEFAULT_MAX_BYTES,
+                 format=DEFAULT_FORMAT, quality=DEFAULT_QUALITY):
+        format = format.upper()
+        if format not in MIME_TYPES:
+            raise ValueError(f"Unsupported upload format '{format}', expected one of: {', '.join(MIME_TYPES)}")
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        self.format = format
+        self.quality = quality
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Create a budget from the [Vision] section of the configuration"""
+        return cls(
+            max_pixels=config_manager.getint('Vision', 'max_pixels', fallback=DEFAULT_MAX_PIXELS),
+            max_bytes=config_manager.getint('Vision', 'max_bytes', fallback=DEFAULT_MAX_BYTES),
+            format=config_manager.get('Vision', 'format', fallback=DEFAULT_FORMAT),
+            quality=config_manager.getint('Vision', 'quality', fallback=DEFAULT_QUALITY)
+        )
+
+    @property
+    def lossy(self):
+        return self.format != 'PNG'
+
+    def encode(self, image):
+        """Encode an image within the budget
+
+        Args:
+            image: Frame or PIL Image object
+
+        Returns:
+            tuple: (bytes, mime type, stats dict with 'bytes', 'width', 'height',
+                   'original_size', 'format', 'quality' and 'encode_ms')
+        """
+        start = time.perf_counter()
+        original = Frame.coerce(image)
+        frame = original.resize(self.max_pixels)
+        quality = self.quality if self.lossy else None
+
+        for _ in range(MAX_ATTEMPTS):
+            data = frame.encode(self.format, quality)
+            if not self.max_bytes or len(data) <= self.max_bytes:
+                break
+            if self.lossy and quality - QUALITY_STEP >= MIN_QUALITY:
+                quality -= QUALITY_STEP
+                continue
+            # Encoded size scales roughly with pixel count
+            width, height = frame.size
+            target = int(width * height * (self.max_bytes / len(data)) * SHRINK_MARGIN ** 2)
+            if target < 1:
+                break
+            frame = frame.resize(target)
+
+        width, height = frame.size
+        return data, MIME_TYPES[self.format], {
+            'bytes': len(data),
+            'width': width,
+            'height': height,
+            'original_size': original.size,
+            'format': self.format,
+            'quality': quality,
+            'encode_ms': (time.perf_counter() - start) * 1000
+        }
+
+
+def format_upload_stats(stats):
+    """Format upload stats from VisionAnalyzer for the status bar"""
+    if not stats:
+        return ""
+    parts = [
+        f"sent {stats['bytes'] / 1024:.0f} KB {stats['format']} {stats['width']}x{stats['height']}",
+        f"encode {stats['encode_ms']:.0f} ms"
+    ]
+    if stats.get('queued_ms'):
+        parts.append(f"queued {stats['queued_ms']:.0f} ms")
+    if stats.get('latency_ms') is not None:
+        parts.append(f"response {stats['latency_ms']:.0f} ms")
+    return ', '.join(parts)
@@ -0,0 +1,187 @@
+import queue
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+
+
+class JobCancelled(Exception):
+    """Raised inside a job that noticed its cancellation token was set"""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag shared by a job and whoever submitted it
+
+    token.event is a plain threading.Event, so it can be handed to APIs that
+    already accept a cancel_event (e.g. ImageAnalyzer.analyze_image).
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.event.is_set():
+            raise JobCancelled()
+
+
+class Job:
+    """Handle passed to a job function and returned to the submitter"""
+
+    def __init__(self, job_id, key, executor):
+        self.id = job_id
+        self.key = key
+        self.token = CancellationToken()
+        self.future = None
+        self._executor = executor
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def cancel(self):
+        """Cancel the job; it is dropped if it hasn't started and its result is discarded otherwise"""
+        self.token.cancel()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report(self, progress):
+        """Send a progress event to the on_progress callback (called from the worker)"""
+        if not self.token.cancelled:
+            self._executor._events.put((self._executor._deliver_progress, self, progress))
+
+
+class JobExecutor:
+    """Bounded worker pool for work that must not run on the Tk thread
+
+    Job functions run on worker threads and never touch widgets. Their
+    progress, results and errors are queued as events and delivered by poll(),
+    which the UI calls from a single root.after loop, so every callback runs
+    on the Tk thread. Submitting a job with the same key as a running one
+    cancels the older job: a new capture supersedes a stale one and its late
+    results are never shown.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='job')
+        self._events = queue.SimpleQueue()
+        self._active = {}  # key -> Job
+        self._active_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._callbacks = {}  # job id -> (on_result, on_error, on_progress)
+
+    def submit(self, fn, *args, key=None, on_result=None, on_error=None, on_progress=None, **kwargs):
+        """Run fn(job, *args, **kwargs) on a worker thread
+
+        Args:
+            fn: Job function; receives the Job as its first argument and may
+                call job.report() and job.token.raise_if_cancelled()
+            key: Optional supersede key; a running job with the same key is cancelled
+            on_result: Called with the return value on the polling thread
+            on_error: Called with the exception on the polling thread
+            on_progress: Called with each job.report() value on the polling thread
+
+        Returns:
+            Job: Handle for cancellation
+        """
+        job = Job(next(self._ids), key, self)
+        self._callbacks[job.id] = (on_result, on_error, on_progress)
+
+        if key is not None:
+            with self._active_lock:
+                previous = self._active.get(key)
+                self._active[key] = job
+            if previous is not None:
+                previous.cancel()
+
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        job.future.add_done_callback(lambda future: self._on_done(job, future))
+        return job
+
+    def _on_done(self, job, future):
+        # Jobs cancelled before they started never reach _run; release their callbacks
+        if future.cancelled():
+            self._events.put((self._deliver_result, job, None))
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            if job.cancelled:
+                # Cancelled between submit and start; still release the callbacks
+                self._events.put((self._deliver_result, job, None))
+                return
+            result = fn(job, *args, **kwargs)
+            self._events.put((self._deliver_result, job, result))
+        except JobCancelled:
+            self._events.put((self._deliver_result, job, None))
+        except Exception as e:
+            self._events.put((self._deliver_error, job, e))
+
+    def call_soon(self, callback, *args):
+        """Queue callback(*args) to run on the polling thread (safe from any thread)"""
+        self._events.put((None, callback, args))
+
+    def poll(self, max_events=None):
+        """Deliver queued events on the calling thread
+
+        Args:
+            max_events: Optional limit so one tick can't monopolise the UI
+
+        Returns:
+            int: Number of events processed
+        """
+        count = 0
+        while max_events is None or count < max_events:
+            try:
+                handler, target, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            count += 1
+            if handler is None:
+                target(*payload)
+            else:
+                handler(target, payload)
+        return count
+
+    def _finish(self, job):
+        if job.key is not None:
+            with self._active_lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+        return self._callbacks.pop(job.id, (None, None, None))
+
+    def _deliver_progress(self, job, progress):
+        on_progress = self._callbacks.get(job.id, (None, None, None))[2]
+        if on_progress and not job.cancelled:
+            on_progress(progress)
+
+    def _deliver_result(self, job, result):
+        on_result = self._finish(job)[0]
+        if on_result and not job.cancelled:
+            on_result(result)
+
+    def _deliver_error(self, job, error):
+        on_error = self._finish(job)[1]
+        if on_error and not job.cancelled:
+            on_error(error)
+
+    def active(self, key):
+        """Return the running job submitted with key, if any"""
+        with self._active_lock:
+            return self._active.get(key)
+
+    def cancel_all(self):
+        with self._active_lock:
+            jobs = list(self._active.values())
+        for job in jobs:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,70 +1,230 @@
-import re
-import pytesseract
-from PIL import Image
-from .image_analysis import ImageAnalyzer
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from .frame import Frame
+from .image_analysis import ImageAnalyzer, CANCEL_POLL_INTERVAL
+from .clients import ClientRegistry
+from .text_regions import find_text_regions, region_coverage
+from .code_classifier import classify_code, DEFAULT_THRESHOLD as DEFAULT_CODE_THRESHOLD
+
+# Auto mode falls back to image analysis when OCR finds less text than this
+MIN_TEXT_LENGTH = 10
+
+# Captures with at least this many pixels are split into text regions before OCR
+DEFAULT_TILE_MIN_PIXELS = 2_000_000
+# When regions cover more than this fraction of the capture, OCR it whole
+MAX_TILED_COVERAGE = 0.8
+
+_speculation_executor = None
+_speculation_lock = threading.Lock()
+_tile_executor = None
+_tile_lock = threading.Lock()
+
+
+def _get_speculation_executor():
+    """Pool for speculative image analysis; separate from the analyzer pool it submits to"""
+    global _speculation_executor
+    with _speculation_lock:
+        if _speculation_executor is None:
+            _speculation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ocr-speculation')
+        return _speculation_executor
+
+
+def _get_tile_executor():
+    """Pool for OCR of individual text regions, one thread per core"""
+    global _tile_executor
+    with _tile_lock:
+        if _tile_executor is None:
+            _tile_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='ocr-tile')
+        return _tile_executor
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
 
 class OCRProcessor:
     @staticmethod
-    def process_image(image, mode='auto'):
+    def process_image(image, mode='auto', use_ai=True, cancel_event=None):
         """Process image based on selected mode
 
         Args:
-            image: PIL Image object
+            image: Frame or PIL Image object
             mode: Processing mode ('auto', 'code', 'general', 'image')
+            use_ai: bool, whether image analysis may call the vision API
+            cancel_event: Optional threading.Event; once set, image analysis
+                          stops early and None is returned
 
         Returns:
-            dict: Processing results with type and content
+            dict: Processing results with type and content, or None if cancelled
         """
         try:
+            # OCR and analysis share one Frame, so each conversion happens once
+            image = Frame.coerce(image)
+
             # For image mode, skip OCR and do direct image analysis
             if mode == 'image':
-                analysis = ImageAnalyzer.analyze_image(image)
+                analysis = ImageAnalyzer.analyze_image(image, use_ai=use_ai, cancel_event=cancel_event)
+                if analysis is None:
+                    return None
                 return {
                     'type': 'image_analysis',
                     'content': analysis
                 }
 
-            # For other modes, attempt OCR first
-            text = pytesseract.image_to_string(image)
+            if mode == 'auto':
+                return OCRProcessor._process_auto(image, use_ai, cancel_event)
 
-            # If no text found in auto mode, fallback to image analysis
-            if mode == 'auto' and (not text.strip() or len(text.strip()) < 10):
-                analysis = ImageAnalyzer.analyze_image(image)
-                return {
-                    'type': 'image_analysis',
-                    'content': analysis
-                }
+            # For other modes, run OCR only
+            text = OCRProcessor.image_to_string(image)
 
+            classification = OCRProcessor.classify_text(text)
             return {
                 'type': 'text',
                 'content': text,
-                'is_code': mode == 'code' or (mode == 'auto' and OCRProcessor.detect_code_content(text))
+                'is_code': mode == 'code' or (mode == 'auto' and classification['is_code']),
+                'language': classification['language'],
+                'code_confidence': classification['confidence']
             }
         except Exception as e:
             raise Exception(f"Image processing error: {str(e)}")
 
+    @staticmethod
+    def image_to_string(image):
+        """Recognise text with the configured OCR backend (see [OCR] backend)
+
+        Large captures are first split into candidate text regions; empty areas
+        are skipped and the regions are recognised in parallel.
+        """
+        frame = Frame.coerce(image)
+        config = ClientRegistry().config_manager()
+        backend = ClientRegistry().ocr_backend()
+
+        width, height = frame.size
+        tile_min_pixels = config.getint('OCR', 'tile_min_pixels', fallback=DEFAULT_TILE_MIN_PIXELS)
+        if not config.getboolean('OCR', 'tiled', fallback=True) or width * height < tile_min_pixels:
+            return backend.image_to_string(frame)
+
+        regions = find_text_regions(frame.gray)
+        if not regions:
+            return ""
+        if region_coverage(regions, width, height) > MAX_TILED_COVERAGE:
+            return backend.image_to_string(frame)
+
+        return OCRProcessor.ocr_regions(frame, regions, backend)
+
+    @staticmethod
+    def ocr_regions(image, regions, backend):
+        """OCR each region of image in parallel and join the text in the given order
+
+        Args:
+            image: Frame or PIL Image object
+            regions: (x, y, width, height) boxes, already in reading order
+            backend: OCRBackend used for every region
+
+        Returns:
+            str: Recognised text of all regions separated by blank lines
+        """
+        frame = Frame.coerce(image)
+        # Crops are views of the frame's buffer; pixels are only copied when a backend converts them
+        crops = [frame.crop(region) for region in regions]
+        texts = OCRProcessor.ocr_images(crops, backend)
+        return '\n\n'.join(text.strip() for text in texts if text.strip())
+
+    @staticmethod
+    def ocr_images(images, backend):
+        """OCR several Frames or PIL images in parallel, returning their texts in the same order"""
+        return list(_get_tile_executor().map(backend.image_to_string, images))
+
+    @staticmethod
+    def _process_auto(image, use_ai, cancel_event=None):
+        """Run OCR and image analysis speculatively in parallel
+
+        OCR runs on the calling thread while image analysis (including the
+        vision request) starts on a worker. If OCR finds enough text the
+        analysis branch is cancelled and its result discarded; otherwise the
+        analysis is already under way instead of starting after OCR.
+
+        Returns:
+            dict: Processing result with a 'speculation' entry recording the
+                  winning branch and the latency saved versus running sequentially,
+                  or None if cancel_event was set
+        """
+        start = time.perf_counter()
+        # The analysis branch has its own event: OCR winning cancels it without cancelling the caller
+        caller_cancel = cancel_event
+        cancel_event = threading.Event()
+        analysis_future = _get_speculation_executor().submit(
+            _timed, ImageAnalyzer.analyze_image, image, use_ai=use_ai, cancel_event=cancel_event
+        )
+
+        try:
+            text, ocr_time = _timed(OCRProcessor.image_to_string, image)
+        except Exception:
+            cancel_event.set()
+            analysis_future.cancel()
+            raise
+
+        if len(text.strip()) >= MIN_TEXT_LENGTH or (caller_cancel is not None and caller_cancel.is_set()):
+            # OCR has enough signal (or nobody wants the result); stop the analysis branch early
+            cancel_event.set()
+            analysis_future.cancel()
+            if caller_cancel is not None and caller_cancel.is_set():
+                return None
+            classification = OCRProcessor.classify_text(text)
+            return {
+                'type': 'text',
+                'content': text,
+                'is_code': classification['is_code'],
+                'language': classification['language'],
+                'code_confidence': classification['confidence'],
+                'speculation': {
+                    'winner': 'ocr',
+                    'ocr_ms': ocr_time * 1000,
+                    'wall_ms': (time.perf_counter() - start) * 1000,
+                    'saved_ms': 0.0
+                }
+            }
+
+        while True:
+            try:
+                analysis, analysis_time = analysis_future.result(timeout=CANCEL_POLL_INTERVAL)
+                break
+            except FuturesTimeoutError:
+                if caller_cancel is not None and caller_cancel.is_set():
+                    cancel_event.set()
+                    return None
+        if analysis is None:
+            return None
+        wall_time = time.perf_counter() - start
+        return {
+            'type': 'image_analysis',
+            'content': analysis,
+            'speculation': {
+                'winner': 'image_analysis',
+                'ocr_ms': ocr_time * 1000,
+                'analysis_ms': analysis_time * 1000,
+                'wall_ms': wall_time * 1000,
+                # Sequential auto mode would have paid for both branches back to back
+                'saved_ms': max(0.0, (ocr_time + analysis_time - wall_time) * 1000)
+            }
+        }
+
+    @staticmethod
+    def classify_text(text):
+        """Score text as code, guessing its language (see code_classifier.classify_code)
+
+        The threshold is [Analysis] code_threshold.
+        """
+        threshold = ClientRegistry().config_manager().getfloat(
+            'Analysis', 'code_threshold', fallback=DEFAULT_CODE_THRESHOLD
+        )
+        return classify_code(text, threshold)
+
     @staticmethod
     def detect_code_content(text):
         """Detect if the text contains code or programming questions."""
-        # Check for code patterns
-        code_indicators = [
-            # Programming language keywords
-            r'\b(function|def|class|import|from|var|const|let|for|while|if|else)\b',
-            # Common programming punctuation patterns
-            r'[{};]\s*$',  # Lines ending with { } or ;
-            # Common code patterns
-            r'(\w+)\((.*?)\)',  # Function calls
-            # Error messages
-            r'(error|exception|traceback|undefined|null|nil)\b',
-            # Coding questions indicators
-            r'how (do|to|can) I (code|program|implement|debug|fix)',
-            r'(syntax|runtime|compiler) error',
-            r'(algorithm|function|method|api|library)',
-            r'code (snippet|example|sample)',
-        ]
-
-        for pattern in code_indicators:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-
-        return False
+        return OCRProcessor.classify_text(text)['is_code']
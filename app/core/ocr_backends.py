@@ -0,0 +1,150 @@
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+
+from .frame import Frame
+
+BACKEND_NAMES = ('auto', 'tesserocr', 'process_pool', 'pytesseract')
+
+
+class OCRBackend:
+    """Interface for OCR engines used by OCRProcessor"""
+    name = 'base'
+
+    def image_to_string(self, image):
+        """Return the text recognised in a Frame or PIL image"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Recognise a tiny image so the first real capture doesn't pay for engine start-up"""
+        self.image_to_string(_sample_text_image())
+
+    def close(self):
+        pass
+
+
+def _to_pil(image):
+    """PIL view of a Frame (converted once and cached on the frame) or image as given"""
+    return image.pil if isinstance(image, Frame) else image
+
+
+class PytesseractBackend(OCRBackend):
+    """Runs the tesseract executable once per call (temp file + subprocess)"""
+    name = 'pytesseract'
+
+    def __init__(self, lang='eng'):
+        import pytesseract
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def image_to_string(self, image):
+        return self._pytesseract.image_to_string(_to_pil(image), lang=self.lang)
+
+
+class TesserocrBackend(OCRBackend):
+    """In-process libtesseract through tesserocr
+
+    Each API instance loads the traineddata once and is reused for every call.
+    tesserocr releases the GIL while recognising, so with pool_size > 1
+    concurrent callers are served in parallel, one API instance each.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, pool_size=1, lang='eng'):
+        import tesserocr
+        self._apis = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self._apis.put(tesserocr.PyTessBaseAPI(lang=lang))
+
+    def image_to_string(self, image):
+        api = self._apis.get()
+        try:
+            api.SetImage(_to_pil(image))
+            return api.GetUTF8Text()
+        finally:
+            self._apis.put(api)
+
+    def close(self):
+        while not self._apis.empty():
+            self._apis.get_nowait().End()
+
+
+# Engine loaded once per ProcessPoolBackend worker process
+_worker_backend = None
+
+
+def _init_ocr_worker(lang):
+    global _worker_backend
+    try:
+        _worker_backend = TesserocrBackend(pool_size=1, lang=lang)
+    except ImportError:
+        _worker_backend = PytesseractBackend(lang=lang)
+
+
+def _worker_image_to_string(image):
+    return _worker_backend.image_to_string(image)
+
+
+class ProcessPoolBackend(OCRBackend):
+    """Pool of warm worker processes, each holding its own loaded engine
+
+    Isolates the native engine from the UI process and scales across cores
+    for tiled or batch OCR.
+    """
+    name = 'process_pool'
+
+    def __init__(self, workers=2, lang='eng'):
+        self._executor = ProcessPoolExecutor(
+            max_workers=max(1, workers),
+            initializer=_init_ocr_worker,
+            initargs=(lang,)
+        )
+        self.workers = workers
+
+    def warm_up(self):
+        """Start every worker process and load its engine"""
+        list(self._executor.map(_worker_image_to_string, [_blank_image()] * self.workers))
+
+    def image_to_string(self, image):
+        # Frames hold locks and aren't picklable; ship the PIL image to the worker
+        return self._executor.submit(_worker_image_to_string, _to_pil(image)).result()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _blank_image():
+    from PIL import Image
+    return Image.new('L', (32, 32), 255)
+
+
+def _sample_text_image():
+    from PIL import Image, ImageDraw
+    image = Image.new('L', (96, 32), 255)
+    ImageDraw.Draw(image).text((6, 10), "warm up", fill=0)
+    return image
+
+
+def create_ocr_backend(config_manager):
+    """Create the OCR backend selected by [OCR] backend in the configuration
+
+    'auto' prefers in-process tesserocr and falls back to pytesseract when it
+    isn't installed; an explicitly selected backend that can't be loaded also
+    falls back to pytesseract.
+    """
+    name = config_manager.get('OCR', 'backend', fallback='auto').strip().lower()
+    workers = config_manager.getint('OCR', 'workers', fallback=min(4, os.cpu_count() or 1))
+    lang = config_manager.get('OCR', 'lang', fallback='eng')
+
+    if name not in BACKEND_NAMES:
+        raise ValueError(f"Unknown OCR backend '{name}', expected one of: {', '.join(BACKEND_NAMES)}")
+
+    try:
+        if name in ('auto', 'tesserocr'):
+            return TesserocrBackend(pool_size=workers, lang=lang)
+        if name == 'process_pool':
+            return ProcessPoolBackend(workers=workers, lang=lang)
+    except ImportError:
+        pass
+
+    return PytesseractBackend(lang=lang)
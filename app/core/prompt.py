@@ -0,0 +1,190 @@
+import re
+
+DEFAULT_TOKEN_BUDGET = 30000
+
+# Share of the budget kept from the start of the text when truncating; the
+# rest comes from the end, where logs and tracebacks put the actual error
+HEAD_SHARE = 0.6
+# Repeats of lines at least this long are dropped even when not adjacent
+DEDUPE_MIN_LENGTH = 40
+# Lines where letters and digits make up less than this share are OCR noise
+MIN_ALNUM_RATIO = 0.3
+# Lines where characters outside text and code punctuation make up more than this share are OCR noise
+MAX_SYMBOL_RATIO = 0.3
+
+CODE_PUNCTUATION = set('{}[]()<>;:,.=+-*/%&|!?"\'#_@$\\`^~')
+BRACKETS = set('{}[]()')
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\w\s]|\w+")
+_INNER_WHITESPACE = re.compile(r'(?<=\S)[ \t]{2,}')
+
+
+def estimate_tokens(text):
+    """Estimate the number of Gemini tokens in text without a tokenizer call
+
+    Words count as one token per four characters (at least one), numbers as
+    one per three digits, and every punctuation mark as its own token, which
+    tracks SentencePiece counts closely for English prose, code and logs.
+    """
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if piece.isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif len(piece) > 1:
+            tokens += (len(piece) + 3) // 4
+        else:
+            tokens += 1
+    return tokens
+
+
+def is_garbage_line(line):
+    """Whether an OCR line is recognition noise rather than text or code
+
+    Stray glyphs from icons, borders and gradients come out as short runs of
+    symbols; lines made only of code punctuation (closing brackets, triple
+    quotes, */, -->, ---) are kept.
+    """
+    chars = [c for c in line if not c.isspace()]
+    if not chars:
+        return False
+
+    alnum = sum(c.isalnum() for c in chars)
+    symbols = sum(not c.isalnum() and c not in CODE_PUNCTUATION for c in chars)
+    if symbols > MAX_SYMBOL_RATIO * len(chars):
+        return True
+    if alnum < MIN_ALNUM_RATIO * len(chars) and symbols and not BRACKETS.intersection(chars):
+        return True
+    return False
+
+
+def _clean_lines(text, stats):
+    """Collapse whitespace, drop noise lines and repeated lines"""
+    lines = []
+    seen_long = set()
+    previous = None
+    repeats = 0
+
+    def flush_repeats():
+        if repeats:
+            lines.append(f"[previous line repeated {repeats} more times]")
+
+    for raw in text.splitlines():
+        # Keep indentation, which matters for code, but collapse runs of spaces inside the line
+        line = _INNER_WHITESPACE.sub(' ', raw.rstrip().expandtabs(4))
+
+        if not line:
+            flush_repeats()
+            repeats = 0
+            previous = None
+            # One blank line at most between blocks
+            if lines and lines[-1]:
+                lines.append('')
+            continue
+
+        if is_garbage_line(line):
+            stats['garbage_lines'] += 1
+            continue
+
+        key = line.strip()
+        if key == previous:
+            repeats += 1
+            stats['duplicate_lines'] += 1
+            continue
+        flush_repeats()
+        repeats = 0
+        previous = key
+
+        if len(key) >= DEDUPE_MIN_LENGTH:
+            if key in seen_long:
+                stats['duplicate_lines'] += 1
+                continue
+            seen_long.add(key)
+
+        lines.append(line)
+
+    flush_repeats()
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _cut_line(line, token_budget):
+    """Longest prefix of line (roughly) within token_budget, marked as cut"""
+    cut = line
+    while cut and estimate_tokens(cut) + 1 > token_budget:
+        cost = estimate_tokens(cut) + 1
+        cut = cut[:min(len(cut) - 1, len(cut) * token_budget // cost)]
+    return cut + " [...]"
+
+
+def _truncate(lines, token_budget, stats):
+    """Keep whole lines from the head and tail of the text within token_budget
+
+    A first line longer than the head's share on its own (minified code, a
+    log without line breaks) is cut rather than dropped.
+    """
+    costs = [estimate_tokens(line) + 1 for line in lines]
+    if sum(costs) <= token_budget:
+        return lines
+
+    head_budget = int(token_budget * HEAD_SHARE)
+    head_end, used = 0, 0
+    while head_end < len(lines) and used + costs[head_end] <= head_budget:
+        used += costs[head_end]
+        head_end += 1
+
+    head = lines[:head_end]
+    if not head_end:
+        head = [_cut_line(lines[0], head_budget)]
+        used = estimate_tokens(head[0]) + 1
+        head_end = 1
+
+    tail_start = len(lines)
+    while tail_start > head_end and used + costs[tail_start - 1] <= token_budget:
+        tail_start -= 1
+        used += costs[tail_start]
+
+    omitted = tail_start - head_end
+    stats['truncated_lines'] = omitted
+    if not omitted:
+        return head + lines[tail_start:]
+    return head + [f"[... {omitted} lines omitted ...]"] + lines[tail_start:]
+
+
+def compact_text(text, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Shrink OCR text before it is embedded in a prompt
+
+    Whitespace is collapsed, OCR noise lines and repeated lines are dropped
+    and, if the text is still over token_budget, lines are removed from the
+    middle so the beginning and the end (usually the question and the error)
+    survive.
+
+    Args:
+        text: OCR text
+        token_budget: Maximum estimated tokens of the result; 0 disables truncation
+
+    Returns:
+        tuple: (compacted text, stats dict with 'tokens_before', 'tokens_after',
+               'garbage_lines', 'duplicate_lines' and 'truncated_lines')
+    """
+    stats = {
+        'tokens_before': estimate_tokens(text),
+        'garbage_lines': 0,
+        'duplicate_lines': 0,
+        'truncated_lines': 0
+    }
+
+    lines = _clean_lines(text, stats)
+    if token_budget:
+        lines = _truncate(lines, token_budget, stats)
+
+    compacted = '\n'.join(lines)
+    stats['tokens_after'] = estimate_tokens(compacted)
+    return compacted, stats
+
+
+def format_prompt_stats(stats):
+    """Format compaction stats from GeminiAPI for the status bar"""
+    if not stats:
+        return ""
+    return f"prompt {stats['tokens_before']:,} → {stats['tokens_after']:,} tokens"
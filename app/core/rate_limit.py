@@ -0,0 +1,144 @@
+import time
+import heapq
+import itertools
+import threading
+
+# Request priorities; lower values are served first
+INTERACTIVE = 0
+BATCH = 10
+
+DEFAULT_REQUESTS_PER_MINUTE = 15
+DEFAULT_BURST = 3
+# Pause applied to a model after a 429 that carried no Retry-After header
+DEFAULT_THROTTLE_DELAY = 5.0
+
+
+class RateLimiter:
+    """Client-side token bucket for one model's request quota
+
+    Tokens refill continuously at requests_per_minute / 60 per second up to
+    burst. Callers waiting for a token are served strictly by priority, then
+    in arrival order, so an interactive capture overtakes queued batch or
+    watch-mode requests. When the server answers 429, throttle() pauses the
+    whole bucket, not just the request that was rejected.
+    """
+
+    # Fraction of the configured quota this process may use; batch workers
+    # split the quota between them
+    quota_share = 1.0
+    # Priority used when callers don't pass one
+    default_priority = INTERACTIVE
+
+    def __init__(self, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_BURST):
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stats = {'acquired': 0, 'throttled': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    @classmethod
+    def from_config(cls, config_manager, model):
+        """Create a limiter for model from the [RateLimit] section
+
+        [RateLimit] requests_per_minute is the default quota; a key named after
+        the model overrides it. 0 disables limiting.
+        """
+        default = config_manager.getfloat('RateLimit', 'requests_per_minute', fallback=DEFAULT_REQUESTS_PER_MINUTE)
+        requests_per_minute = config_manager.getfloat('RateLimit', model, fallback=default)
+        return cls(
+            requests_per_minute=requests_per_minute * cls.quota_share,
+            burst=config_manager.getint('RateLimit', 'burst', fallback=DEFAULT_BURST)
+        )
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    @property
+    def queue_depth(self):
+        """Number of callers currently waiting for a token"""
+        with self._condition:
+            return len(self._waiters)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority=None):
+        """Block until a request may be sent
+
+        Args:
+            priority: INTERACTIVE, BATCH or any int (lower is served first);
+                      defaults to default_priority
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+
+        start = time.monotonic()
+        entry = (self.default_priority if priority is None else priority, next(self._sequence))
+
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if self._waiters[0] == entry:
+                    if now >= self._blocked_until and self._tokens >= 1:
+                        heapq.heappop(self._waiters)
+                        self._tokens -= 1
+                        waited = now - start
+                        self._stats['acquired'] += 1
+                        self._stats['total_wait'] += waited
+                        self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+                        # Let the next waiter re-evaluate its position
+                        self._condition.notify_all()
+                        return waited
+                    timeout = max(self._blocked_until - now, (1 - self._tokens) / self.rate, 0.001)
+                else:
+                    # Woken by notify_all when the head of the queue changes
+                    timeout = None
+
+                self._condition.wait(timeout)
+
+    def throttle(self, retry_after=None):
+        """Pause the bucket after the server rejected a request with 429
+
+        Args:
+            retry_after: Seconds from the Retry-After header, if any
+        """
+        delay = DEFAULT_THROTTLE_DELAY if retry_after is None else retry_after
+        with self._condition:
+            self._stats['throttled'] += 1
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._condition.notify_all()
+
+    def stats(self):
+        """Return queue depth and wait statistics"""
+        with self._condition:
+            acquired = self._stats['acquired']
+            return {
+                'queue_depth': len(self._waiters),
+                'acquired': acquired,
+                'throttled': self._stats['throttled'],
+                'avg_wait': self._stats['total_wait'] / acquired if acquired else 0.0,
+                'max_wait': self._stats['max_wait']
+            }
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds from a numeric Retry-After header, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -1,17 +1,48 @@
-import time
-from PIL import ImageGrab
+from .clients import ClientRegistry
+from .frame import Frame
 
 class ScreenshotTaker:
     @staticmethod
-    def take_screenshot(region=None):
+    def take_screenshot(region=None, monitor=None):
         """Take a screenshot of the specified region or entire screen
 
         Args:
             region (tuple): Optional tuple of (x1, y1, x2, y2) coordinates for region selection
+            monitor (int): Optional monitor index to capture (1-based; 0 = all monitors)
+
+        Returns:
+            PIL.Image: RGB screenshot
+        """
+        return ScreenshotTaker.take_frame(region=region, monitor=monitor).pil
+
+    @staticmethod
+    def take_frame(region=None, monitor=None):
+        """Take a screenshot as a Frame wrapping the capture buffer without copying it
+
+        Args:
+            region (tuple): Optional tuple of (x1, y1, x2, y2) coordinates for region selection
+            monitor (int): Optional monitor index to capture (1-based; 0 = all monitors)
+
+        Returns:
+            Frame: Screenshot in the capture backend's channel order
         """
         try:
-            # Take the screenshot of specified region or full screen
-            screenshot = ImageGrab.grab(bbox=region) if region else ImageGrab.grab()
-            return screenshot
+            pixels, channel_order = ScreenshotTaker.grab_array(region=region, monitor=monitor)
+            return Frame(pixels, channel_order)
         except Exception as e:
             raise Exception(f"Error taking screenshot: {str(e)}")
+
+    @staticmethod
+    def grab_array(region=None, monitor=None):
+        """Capture pixels with the configured capture backend (see [Capture] backend)
+
+        Args:
+            region (tuple): Optional tuple of (x1, y1, x2, y2) coordinates
+            monitor (int): Optional monitor index (1-based; 0 = all monitors)
+
+        Returns:
+            tuple: (numpy.ndarray, channel order 'RGB' or 'BGRA'); the array may be a
+                   view of the backend's buffer and must not be modified
+        """
+        backend = ClientRegistry().capture_backend()
+        return backend.grab(region=region, monitor=monitor), backend.channel_order
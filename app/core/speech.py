@@ -1,7 +1,456 @@
-import pyttsx3
+import os
+import re
+import sys
+import time
+import queue
+import threading
+import collections
 from threading import Lock
 
+DEFAULT_RATE = 150
+DEFAULT_VOLUME = 1.0
+
+# Sentences longer than this are split again at commas or spaces so the
+# first audio never waits on a huge run-on paragraph
+MAX_CHUNK_CHARS = 240
+
+# Sentence ends, or line breaks (list items, headings and code lines are spoken one at a time);
+# the period of a list number ("1. ") is not a sentence end
+_SENTENCE_END = re.compile(r'(?<=[.!?])(?<!\d\.)\s+|\s*\n\s*')
+_SOFT_BREAK = re.compile(r'(?<=[,;:])\s+|\s+')
+# The worker caches audio for sentences it spoke live once it has been idle this long
+FILL_IDLE_DELAY = 0.2
+# Sentences waiting to be cached; older ones are dropped first
+FILL_QUEUE_LIMIT = 256
+
+# Markdown markers that would otherwise be read out
+_MARKUP = re.compile(r'```[^\n]*|[`*_#>]+|^\s*(?:[-•]|\d+\.)\s+', re.MULTILINE)
+
+
+def _clean(sentence):
+    return ' '.join(_MARKUP.sub(' ', sentence).split())
+
+
+def _split_long(sentence, max_chars):
+    if len(sentence) <= max_chars:
+        return [sentence]
+    parts, current = [], ""
+    for piece in _SOFT_BREAK.split(sentence):
+        if current and len(current) + len(piece) + 1 > max_chars:
+            parts.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        parts.append(current)
+    return parts
+
+
+def split_sentences(text, max_chars=MAX_CHUNK_CHARS):
+    """Split text into speakable sentences with markdown markers removed
+
+    Args:
+        text: Text to read aloud
+        max_chars: Longest chunk handed to the engine in one utterance
+
+    Returns:
+        list: Non-empty sentences in reading order
+    """
+    sentences = []
+    for raw in _SENTENCE_END.split(text):
+        sentence = _clean(raw)
+        if sentence:
+            sentences.extend(_split_long(sentence, max_chars))
+    return sentences
+
+
+class SentenceBuffer:
+    """Collects streamed text and releases it one complete sentence at a time"""
+
+    def __init__(self, max_chars=MAX_CHUNK_CHARS):
+        self.max_chars = max_chars
+        self._pending = ""
+
+    def feed(self, chunk):
+        """Add a chunk and return the sentences it completed"""
+        self._pending += chunk
+        boundary = None
+        for boundary in _SENTENCE_END.finditer(self._pending):
+            pass
+        if boundary is None:
+            # No sentence end yet; a very long run is released at the chunk limit
+            if len(self._pending) < self.max_chars * 2:
+                return []
+            complete, self._pending = self._pending, ""
+        else:
+            complete, self._pending = self._pending[:boundary.start()], self._pending[boundary.end():]
+        return split_sentences(complete, self.max_chars)
+
+    def flush(self):
+        """Return whatever is left once the stream has ended"""
+        rest, self._pending = self._pending, ""
+        return split_sentences(rest, self.max_chars)
+
+
+def pyttsx3_engine_factory(driver_name=None):
+    """Return a function creating a pyttsx3 engine on the calling (worker) thread
+
+    Args:
+        driver_name: Optional pyttsx3 driver ('sapi5', 'nsss', 'espeak' or a test driver)
+    """
+    def create():
+        if sys.platform == 'win32':
+            # SAPI is a COM server; COM must be initialised on the thread that uses it
+            try:
+                import comtypes
+                comtypes.CoInitialize()
+            except (ImportError, OSError):
+                pass
+        import pyttsx3
+        return pyttsx3.init(driverName=driver_name) if driver_name else pyttsx3.init()
+    return create
+
+
+class SpeechWorker:
+    """Reads text aloud on one long-lived thread that owns the speech engine
+
+    Text is split into sentences which are queued and spoken one utterance
+    at a time, so the first sentence is heard as soon as it has been
+    synthesised rather than after the whole text. Streamed text is fed in
+    with begin_stream()/feed()/end_stream() and each sentence is queued as
+    soon as it is complete.
+
+    stop() (or starting new text) moves to a new generation: queued
+    sentences of older generations are skipped, and the utterance being
+    spoken is stopped at its next word from the engine's 'started-word'
+    callback, i.e. on the engine's own thread.
+
+    With an AudioCache and a player, sentences already in the cache are
+    played from disk instead of being synthesised again. Sentences spoken
+    live are written to the cache with engine.save_to_file() while the
+    worker is idle, one sentence at a time. A fill gives way to new text or
+    stop() at its next word and is retried later.
+
+    Any object with pyttsx3's Engine interface (say, runAndWait, stop,
+    connect, setProperty, getProperty, save_to_file) can be supplied by
+    engine_factory, which is how the worker runs against a fake driver.
+
+    Failures on the speech thread are passed to on_error, if set, as a
+    message; it is called on the speech thread.
+    """
+
+    def __init__(self, engine_factory, rate=DEFAULT_RATE, volume=DEFAULT_VOLUME, voice=None,
+                 max_chars=MAX_CHUNK_CHARS, audio_cache=None, player=None, on_error=None):
+        self.engine_factory = engine_factory
+        self.on_error = on_error
+        self.max_chars = max_chars
+        self.engine = None
+        self.audio_cache = audio_cache if player is not None else None
+        self.player = player
+        self._fills = collections.deque(maxlen=FILL_QUEUE_LIMIT)
+        # Generation current when the running cache fill started, None when not filling
+        self._fill_generation = None
+        self._fill_interrupted = False
+        self._voice_settings = {'rate': rate, 'volume': volume, 'voice': voice}
+        self._queue = queue.Queue()
+        self._lock = Lock()
+        self._generation = 0
+        self._pending = 0  # sentences of the current generation not yet spoken
+        self._streaming = False
+        self._buffer = SentenceBuffer(max_chars)
+        self._ready = threading.Event()
+        self._error = None
+        self._speaking_generation = None
+
+        # Metrics of the current / last read-aloud
+        self._requested = None
+        self._stopped_at = None
+        self.metrics = {
+            'first_sentence_ms': None,
+            'sentences': 0,
+            'spoken_chars': 0,
+            'synthesis_ms': 0.0,
+            'playback_ms': 0.0,
+            'stop_ms': None
+        }
+
+        properties = [('rate', rate), ('volume', max(0.0, min(1.0, volume)))]
+        if voice:
+            properties.append(('voice', voice))
+        for name, value in properties:
+            self._queue.put((None, 'property', (name, value)))
+
+        self._thread = threading.Thread(target=self._run, name='speech', daemon=True)
+        self._thread.start()
+
+    @property
+    def is_speaking(self):
+        # A worker whose engine failed to start never speaks
+        return self._error is None and (self._pending > 0 or self._streaming)
+
+    @property
+    def error(self):
+        """The exception raised while creating the engine, or None"""
+        return self._error
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise Exception(f"Speech engine unavailable: {str(self._error)}")
+
+    def wait_ready(self, timeout=None):
+        """Wait until the engine is created; raises the error if that failed"""
+        self._ready.wait(timeout)
+        if self._error is not None:
+            raise self._error
+
+    def _new_generation(self):
+        """Cancel whatever is queued or being spoken (caller holds the lock)"""
+        if self.is_speaking:
+            self._stopped_at = time.perf_counter()
+        self._generation += 1
+        self._pending = 0
+        self._streaming = False
+        self._buffer = SentenceBuffer(self.max_chars)
+        return self._generation
+
+    def _start(self):
+        """Begin a new read-aloud and reset its metrics (caller holds the lock)"""
+        generation = self._new_generation()
+        self._requested = time.perf_counter()
+        self.metrics.update(first_sentence_ms=None, sentences=0, spoken_chars=0, synthesis_ms=0.0,
+                            playback_ms=0.0)
+        return generation
+
+    def _enqueue(self, generation, sentences):
+        """Queue sentences for generation (caller holds the lock)"""
+        for sentence in sentences:
+            self._pending += 1
+            self._queue.put((generation, 'say', sentence))
+
+    def speak(self, text):
+        """Replace anything being read with text; returns immediately"""
+        self._raise_if_failed()
+        sentences = split_sentences(text or "", self.max_chars)
+        with self._lock:
+            generation = self._start()
+            self._enqueue(generation, sentences)
+
+    def begin_stream(self, text=""):
+        """Start reading text that is still arriving; continue it with feed()"""
+        self._raise_if_failed()
+        with self._lock:
+            generation = self._start()
+            self._streaming = True
+            self._enqueue(generation, self._buffer.feed(text))
+
+    def feed(self, chunk):
+        """Add streamed text; each sentence it completes is queued straight away"""
+        with self._lock:
+            if self._streaming:
+                self._enqueue(self._generation, self._buffer.feed(chunk))
+
+    def end_stream(self):
+        """Queue the rest of the streamed text"""
+        with self._lock:
+            if self._streaming:
+                self._streaming = False
+                self._enqueue(self._generation, self._buffer.flush())
+
+    def stop(self):
+        """Stop reading: drop queued sentences and cut the current one short"""
+        with self._lock:
+            self._new_generation()
+
+    def set_rate(self, rate):
+        """Set the speech rate (words per minute)"""
+        self._queue.put((None, 'property', ('rate', rate)))
+
+    def set_volume(self, volume):
+        """Set the speech volume (0.0 to 1.0)"""
+        self._queue.put((None, 'property', ('volume', max(0.0, min(1.0, volume)))))
+
+    def set_voice(self, voice):
+        self._queue.put((None, 'property', ('voice', voice)))
+
+    def close(self):
+        self.stop()
+        self._queue.put((None, 'close', None))
+
+    def _on_word(self, name, location, length):
+        # Runs on the worker thread inside runAndWait()
+        if self._fill_generation is not None:
+            # Filling the cache: make way as soon as there is something to read or a stop
+            if self._fill_generation != self._generation or not self._queue.empty():
+                self._fill_interrupted = True
+                self.engine.stop()
+            return
+        if self._speaking_generation != self._generation:
+            self.engine.stop()
+        elif self.metrics['first_sentence_ms'] is None and self._requested is not None:
+            self._mark_first_audio()
+
+    def _mark_first_audio(self):
+        with self._lock:
+            if self.metrics['first_sentence_ms'] is None and self._requested is not None:
+                self.metrics['first_sentence_ms'] = (time.perf_counter() - self._requested) * 1000
+
+    def _run(self):
+        try:
+            self.engine = self.engine_factory()
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            with self._lock:
+                # Nothing queued will ever be spoken
+                self._error = e
+                self._pending = 0
+                self._streaming = False
+            self._report(f"Error initializing speech engine: {str(e)}")
+            return
+        finally:
+            self._ready.set()
+
+        if self._voice_settings['voice'] is None and self.audio_cache is not None:
+            self._voice_settings['voice'] = self.engine.getProperty('voice')
+
+        while True:
+            try:
+                generation, kind, payload = self._queue.get(timeout=FILL_IDLE_DELAY if self._fills else None)
+            except queue.Empty:
+                self._fill_next()
+                continue
+            if kind == 'close':
+                return
+            if kind == 'property':
+                self.engine.setProperty(*payload)
+                self._voice_settings[payload[0]] = payload[1]
+                continue
+            if generation != self._generation:
+                continue
+
+            self._speaking_generation = generation
+            start = time.perf_counter()
+            cached = False
+            try:
+                cached = self._say(generation, payload)
+            except Exception as e:
+                self._report(f"Error speaking text: {str(e)}")
+            finished = time.perf_counter()
+            self._speaking_generation = None
+
+            with self._lock:
+                if generation == self._generation:
+                    self._pending -= 1
+                    self._record_sentence(payload, start, finished, cached)
+                elif self._stopped_at is not None:
+                    self.metrics['stop_ms'] = (finished - self._stopped_at) * 1000
+                    self._stopped_at = None
+
+    def _report(self, message):
+        if self.on_error:
+            self.on_error(message)
+
+    def _cache_key(self, sentence):
+        settings = self._voice_settings
+        return self.audio_cache.make_key(sentence, settings['voice'], settings['rate'], settings['volume'])
+
+    def _say(self, generation, sentence):
+        """Speak one sentence, from the audio cache when it has been synthesised before
+
+        Returns:
+            bool: True if the sentence was played from the cache
+        """
+        key = self._cache_key(sentence) if self.audio_cache is not None else None
+        path = self.audio_cache.lookup(key) if key else None
+        if path:
+            try:
+                self._mark_first_audio()
+                self.player.play(path, lambda: self._generation != generation)
+                return True
+            except Exception as e:
+                self._report(f"Error playing cached speech: {str(e)}")
+                self.audio_cache.discard(key)
+
+        self.engine.say(sentence)
+        self.engine.runAndWait()
+        if key:
+            self._fills.append((key, sentence))
+        return False
+
+    def _fill_next(self):
+        """Synthesise one sentence that was spoken live into the audio cache"""
+        if not self._queue.empty() or self.is_speaking:
+            # Something is waiting to be read (or a stream is open); fill later
+            return
+        key, sentence = self._fills.popleft()
+        # Skip clips already cached or whose voice settings have changed since
+        if key != self._cache_key(sentence) or self.audio_cache.contains(key):
+            return
+
+        temp_path = self.audio_cache.temp_path(key)
+        self._fill_interrupted = False
+        self._fill_generation = self._generation
+        start = time.perf_counter()
+        try:
+            self.engine.save_to_file(sentence, temp_path)
+            self.engine.runAndWait()
+            synthesis_ms = (time.perf_counter() - start) * 1000
+            if self._fill_interrupted:
+                # The clip is incomplete; synthesise it again at the next idle moment
+                self._fills.appendleft((key, sentence))
+            elif os.path.exists(temp_path) and os.path.getsize(temp_path) > 0:
+                self.audio_cache.store(key, temp_path, synthesis_ms)
+        except Exception as e:
+            self._report(f"Error caching speech: {str(e)}")
+        finally:
+            self._fill_generation = None
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _record_sentence(self, sentence, start, finished, cached=False):
+        metrics = self.metrics
+        if metrics['first_sentence_ms'] is None and self._requested is not None:
+            # Drivers that don't report words: the first sentence finished
+            metrics['first_sentence_ms'] = (finished - self._requested) * 1000
+        metrics['sentences'] += 1
+        metrics['spoken_chars'] += len(sentence)
+        # Time spent playing cached clips is not synthesis
+        metrics['playback_ms' if cached else 'synthesis_ms'] += (finished - start) * 1000
+
+    def stats(self):
+        """Return a copy of the metrics of the current or last read-aloud
+
+        With an audio cache, its process-wide 'cache_hits', 'cache_misses',
+        'cache_hit_rate' and 'cache_saved_ms' (synthesis time avoided) are
+        included.
+        """
+        with self._lock:
+            stats = dict(self.metrics)
+        if self.audio_cache is not None:
+            cache = self.audio_cache.stats()
+            stats.update(cache_hits=cache['hits'], cache_misses=cache['misses'],
+                         cache_hit_rate=cache['hit_rate'], cache_saved_ms=cache['saved_ms'])
+        return stats
+
+
+def format_speech_stats(stats):
+    """Format SpeechWorker.stats() for the status bar"""
+    parts = []
+    if stats.get('first_sentence_ms') is not None:
+        parts.append(f"first sentence after {stats['first_sentence_ms']:.0f} ms")
+    if stats.get('sentences'):
+        parts.append(f"{stats['sentences']} sentences")
+    if stats.get('stop_ms') is not None:
+        parts.append(f"stopped in {stats['stop_ms']:.0f} ms")
+    if stats.get('cache_hits') or stats.get('cache_misses'):
+        parts.append(f"audio cache {stats['cache_hit_rate']:.0%} hits, "
+                     f"{stats['cache_saved_ms'] / 1000:.1f} s synthesis saved")
+    elif stats.get('cache_status') == 'no player':
+        parts.append("audio cache off (install simpleaudio to enable it)")
+    return ', '.join(parts)
+
+
 class SpeechService:
+    """Process-wide speech worker configured from the [Speech] settings"""
     _instance = None
     _lock = Lock()
 
@@ -13,33 +462,83 @@ class SpeechService:
             return cls._instance
 
     def _initialize(self):
-        """Initialize the speech engine."""
-        self.engine = pyttsx3.init()
-        self.engine.setProperty('rate', 150)  # Speed of speech
-        self.engine.setProperty('volume', 1.0)  # Volume level
-        self.is_speaking = False
+        """Start the speech worker; the engine itself is created on the worker thread"""
+        from .clients import ClientRegistry
+
+        config = ClientRegistry().config_manager()
+        driver = config.get('Speech', 'driver', fallback='').strip() or None
+
+        # Replays come from pre-synthesised clips when this platform can play them
+        audio_cache, player = None, None
+        # 'on', 'off' (turned off in the settings) or 'no player' (nothing installed to play clips)
+        self.cache_status = 'off'
+        if config.getboolean('Speech', 'audio_cache', fallback=True):
+            from .audio_cache import AudioCache, create_audio_player
+            player = create_audio_player()
+            if player is not None:
+                audio_cache = AudioCache.from_config(config)
+                self.cache_status = 'on'
+            else:
+                self.cache_status = 'no player'
+
+        self.worker = SpeechWorker(
+            pyttsx3_engine_factory(driver),
+            rate=config.getint('Speech', 'rate', fallback=DEFAULT_RATE),
+            volume=config.getfloat('Speech', 'volume', fallback=DEFAULT_VOLUME),
+            voice=config.get('Speech', 'voice', fallback='').strip() or None,
+            max_chars=config.getint('Speech', 'max_chunk_chars', fallback=MAX_CHUNK_CHARS),
+            audio_cache=audio_cache,
+            player=player
+        )
+
+    @property
+    def is_speaking(self):
+        return self.worker.is_speaking
+
+    @property
+    def error(self):
+        """Why the speech engine could not be started, or None"""
+        return self.worker.error
 
     def speak(self, text):
-        """Convert text to speech."""
-        if not text:
-            return
+        """Read text aloud, replacing anything being read; returns immediately
 
-        self.stop()  # Stop any ongoing speech
-        self.is_speaking = True
-        self.engine.say(text)
-        self.engine.runAndWait()
-        self.is_speaking = False
+        Raises an exception when the speech engine failed to start.
+        """
+        if text:
+            self.worker.speak(text)
+
+    def begin_stream(self, text=""):
+        self.worker.begin_stream(text)
+
+    def feed(self, chunk):
+        self.worker.feed(chunk)
+
+    def end_stream(self):
+        self.worker.end_stream()
 
     def stop(self):
-        """Stop the current speech."""
-        if self.is_speaking:
-            self.engine.stop()
-            self.is_speaking = False
+        """Stop the current speech"""
+        self.worker.stop()
+
+    def stats(self):
+        """SpeechWorker.stats() plus 'cache_status': 'on', 'off' or 'no player'"""
+        stats = self.worker.stats()
+        stats['cache_status'] = self.cache_status
+        return stats
+
+    def set_error_callback(self, on_error):
+        """Pass failures on the speech thread to on_error(message)
+
+        An engine that failed to start before this was called is still
+        reported through error and by speak().
+        """
+        self.worker.on_error = on_error
 
     def set_rate(self, rate):
         """Set the speech rate (words per minute)."""
-        self.engine.setProperty('rate', rate)
+        self.worker.set_rate(rate)
 
     def set_volume(self, volume):
         """Set the speech volume (0.0 to 1.0)."""
-        self.engine.setProperty('volume', max(0.0, min(1.0, volume)))
+        self.worker.set_volume(volume)
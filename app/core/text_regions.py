@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+
+# Kernel joining characters into words, lines and paragraph blocks
+BLOCK_KERNEL = (21, 11)
+# Candidate blocks smaller than this (in either dimension) are noise
+MIN_BLOCK_SIZE = 8
+# Fraction of a block's box that must be stroke pixels for it to be text-like
+MIN_STROKE_DENSITY = 0.08
+# Padding added around each block so glyph edges aren't clipped
+BLOCK_PADDING = 6
+# A block joins the current row when at least this fraction of its height
+# lies within the row's vertical span
+ROW_OVERLAP = 0.5
+
+
+def find_text_regions(gray):
+    """Find candidate text blocks in a grayscale image
+
+    Character strokes are highlighted with a morphological gradient,
+    binarised with Otsu's threshold and closed with a wide kernel so
+    characters merge into words, lines and blocks. Each connected component
+    with enough stroke density becomes a region. Flat areas (whitespace,
+    solid UI panels) produce no regions at all.
+
+    Args:
+        gray: Grayscale image as a NumPy array
+
+    Returns:
+        list: (x, y, width, height) boxes in reading order
+    """
+    height, width = gray.shape[:2]
+
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, strokes = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    if not np.any(strokes):
+        return []
+
+    blocks = cv2.morphologyEx(strokes, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, BLOCK_KERNEL))
+    count, _, stats, _ = cv2.connectedComponentsWithStats(blocks, connectivity=8)
+
+    regions = []
+    for x, y, w, h, _ in stats[1:count]:
+        if w < MIN_BLOCK_SIZE or h < MIN_BLOCK_SIZE:
+            continue
+        if np.count_nonzero(strokes[y:y + h, x:x + w]) < MIN_STROKE_DENSITY * w * h:
+            continue
+
+        x0, y0 = max(0, x - BLOCK_PADDING), max(0, y - BLOCK_PADDING)
+        x1, y1 = min(width, x + w + BLOCK_PADDING), min(height, y + h + BLOCK_PADDING)
+        regions.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+
+    return sort_reading_order(regions)
+
+
+def sort_reading_order(regions):
+    """Sort boxes top-to-bottom, then left-to-right within a row
+
+    Rows are formed by vertical overlap rather than fixed bands, so blocks
+    on one visual line stay together whatever their exact tops. A tall block
+    (a side-by-side pane) spans everything beside it, which puts the panes in
+    one row and reads them one after the other instead of line by line.
+    """
+    rows = []
+    for box in sorted(regions, key=lambda box: (box[1], box[0])):
+        _, y, _, h = box
+        if rows and min(rows[-1][0], y + h) - y >= ROW_OVERLAP * h:
+            rows[-1][0] = max(rows[-1][0], y + h)
+            rows[-1][1].append(box)
+        else:
+            rows.append([y + h, [box]])
+
+    return [box for _, row in rows for box in sorted(row, key=lambda box: (box[0], box[1]))]
+
+
+def region_coverage(regions, width, height):
+    """Fraction of the image area covered by the region boxes (overlaps counted twice)"""
+    return sum(w * h for _, _, w, h in regions) / float(width * height)
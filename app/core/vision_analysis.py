@@ -1,51 +1,104 @@
 import requests
 import json
+import time
 import base64
+import threading
 from io import BytesIO
 from PIL import Image
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from .cache import ResponseCache, image_digest
+from .clients import ClientRegistry
+from .frame import Frame
+from .image_encoding import EncodeBudget
+
+VISION_MODEL = 'gemini-1.5-flash'
+VISION_PROMPT = (
+    "Please analyze this image and provide a detailed description of its content. Include:"
+    "\n1. Main subjects or objects in the image"
+    "\n2. Scene description and setting"
+    "\n3. Notable visual elements (colors, lighting, composition)"
+    "\n4. Any text or symbols if present"
+    "\n5. Overall context and purpose of the image"
+)
 
 class VisionAnalyzer:
     def __init__(self, config_manager):
         self.config_manager = config_manager
+        self.cache = ClientRegistry().response_cache()
+        self._local = threading.local()
         self._setup_gemini()
 
+    @property
+    def last_cache_hit(self):
+        """Whether the last analysis on this thread was answered from the response cache"""
+        return getattr(self._local, 'cache_hit', False)
+
+    @property
+    def last_upload(self):
+        """Bytes sent, encode time and latency of the last upload made on this thread"""
+        return getattr(self._local, 'upload', None)
+
     def _setup_gemini(self):
         """Initialize Gemini API with configuration"""
         api_key = self.config_manager.get('API', 'gemini_api_key')
         if not api_key:
             raise ValueError("Gemini API key not found in config.ini")
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.model_name = self.config_manager.get('API', 'vision_model', fallback=VISION_MODEL)
+        self.model = genai.GenerativeModel(self.model_name)
 
-    def analyze_image_content(self, image):
+    def analyze_image_content(self, image, use_cache=True, cancel_event=None):
         """Analyze image content using Gemini Vision API
 
         Args:
-            image: PIL Image object
+            image: Frame or PIL Image object
+            use_cache: bool, whether a cached description may be returned
+            cancel_event: Optional threading.Event; once set, the request is
+                          abandoned before it is sent and None is returned
 
         Returns:
-            str: Detailed description of the image content
+            str: Detailed description of the image content; bytes sent, encode
+                 time and response latency are recorded in last_upload
         """
         try:
             # Ensure image is in correct format
-            if not isinstance(image, Image.Image):
-                raise ValueError("Input must be a PIL Image object")
-
-            # Prepare the prompt
-            prompt = (
-                "Please analyze this image and provide a detailed description of its content. Include:"
-                "\n1. Main subjects or objects in the image"
-                "\n2. Scene description and setting"
-                "\n3. Notable visual elements (colors, lighting, composition)"
-                "\n4. Any text or symbols if present"
-                "\n5. Overall context and purpose of the image"
-            )
-
-            # Generate content using Gemini Vision API
-            response = self.model.generate_content([prompt, image])
+            if not isinstance(image, (Frame, Image.Image)):
+                raise ValueError("Input must be a Frame or PIL Image object")
+            frame = Frame.coerce(image)
+
+            self._local.cache_hit = False
+            self._local.upload = None
+            budget = EncodeBudget.from_config(self.config_manager)
+            cache_key = None
+            if use_cache and self.config_manager.getboolean('Cache', 'enabled', fallback=True):
+                digest = image_digest(frame, budget.max_pixels)
+                cache_key = ResponseCache.make_key(digest, 'vision', VISION_PROMPT, self.model_name)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    self._local.cache_hit = True
+                    return cached
+
+            # Downscale and re-encode to the [Vision] upload budget
+            data, mime_type, upload = budget.encode(frame)
+            limiter = ClientRegistry().rate_limiter(self.model_name)
+            upload['queued_ms'] = limiter.acquire() * 1000
+            # The caller may have lost interest while this request was queued
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            start = time.perf_counter()
+            try:
+                response = self.model.generate_content([VISION_PROMPT, {'mime_type': mime_type, 'data': data}])
+            except google_exceptions.ResourceExhausted:
+                # Quota exceeded: hold back every queued vision request, not just this one
+                limiter.throttle()
+                raise
+            upload['latency_ms'] = (time.perf_counter() - start) * 1000
+            self._local.upload = upload
 
             if response.text:
+                if cache_key:
+                    self.cache.put(cache_key, response.text)
                 return response.text
             else:
                 return "No description could be generated for this image."
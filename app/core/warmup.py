@@ -0,0 +1,118 @@
+import time
+
+from .clients import ClientRegistry
+
+# Size of the synthetic frame pushed through the OpenCV analyzers
+WARMUP_FRAME_SIZE = (160, 120)
+
+# Capture modes that may call the vision model
+VISION_MODES = ('vision', 'image', 'auto')
+
+
+def _warm_capture():
+    ClientRegistry().capture_backend()
+
+
+def _warm_ocr():
+    ClientRegistry().ocr_backend().warm_up()
+
+
+def _warm_opencv():
+    """Run the analyzers and text-region detection on a small synthetic frame
+
+    This loads OpenCV and NumPy, starts the analyzer thread pool and touches
+    every cv2 code path used by ImageAnalyzer and tiled OCR.
+    """
+    import numpy as np
+    from .frame import Frame
+    from .image_analysis import ImageAnalyzer
+    from .text_regions import find_text_regions
+
+    width, height = WARMUP_FRAME_SIZE
+    pixels = np.full((height, width, 3), 230, dtype=np.uint8)
+    pixels[20:40, 10:150] = 30
+    pixels[60:100, 40:120] = (200, 80, 40)
+    frame = Frame(pixels, 'RGB')
+
+    ImageAnalyzer.configure(ClientRegistry().config_manager())
+    ImageAnalyzer.analyze_image(frame, use_ai=False)
+    find_text_regions(frame.gray)
+
+
+def _warm_connection():
+    """Pre-open a pooled TLS connection to the Gemini API host"""
+    from .api import GEMINI_BASE_URL
+
+    ClientRegistry().gemini_api().http.warm_up(GEMINI_BASE_URL)
+
+
+def _warm_vision():
+    # Importing and configuring the Gemini SDK takes noticeably long
+    ClientRegistry().vision_analyzer()
+
+
+def warmup_steps(config_manager):
+    """Return the (label, function) warm-up steps that apply to the current settings"""
+    steps = [
+        ('screen capture', _warm_capture),
+        ('OCR engine', _warm_ocr),
+        ('OpenCV', _warm_opencv)
+    ]
+    if config_manager.get('API', 'gemini_api_key', fallback='').strip():
+        steps.append(('API connection', _warm_connection))
+        # Auto and image modes also describe captures with the vision model
+        if config_manager.get('Settings', 'mode', fallback='auto') in VISION_MODES:
+            steps.append(('vision model', _warm_vision))
+    return steps
+
+
+def run_warmup(config_manager, cancel_event=None, on_step=None):
+    """Initialise what the first capture needs, one step at a time
+
+    A failing step is recorded and skipped; the component is simply
+    initialised on first use instead.
+
+    Args:
+        config_manager: Application configuration
+        cancel_event: Optional threading.Event checked between steps
+        on_step: Optional callback receiving the label of each step before it runs
+
+    Returns:
+        dict: 'steps' list of (label, milliseconds, error or None), 'total_ms'
+              and 'cancelled'
+    """
+    start = time.perf_counter()
+    results = []
+    cancelled = False
+
+    for label, step in warmup_steps(config_manager):
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            break
+        if on_step:
+            on_step(label)
+
+        step_start = time.perf_counter()
+        try:
+            step()
+            error = None
+        except Exception as e:
+            error = str(e)
+        results.append((label, (time.perf_counter() - step_start) * 1000, error))
+
+    return {
+        'steps': results,
+        'total_ms': (time.perf_counter() - start) * 1000,
+        'cancelled': cancelled
+    }
+
+
+def format_warmup(result):
+    """Format a run_warmup result for the status bar"""
+    if result['cancelled']:
+        return "Warm-up cancelled"
+    failed = [label for label, _, error in result['steps'] if error]
+    message = f"Warmed up in {result['total_ms']:.0f} ms"
+    if failed:
+        message += f" ({', '.join(failed)} will load on first use)"
+    return message
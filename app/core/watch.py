@@ -0,0 +1,176 @@
+import time
+import difflib
+import hashlib
+import threading
+
+import cv2
+import numpy as np
+
+from .screenshot import ScreenshotTaker
+from .ocr import OCRProcessor
+from .clients import ClientRegistry
+from .text_regions import find_text_regions
+from .rate_limit import BATCH
+
+# Frames are compared at 1/DIFF_SUBSAMPLE resolution
+DIFF_SUBSAMPLE = 4
+# A pixel counts as changed when its gray level moves by more than this
+PIXEL_CHANGE_LEVEL = 24
+
+
+def frame_changed(previous, current, threshold):
+    """Cheap frame difference on subsampled grayscale frames
+
+    Args:
+        previous: Previous grayscale frame (NumPy array) or None
+        current: Current grayscale frame
+        threshold: Fraction of sampled pixels that must change
+
+    Returns:
+        bool: True if the frames differ enough to be re-processed
+    """
+    if previous is None or previous.shape != current.shape:
+        return True
+    diff = cv2.absdiff(previous[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE], current[::DIFF_SUBSAMPLE, ::DIFF_SUBSAMPLE])
+    return np.count_nonzero(diff > PIXEL_CHANGE_LEVEL) > threshold * diff.size
+
+
+def text_delta(previous, current):
+    """Line-level difference between two texts
+
+    Returns:
+        dict: 'added' and 'removed' line lists and 'change_ratio' (0 = identical, 1 = all new)
+    """
+    previous_lines = previous.splitlines()
+    current_lines = current.splitlines()
+    matcher = difflib.SequenceMatcher(None, previous_lines, current_lines, autojunk=False)
+
+    added, removed = [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.extend(previous_lines[i1:i2])
+        if tag in ('replace', 'insert'):
+            added.extend(current_lines[j1:j2])
+
+    return {
+        'added': added,
+        'removed': removed,
+        'change_ratio': 1.0 - matcher.ratio()
+    }
+
+
+class RegionWatcher:
+    """Re-captures a fixed screen region and reports text changes incrementally
+
+    Unchanged frames are skipped after a cheap difference check. For changed
+    frames only the text regions whose pixels changed are re-OCR'd; the rest
+    reuse the text recognised for identical pixels in an earlier frame.
+    Gemini is queried only when the text has drifted far enough from what was
+    last sent.
+    """
+
+    def __init__(self, region, on_update, on_response=None, config_manager=None):
+        """
+        Args:
+            region: (x1, y1, x2, y2) screen coordinates to watch
+            on_update: Called from the watch thread with an update dict
+                       ('text', 'added', 'removed', 'change_ratio', 'stats')
+            on_response: Optional callback receiving (response, is_code_related)
+                         when Gemini is queried
+            config_manager: Defaults to the shared ConfigManager
+        """
+        self.region = region
+        self.on_update = on_update
+        self.on_response = on_response
+
+        config = config_manager or ClientRegistry().config_manager()
+        self.config_manager = config
+        self.interval = config.getfloat('Watch', 'interval', fallback=1.0)
+        self.diff_threshold = config.getfloat('Watch', 'diff_threshold', fallback=0.001)
+        self.gemini_threshold = config.getfloat('Watch', 'gemini_threshold', fallback=0.2)
+
+        self.stats = {'frames': 0, 'skipped': 0, 'tiles_ocr': 0, 'tiles_reused': 0, 'queries': 0}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._tile_texts = {}
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='region-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        previous_gray = None
+        previous_text = ""
+        sent_text = ""
+
+        while not self._stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                frame = ScreenshotTaker.take_frame(region=self.region)
+                gray = frame.gray
+                self.stats['frames'] += 1
+
+                if frame_changed(previous_gray, gray, self.diff_threshold):
+                    previous_gray = gray
+                    text = self._incremental_ocr(frame)
+
+                    if text != previous_text:
+                        delta = text_delta(previous_text, text)
+                        previous_text = text
+                        self.on_update({'text': text, 'stats': dict(self.stats), **delta})
+
+                        if self.on_response and text.strip() and \
+                                text_delta(sent_text, text)['change_ratio'] >= self.gemini_threshold:
+                            sent_text = text
+                            self._query_gemini(text)
+                else:
+                    self.stats['skipped'] += 1
+            except Exception as e:
+                self.on_update({'error': str(e), 'stats': dict(self.stats)})
+
+            # Keep a steady capture rate regardless of how long processing took
+            self._stop_event.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def _incremental_ocr(self, frame):
+        """OCR only the text regions whose pixels weren't seen in the previous frame"""
+        gray = frame.gray
+        regions = find_text_regions(gray)
+        keys = [hashlib.blake2b(gray[y:y + h, x:x + w].tobytes(), digest_size=16).digest()
+                for x, y, w, h in regions]
+
+        missing = [(key, region) for key, region in zip(keys, regions) if key not in self._tile_texts]
+        self.stats['tiles_reused'] += len(regions) - len(missing)
+        self.stats['tiles_ocr'] += len(missing)
+
+        texts = dict(self._tile_texts)
+        if missing:
+            backend = ClientRegistry().ocr_backend()
+            # Only the changed tiles are converted for the OCR engine
+            crops = [frame.crop(region) for _, region in missing]
+            for (key, _), text in zip(missing, OCRProcessor.ocr_images(crops, backend)):
+                texts[key] = text.strip()
+
+        # Keep only the tiles of the current frame
+        self._tile_texts = {key: texts[key] for key in keys}
+        return '\n\n'.join(texts[key] for key in keys if texts[key])
+
+    def _query_gemini(self, text):
+        mode = self.config_manager.get('Settings', 'mode')
+        classification = OCRProcessor.classify_text(text)
+        is_code_related = classification['is_code'] if mode == "auto" else (mode == "code")
+        self.stats['queries'] += 1
+        # Background re-queries yield to interactive captures when the quota is tight
+        response = ClientRegistry().gemini_api().query_gemini(
+            text, is_code_related, priority=BATCH, language=classification['language']
+        )
+        self.on_response(response, is_code_related)
@@ -1,17 +1,20 @@
 import os
 import sys
+import importlib.util
 
 # Add parent directory to path to allow imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# Check if dependencies are installed
-try:
-    from PIL import ImageGrab, Image
-    import pytesseract
-    import keyboard
-    import requests
-    import customtkinter
-except ImportError:
+# Check if dependencies are installed without importing them; they are
+# loaded on first use so the window appears as early as possible
+REQUIRED_MODULES = ('PIL', 'pytesseract', 'keyboard', 'requests', 'customtkinter')
+
+
+def missing_modules():
+    return [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+
+
+if missing_modules():
     # If not installed, try to install them
     print("Some dependencies are missing. Attempting to install...")
     try:
@@ -24,24 +27,22 @@ except ImportError:
             import subprocess
             subprocess.check_call([sys.executable, "-m", "pip", "install", "pillow", "pytesseract", "keyboard", "requests", "customtkinter"])
 
-        # Try importing again
-        from PIL import ImageGrab, Image
-        import pytesseract
-        import keyboard
-        import requests
-        import customtkinter
+        # Check again
+        importlib.invalidate_caches()
+        if missing_modules():
+            raise ImportError(f"Still missing: {', '.join(missing_modules())}")
     except Exception as e:
         print(f"Error installing dependencies: {str(e)}")
         print("Please run 'pip install pillow pytesseract keyboard requests customtkinter' manually.")
         sys.exit(1)
 
-from app.utils.config import ConfigManager
+from app.core.clients import ClientRegistry
 from app.utils.hotkey import HotkeyManager
 from app.ui.ctk_main_window import CTkMainWindow
 
 def main():
-    # Initialize configuration
-    config_manager = ConfigManager()
+    # Initialize configuration, shared with every core component
+    config_manager = ClientRegistry().config_manager()
 
     # Initialize hotkey manager
     hotkey_manager = HotkeyManager(config_manager)
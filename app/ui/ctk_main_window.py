@@ -1,18 +1,32 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
-import threading
-import re
-from PIL import Image, ImageTk
+import time
+import itertools
 
 from app.ui.dialogs import PreferencesDialog, APISettingsDialog, HotkeyDialog
 from app.ui.ctk_theme import CTkTheme
 from app.ui.ctk_selection_window import CTkSelectionWindow
-from app.core.screenshot import ScreenshotTaker
-from app.core.ocr import OCRProcessor
-from app.core.api import GeminiAPI
-from app.core.speech import SpeechService
-from app.core.vision_analysis import VisionAnalyzer
+from app.ui.markdown import MarkdownRenderer, split_complete
+from app.ui.history_panel import HistoryPanel
+from app.core.clients import ClientRegistry
+from app.core.prompt import format_prompt_stats
+from app.core.code_classifier import language_label
+from app.core.jobs import JobExecutor, DEFAULT_WORKERS
+from app.core.warmup import run_warmup, format_warmup
+
+# Capture, OCR, OpenCV, HTTP and speech modules are imported where they are
+# first used so the window appears without loading them (see
+# benchmarks/bench_startup.py)
+
+# The job queue is drained once per frame at 60 fps
+JOB_POLL_INTERVAL_MS = 16
+# Events delivered per tick, so a burst of streamed chunks can't stall a frame
+JOB_EVENTS_PER_TICK = 50
+# Delay between the window appearing and the background warm-up starting
+DEFAULT_WARMUP_DELAY_MS = 500
+# Captures held for the history while its store is still opening
+PENDING_HISTORY_LIMIT = 20
 
 class CTkMainWindow:
     def __init__(self, config_manager, hotkey_manager):
@@ -32,6 +46,7 @@ class CTkMainWindow:
         self.status_var = tk.StringVar()
         self.progress_var = tk.StringVar(value="")
         self.mode_var = tk.StringVar()
+        self.cache_var = tk.BooleanVar()
 
         # Apply modern theme
         self.theme = CTkTheme.apply()
@@ -39,16 +54,97 @@ class CTkMainWindow:
         self.fonts = self.theme['fonts']
         self.animations = CTkTheme.configure_animations()
 
-        # Initialize API, Speech Service and Vision Analyzer
-        self.gemini_api = GeminiAPI(self.config_manager)
-        self.speech_service = SpeechService()
-        self.vision_analyzer = VisionAnalyzer(self.config_manager)
+        # Active RegionWatcher while watch mode is on
+        self.watcher = None
+
+        # Capture processing and API requests run here, never on the Tk thread
+        self.jobs = JobExecutor(max_workers=self.config_manager.getint('Jobs', 'workers', fallback=DEFAULT_WORKERS))
+
+        # API clients come from the shared registry and, like the speech
+        # engine, are created on first use rather than before the window shows
+        self.clients = ClientRegistry()
+        self.clients.set_config_manager(self.config_manager)
+        self._speech_service = None
+        # True while speech follows a response that is still streaming in
+        self._speech_following = False
+        self._stream_started = False
+        # True while the speak button's pulse loop is scheduled
+        self._speak_pulsing = False
+
+        # The History tab is built when first opened; the store is opened on a
+        # job worker after launch (schema setup and the id scan stay off the Tk thread)
+        self.history_panel = None
+        self._history_store = None
+        # Captures taken before the store is open, keyed by negative placeholder
+        # ids, and the store ids they were given once written
+        self._pending_history = {}
+        self._pending_history_ids = itertools.count(-1, -1)
+        self._history_ids = {}
 
         # Setup UI
         self.setup_ui()
+        self.markdown = MarkdownRenderer(self.response_output._textbox)
+
+        # Setup hotkey; the callback fires on the keyboard thread, so hand it to the Tk thread
+        self.hotkey_manager.start_listening(lambda: self.jobs.call_soon(self.take_screenshot))
+        self.poll_jobs()
+
+        delay = self.config_manager.getint('Startup', 'warmup_delay_ms', fallback=DEFAULT_WARMUP_DELAY_MS)
+        self.root.after(delay, self.open_history_store)
+        if self.config_manager.getboolean('Startup', 'warmup', fallback=True):
+            self.root.after(delay, self.start_warmup)
+
+    @property
+    def speech_service(self):
+        if self._speech_service is None:
+            from app.core.speech import SpeechService
+            self._speech_service = SpeechService()
+            self._speech_service.set_error_callback(lambda message: self.jobs.call_soon(self.set_status, message))
+        return self._speech_service
+
+    @property
+    def history_store(self):
+        """The opened HistoryStore, or None until open_history_store() has finished"""
+        return self._history_store
+
+    def load_history_store(self):
+        """Open the history store and remember it for the Tk thread (runs on a job worker)"""
+        store = self.clients.history_store()
+        store.on_error = lambda message: self.jobs.call_soon(self.set_status, message)
+        self._history_store = store
+        self.jobs.call_soon(self.flush_pending_history)
+        return store
+
+    def open_history_store(self):
+        """Start opening the history store in the background unless it is open, opening or off"""
+        if self._history_store is not None or self.jobs.active('history_open'):
+            return
+        if not self.config_manager.getboolean('History', 'enabled', fallback=True):
+            return
+        self.jobs.submit(lambda job: self.load_history_store(), key='history_open',
+                         on_error=self.show_history_error)
+
+    def show_history_error(self, error):
+        """Report that the history store could not be opened; held captures are dropped"""
+        self._pending_history.clear()
+        self.set_status(f"Capture history unavailable: {str(error)}")
+
+    def flush_pending_history(self):
+        """Write captures taken while the store was opening (called from main thread)"""
+        if self._history_store is None:
+            return
+        pending, self._pending_history = self._pending_history, {}
+        for placeholder, (mode, kind, text, response, screenshot) in pending.items():
+            self._history_ids[placeholder] = self._history_store.record(mode, kind, text, response, frame=screenshot)
+
+    @property
+    def gemini_api(self):
+        return self.clients.gemini_api()
 
-        # Setup hotkey
-        self.hotkey_manager.start_listening(self.take_screenshot)
+    @property
+    def vision_analyzer(self):
+        # Rebuilt by the registry when the API key or vision model changes
+        return self.clients.vision_analyzer()
 
     def setup_ui(self):
         # Configure grid layout
@@ -87,6 +183,16 @@ class CTkMainWindow:
         )
         self.mode_options.grid(row=0, column=1, padx=5, pady=10)
 
+        # Response cache toggle; turning it off forces a fresh API round-trip
+        self.cache_var.set(self.config_manager.getboolean('Cache', 'enabled', fallback=True))
+        self.cache_switch = ctk.CTkSwitch(
+            self.mode_frame,
+            text="Use cache",
+            variable=self.cache_var,
+            command=self.save_cache_setting
+        )
+        self.cache_switch.grid(row=0, column=2, padx=(15, 5), pady=10)
+
         # Action buttons with modern styling
         self.button_frame = ctk.CTkFrame(self.root, corner_radius=10, fg_color="transparent")
         self.button_frame.grid(row=1, column=0, sticky="e", padx=20)
@@ -135,13 +241,25 @@ class CTkMainWindow:
         )
         self.speak_btn.grid(row=0, column=3, padx=(0, 10), pady=10)
 
+        self.watch_btn = ctk.CTkButton(
+            self.button_frame,
+            text="Watch Region",
+            command=self.toggle_watch,
+            fg_color=self.colors['secondary'],
+            hover_color=self.colors['secondary_light'],
+            corner_radius=8,
+            height=36
+        )
+        self.watch_btn.grid(row=0, column=4, padx=(0, 10), pady=10)
+
         # Tabview for different outputs
-        self.tabview = ctk.CTkTabview(self.root, corner_radius=10)
+        self.tabview = ctk.CTkTabview(self.root, corner_radius=10, command=self.on_tab_changed)
         self.tabview.grid(row=2, column=0, sticky="nsew", padx=20, pady=(0, 10))
 
         # Create tabs
         self.text_tab = self.tabview.add("Extracted Text")
         self.response_tab = self.tabview.add("AI Response")
+        self.history_tab = self.tabview.add("History")
 
         # Configure tab grid
         self.text_tab.grid_columnconfigure(0, weight=1)
@@ -235,6 +353,10 @@ class CTkMainWindow:
         self.config_manager.set('Settings', 'mode', self.mode_var.get())
         self.status_var.set(f"Mode set to: {self.mode_var.get()}")
 
+    def save_cache_setting(self):
+        self.config_manager.set('Cache', 'enabled', str(self.cache_var.get()))
+        self.status_var.set("Response cache " + ("enabled" if self.cache_var.get() else "bypassed"))
+
     def open_preferences(self):
         dialog = PreferencesDialog(self.root, self.config_manager, self.set_status)
         dialog.open()
@@ -250,147 +372,440 @@ class CTkMainWindow:
     def set_status(self, message):
         self.status_var.set(message)
 
+    def on_tab_changed(self):
+        if self.tabview.get() != "History":
+            return
+        if self.history_panel is None:
+            self.history_panel = HistoryPanel(self.history_tab, self.jobs, self.load_history_store,
+                                              self.colors, self.restore_history_entry)
+        self.history_panel.refresh()
+
+    def record_history(self, kind, text, screenshot=None):
+        """Queue a capture for the history store
+
+        Captures taken before the store has finished opening are held (up to
+        PENDING_HISTORY_LIMIT) and written once it is open.
+
+        Returns:
+            int: Capture id for set_history_response(), or None if history is off
+        """
+        if not self.config_manager.getboolean('History', 'enabled', fallback=True):
+            return None
+        mode = self.config_manager.get('Settings', 'mode')
+        if self.history_store is None:
+            self.open_history_store()
+            if len(self._pending_history) >= PENDING_HISTORY_LIMIT:
+                return None
+            placeholder = next(self._pending_history_ids)
+            self._pending_history[placeholder] = (mode, kind, text, '', screenshot)
+            return placeholder
+        self.flush_pending_history()
+        return self.history_store.record(mode, kind, text, frame=screenshot)
+
+    def set_history_response(self, capture_id, response):
+        """Attach a Gemini response to a capture returned by record_history()"""
+        if capture_id in self._pending_history:
+            mode, kind, text, _, screenshot = self._pending_history[capture_id]
+            self._pending_history[capture_id] = (mode, kind, text, response, screenshot)
+            return
+        capture_id = self._history_ids.pop(capture_id, capture_id)
+        if self.history_store is not None and capture_id > 0:
+            self.history_store.set_response(capture_id, response)
+
+    def restore_history_entry(self, entry):
+        """Show a capture from the history in the output tabs"""
+        self.markdown.cancel()
+        self.text_output.delete("0.0", "end")
+        self.text_output.insert("0.0", entry['text'] + "\n\n")
+        self.response_output.delete("0.0", "end")
+        if entry['response']:
+            if self.config_manager.getboolean('Settings', 'code_formatting'):
+                self.markdown.render(entry['response'])
+            else:
+                self.response_output.insert("0.0", entry['response'])
+            self.tabview.set("AI Response")
+        else:
+            self.tabview.set("Extracted Text")
+        created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+        self.status_var.set(f"Showing capture from {created}")
+
+    def poll_jobs(self):
+        """Deliver job progress and results on the Tk thread, once per frame"""
+        try:
+            self.jobs.poll(max_events=JOB_EVENTS_PER_TICK)
+        finally:
+            self.root.after(JOB_POLL_INTERVAL_MS, self.poll_jobs)
+
+    def start_warmup(self):
+        """Load the OCR engine, OpenCV and an API connection in the background so the first capture is fast"""
+        self.jobs.submit(lambda job: run_warmup(self.config_manager, job.token.event, job.report),
+                         key='warmup', on_progress=self.show_warmup_step, on_result=self.finish_warmup,
+                         on_error=lambda e: self.show_warmup_status(f"Warm-up failed: {str(e)}"))
+
+    def cancel_warmup(self):
+        warmup = self.jobs.active('warmup')
+        if warmup:
+            warmup.cancel()
+
+    def show_warmup_status(self, message):
+        # Never overwrite the status of a capture or request in progress
+        if not self.jobs.active('capture') and not self.jobs.active('gemini'):
+            self.status_var.set(message)
+
+    def show_warmup_step(self, label):
+        self.show_warmup_status(f"Warming up: {label}...")
+
+    def finish_warmup(self, result):
+        self.show_warmup_status(format_warmup(result))
+
     def take_screenshot(self):
         self.status_var.set("Select area for screenshot...")
-        self.root.update()
 
-        # Minimize the window before taking screenshot
+        # Minimize the window and give it time to disappear before selecting
         self.root.iconify()
-        import time
-        time.sleep(0.5)  # Give time for the window to minimize
 
-        try:
-            # Create selection window and wait for region selection
-            def handle_selection(region):
-                if region:
-                    # Take screenshot of selected region
-                    screenshot = ScreenshotTaker.take_screenshot(region=region)
-                    # Process the screenshot before restoring the window
-                    self.process_screenshot(screenshot)
-                    # Restore window after processing
-                    self.root.after(100, self.root.deiconify)
-                else:
-                    # Restore window with a slight delay if cancelled
-                    self.root.after(100, self.root.deiconify)
-                    self.status_var.set("Screenshot cancelled")
-
-            CTkSelectionWindow(self.root, handle_selection)
-        except Exception as e:
-            self.root.deiconify()
-            self.status_var.set(f"Error: {str(e)}")
+        def handle_selection(region):
+            # Restore window with a slight delay
+            self.root.after(100, self.root.deiconify)
+            if not region:
+                self.status_var.set("Screenshot cancelled")
+                return
 
-    def process_screenshot(self, screenshot):
-        try:
-            # Process screenshot based on selected mode
-            self.status_var.set("Processing screenshot...")
-            self.root.update()
-
-            mode = self.config_manager.get('Settings', 'mode')
-
-            # Handle vision analysis mode separately
-            if mode == "vision":
-                analysis_result = self.vision_analyzer.analyze_image_content(screenshot)
-                self.text_output.delete("0.0", "end")
-                self.text_output.insert("0.0", "Vision Analysis Results:\n\n")
-                self.text_output.insert("end", analysis_result)
-                self.status_var.set("Ready")
+            try:
+                from app.core.screenshot import ScreenshotTaker
+                # Capturing is fast; everything after it runs on the job executor
+                screenshot = ScreenshotTaker.take_frame(region=region)
+            except Exception as e:
+                self.status_var.set(f"Error: {str(e)}")
                 return
+            self.process_screenshot(screenshot)
 
-            result = OCRProcessor.process_image(screenshot, mode)
+        self.root.after(500, lambda: CTkSelectionWindow(self.root, handle_selection))
 
-            # Clear previous output
-            self.text_output.delete("0.0", "end")
+    def toggle_watch(self):
+        """Start watching a selected region, or stop the active watch"""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_btn.configure(text="Watch Region", fg_color=self.colors['secondary'])
+            self.status_var.set("Stopped watching")
+            return
 
-            if result['type'] == 'image_analysis':
-                # Format and display image analysis results
-                analysis = result['content']
-                self.text_output.insert("0.0", "Image Analysis Results:\n\n")
-
-                # Colors
-                self.text_output.insert("end", "Colors:\n")
-                self.text_output.insert("end", f"- Dominant colors: {', '.join(analysis['color_analysis']['dominant_colors'])}\n")
-                self.text_output.insert("end", f"- Brightness: {analysis['color_analysis']['brightness']}\n\n")
-
-                # Composition
-                self.text_output.insert("end", "Composition:\n")
-                self.text_output.insert("end", f"- Aspect ratio: {analysis['composition']['aspect_ratio']}\n")
-                self.text_output.insert("end", f"- Complexity: {analysis['composition']['complexity']}\n")
-                self.text_output.insert("end", f"- Orientation: {analysis['composition']['orientation']}\n\n")
-
-                # Objects
-                self.text_output.insert("end", "Detected Objects:\n")
-                if analysis['objects']:
-                    for shape in analysis['objects']:
-                        self.text_output.insert("end", f"- {shape}\n")
-                else:
-                    self.text_output.insert("end", "- No distinct objects detected\n")
+        self.status_var.set("Select area to watch...")
+        self.root.iconify()
 
-                self.status_var.set("Ready")
-                return
-            elif not result['content'].strip():
-                self.text_output.insert("0.0", "No text found in the screenshot.\n\n")
-                self.status_var.set("Ready")
+        def handle_selection(region):
+            self.root.after(100, self.root.deiconify)
+            if not region:
+                self.status_var.set("Watch cancelled")
                 return
 
-            # Display extracted text
-            text = result['content']
-            self.text_output.insert("0.0", text + "\n\n")
+            from app.core.watch import RegionWatcher
+
+            send_to_gemini = bool(self.config_manager.get('API', 'gemini_api_key').strip())
+            self.watcher = RegionWatcher(
+                region,
+                on_update=lambda update: self.jobs.call_soon(self.update_watch_ui, update),
+                on_response=(lambda response, is_code: self.jobs.call_soon(self.update_response_ui, response, is_code))
+                if send_to_gemini else None,
+                config_manager=self.config_manager
+            )
+            self.watcher.start()
+            self.watch_btn.configure(text="Stop Watching", fg_color=self.colors['primary'])
+            self.tabview.set("Extracted Text")
+            self.status_var.set("Watching region...")
+
+        self.root.after(500, lambda: CTkSelectionWindow(self.root, handle_selection))
 
-            # Clear previous text
+    def update_watch_ui(self, update):
+        """Show the latest watched text and what changed (called from main thread)"""
+        if not self.watcher:
+            return
+
+        stats = update['stats']
+        if 'error' in update:
+            self.status_var.set(f"Watch error: {update['error']}")
+            return
+
+        self.text_output.delete("0.0", "end")
+        self.text_output.insert("0.0", update['text'] + "\n")
+        self.status_var.set(
+            f"Watching: +{len(update['added'])}/-{len(update['removed'])} lines | "
+            f"{stats['frames']} frames, {stats['skipped']} unchanged, "
+            f"{stats['tiles_reused']} tiles reused, {stats['queries']} queries"
+        )
+
+    def process_screenshot(self, screenshot):
+        """Process a capture on the job executor; a newer capture supersedes this one"""
+        self.status_var.set("Processing screenshot...")
+        self.progress_var.set("Processing...")
+
+        # The previous capture's response is stale as well
+        stale_request = self.jobs.active('gemini')
+        if stale_request:
+            stale_request.cancel()
+
+        mode = self.config_manager.get('Settings', 'mode')
+        self.jobs.submit(self.run_capture_job, screenshot, mode, key='capture',
+                         on_result=lambda result: self.show_capture_result(result, screenshot),
+                         on_error=self.show_capture_error)
+
+    def run_capture_job(self, job, screenshot, mode):
+        """OCR or analyse a capture (runs on a job worker thread; must not touch widgets)"""
+        from app.core.ocr import OCRProcessor
+        from app.core.image_analysis import ImageAnalyzer
+
+        if mode == "vision":
+            vision_analyzer = self.vision_analyzer
+            analysis = vision_analyzer.analyze_image_content(screenshot)
+            return {
+                'type': 'vision',
+                'content': analysis,
+                'cache_hit': vision_analyzer.last_cache_hit,
+                'upload': vision_analyzer.last_upload
+            }
+
+        ImageAnalyzer.configure(self.config_manager)
+        result = OCRProcessor.process_image(screenshot, mode, cancel_event=job.token.event)
+        job.token.raise_if_cancelled()
+        return result
+
+    def show_capture_error(self, error):
+        self.progress_var.set("")
+        self.text_output.insert("end", f"Error processing screenshot: {str(error)}\n\n")
+        self.status_var.set("Error")
+
+    def show_capture_result(self, result, screenshot=None):
+        """Display a processed capture and send its text to Gemini (called from main thread)"""
+        self.progress_var.set("")
+
+        # Handle vision analysis mode separately
+        if result['type'] == 'vision':
             self.text_output.delete("0.0", "end")
-            self.text_output.insert("0.0", text + "\n\n")
+            self.text_output.insert("0.0", "Vision Analysis Results:\n\n")
+            self.text_output.insert("end", result['content'])
+            self.record_history('vision', result['content'], screenshot)
+            if result['cache_hit']:
+                self.status_var.set("Ready (cached)")
+            elif result['upload']:
+                from app.core.image_encoding import format_upload_stats
+                self.status_var.set(f"Ready ({format_upload_stats(result['upload'])})")
+            else:
+                self.status_var.set("Ready")
+            return
 
-            # Switch to text tab to show extracted content
-            self.tabview.set("Extracted Text")
+        # Clear previous output
+        self.text_output.delete("0.0", "end")
 
-            # If API key is configured, send to Gemini
-            if self.config_manager.get('API', 'gemini_api_key').strip():
-                # Clear previous response before generating a new one
-                self.response_output.delete("0.0", "end")
-                self.progress_var.set("Generating response...")
-                self.tabview.set("AI Response")  # Switch to response tab immediately to show progress
-                self.status_var.set("Sending to Gemini API...")
-                self.root.update()
+        if result['type'] == 'image_analysis':
+            # Format and display image analysis results
+            analysis = result['content']
+            self.text_output.insert("0.0", "Image Analysis Results:\n\n")
+
+            # Colors
+            self.text_output.insert("end", "Colors:\n")
+            self.text_output.insert("end", f"- Dominant colors: {', '.join(analysis['color_analysis']['dominant_colors'])}\n")
+            for color in analysis['color_analysis'].get('palette', []):
+                self.text_output.insert("end", f"  {color['hex']} {color['name']}: {color['coverage']}%\n")
+            self.text_output.insert("end", f"- Brightness: {analysis['color_analysis']['brightness']}\n\n")
+
+            # Composition
+            self.text_output.insert("end", "Composition:\n")
+            self.text_output.insert("end", f"- Aspect ratio: {analysis['composition']['aspect_ratio']}\n")
+            self.text_output.insert("end", f"- Complexity: {analysis['composition']['complexity']}\n")
+            self.text_output.insert("end", f"- Orientation: {analysis['composition']['orientation']}\n\n")
+
+            # Objects
+            self.text_output.insert("end", "Detected Objects:\n")
+            if analysis['objects']:
+                for shape in analysis['objects']:
+                    self.text_output.insert("end", f"- {shape}\n")
+            else:
+                self.text_output.insert("end", "- No distinct objects detected\n")
+            self.record_history('image_analysis', self.text_output.get("0.0", "end").strip(), screenshot)
+
+            speculation = result.get('speculation')
+            if speculation:
+                self.status_var.set(f"Ready (image analysis ran alongside OCR, saved {speculation['saved_ms']:.0f} ms)")
+            else:
+                self.status_var.set("Ready")
+            return
+        elif not result['content'].strip():
+            self.text_output.insert("0.0", "No text found in the screenshot.\n\n")
+            self.status_var.set("Ready")
+            return
 
-                # Determine if the content is code-related
-                mode = self.config_manager.get('Settings', 'mode')
-                is_code_related = OCRProcessor.detect_code_content(text) if mode == "auto" else (mode == "code")
+        # Display extracted text
+        text = result['content']
+        self.text_output.insert("0.0", text + "\n\n")
+        capture_id = self.record_history('ocr', text, screenshot)
 
-                # Start a thread to process the API request to avoid UI freezing
-                threading.Thread(target=self.process_gemini_request,
-                                args=(text, is_code_related)).start()
+        # Switch to text tab to show extracted content
+        self.tabview.set("Extracted Text")
+
+        # If API key is configured, send to Gemini
+        if self.config_manager.get('API', 'gemini_api_key').strip():
+            # Clear previous response before generating a new one
+            self.response_output.delete("0.0", "end")
+            self.progress_var.set("Generating response...")
+            self.tabview.set("AI Response")  # Switch to response tab immediately to show progress
+            queue_depth = self.gemini_api.limiter().queue_depth
+            if queue_depth:
+                self.status_var.set(f"Waiting for API quota ({queue_depth} request(s) queued)...")
+            elif result['is_code'] and result.get('language'):
+                self.status_var.set(f"Sending to Gemini API ({language_label(result['language'])} code)...")
             else:
-                messagebox.showwarning("API Key Missing",
-                                     "Please set your Gemini API key in Settings > API Configuration")
+                self.status_var.set("Sending to Gemini API...")
 
-        except Exception as e:
-            self.text_output.insert("end", f"Error processing screenshot: {str(e)}\n\n")
-            self.status_var.set("Error")
+            self.jobs.submit(self.run_gemini_job, text, result['is_code'], capture_id, result.get('language'),
+                             key='gemini',
+                             on_progress=self.handle_gemini_progress,
+                             on_result=self.show_gemini_result,
+                             on_error=self.show_gemini_error)
+        else:
+            messagebox.showwarning("API Key Missing",
+                                 "Please set your Gemini API key in Settings > API Configuration")
+
+    def run_gemini_job(self, job, text, is_code_related, capture_id=None, language=None):
+        """Query Gemini, reporting streamed chunks as progress (runs on a job worker thread)"""
+        gemini_api = self.gemini_api
+        streamed = self.config_manager.getboolean('Settings', 'streaming', fallback=True)
+
+        if streamed:
+            job.report(('begin', is_code_related))
+            chunks = gemini_api.stream_gemini(text, is_code_related, language=language)
+            parts = []
+            try:
+                for chunk in chunks:
+                    # Superseded by a newer capture: closing the generator closes the connection
+                    job.token.raise_if_cancelled()
+                    parts.append(chunk)
+                    job.report(('chunk', chunk))
+            finally:
+                chunks.close()
+            response = ''.join(parts)
+        else:
+            response = gemini_api.query_gemini(text, is_code_related, language=language)
+
+        return {
+            'streamed': streamed,
+            'response': response,
+            'capture_id': capture_id,
+            'is_code_related': is_code_related,
+            'timings': gemini_api.last_timings,
+            'cache_hit': gemini_api.last_cache_hit,
+            'prompt_stats': gemini_api.last_prompt_stats
+        }
+
+    def handle_gemini_progress(self, event):
+        kind, value = event
+        if kind == 'begin':
+            self.begin_streaming_response(value)
+        else:
+            self.append_response_chunk(value)
 
-    def process_gemini_request(self, text, is_code_related):
-        try:
-            response = self.gemini_api.query_gemini(text, is_code_related)
+    def show_gemini_result(self, result):
+        if result['capture_id'] is not None:
+            self.set_history_response(result['capture_id'], result['response'])
+        if result['streamed']:
+            self.finish_streaming_response(result['timings'], result['cache_hit'], result['prompt_stats'])
+        else:
+            self.update_response_ui(result['response'], result['is_code_related'],
+                                    result['timings'], result['cache_hit'], result['prompt_stats'])
+
+    def show_gemini_error(self, error):
+        self.stop_following_stream()
+        self.status_var.set(f"Error: {str(error)}")
+
+    def begin_streaming_response(self, is_code_related):
+        """Prepare the response tab for incremental output (called from main thread)"""
+        self.stop_following_stream()
+        if self.config_manager.getboolean('Speech', 'auto_read', fallback=False):
+            self.follow_stream("")
+        self.markdown.cancel()
+        self.response_output.delete("0.0", "end")
+        self._stream_formatted = is_code_related and self.config_manager.getboolean('Settings', 'code_formatting')
+        self._stream_pending = ""
+        self._stream_started = False
 
-            # Use the after method to update UI from the main thread
-            self.root.after(0, self.update_response_ui, response, is_code_related)
+        # Unformatted tail text lives after this mark and is redrawn on each chunk
+        text_widget = self.response_output._textbox
+        text_widget.mark_set("stream_tail", "end-1c")
+        text_widget.mark_gravity("stream_tail", "left")
+
+    def append_response_chunk(self, chunk):
+        """Append a streamed chunk, formatting every block that is complete (called from main thread)"""
+        if self._speech_following:
+            self.speech_service.feed(chunk)
+        if not self._stream_started:
+            self._stream_started = True
+            self.progress_var.set("Receiving response...")
+
+        if not self._stream_formatted:
+            self.response_output.insert("end", chunk)
+            self.response_output.see("end")
+            return
 
-        except Exception as e:
-            self.root.after(0, lambda: self.status_var.set(f"Error: {str(e)}"))
+        complete, self._stream_pending = self.split_complete_markdown(self._stream_pending + chunk)
 
-    def update_response_ui(self, response, is_code_related):
+        text_widget = self.response_output._textbox
+        text_widget.delete("stream_tail", "end")
+        if complete:
+            self.format_code_response(complete)
+            text_widget.mark_set("stream_tail", "end-1c")
+        self.response_output.insert("end", self._stream_pending)
+        self.response_output.see("end")
+
+    def finish_streaming_response(self, timings=None, cache_hit=False, prompt_stats=None):
+        """Format any remaining text and finish the response (called from main thread)"""
+        self.stop_following_stream()
+        if self._stream_formatted:
+            self.response_output._textbox.delete("stream_tail", "end")
+            if self._stream_pending:
+                self.format_code_response(self._stream_pending)
+            self._stream_pending = ""
+
+        self.progress_var.set("")
+        self.set_response_status(timings, cache_hit, prompt_stats)
+        self.animate_response_tab()
+
+    @staticmethod
+    def split_complete_markdown(text):
+        """Split streamed markdown into a part that can be formatted now and a pending tail
+
+        Returns:
+            tuple: (complete text, pending text)
+        """
+        return split_complete(text)
+
+    def set_response_status(self, timings=None, cache_hit=False, prompt_stats=None):
+        from app.core.http_session import format_timings
+
+        if cache_hit:
+            self.status_var.set("Ready (cached response)")
+            return
+
+        details = [part for part in (format_prompt_stats(prompt_stats), format_timings(timings)) if part]
+        self.status_var.set(f"Ready ({', '.join(details)})" if details else "Ready")
+
+    def update_response_ui(self, response, is_code_related, timings=None, cache_hit=False, prompt_stats=None):
         """Update the UI with the Gemini response (called from main thread)"""
         try:
             # Clear previous response
             self.response_output.delete("0.0", "end")
             self.progress_var.set("")  # Clear progress indicator
 
-            # Format the response for code if necessary
+            # Format the response for code if necessary; long responses are inserted over several ticks
+            self.markdown.cancel()
             if is_code_related and self.config_manager.getboolean('Settings', 'code_formatting'):
-                self.format_code_response(response)
+                self.markdown.render(response)
             else:
                 self.response_output.insert("0.0", response)
 
-            self.status_var.set("Ready")
+            self.set_response_status(timings, cache_hit, prompt_stats)
+
+            if self.config_manager.getboolean('Speech', 'auto_read', fallback=False):
+                self.read_aloud(response)
 
             # Add a subtle animation to indicate new content
             self.animate_response_tab()
@@ -416,72 +831,8 @@ class CTkMainWindow:
         animate_color()
 
     def format_code_response(self, response):
-        """Format response to highlight code blocks with improved styling."""
-        # Configure text tags for different elements
-        text_widget = self.response_output._textbox
-        text_widget.tag_configure(
-            "heading",
-            font=("Segoe UI", 12, "bold"),
-            spacing1=10,
-            spacing3=5
-        )
-        text_widget.tag_configure(
-            "code_block",
-            font=("Consolas", 10),
-            background="#F7F9FA",
-            foreground="#2C3E50",
-            spacing1=10,
-            spacing3=10,
-            relief="solid",
-            borderwidth=1
-        )
-        text_widget.tag_configure(
-            "language_tag",
-            font=("Segoe UI", 10, "italic"),
-            foreground="#666666"
-        )
-
-        # Split the response into sections
-        sections = re.split(r'(#{1,6}\s.*?\n|```[\s\S]*?```|\d+\.\s.*?\n|•\s.*?\n|-\s.*?\n)', response)
-
-        for section in sections:
-            if not section or section.isspace():
-                continue
-
-            # Handle headers
-            if re.match(r'#{1,6}\s', section):
-                cleaned_header = re.sub(r'#{1,6}\s', '', section).strip()
-                self.response_output.insert("end", cleaned_header + "\n", "heading")
-
-            # Handle code blocks
-            elif section.startswith('```'):
-                code_content = section.strip('`').strip()
-                lines = code_content.split('\n', 1)
-
-                if len(lines) > 1 and not lines[0].strip().isspace():
-                    language = lines[0].strip()
-                    code = lines[1].rstrip()
-                else:
-                    language = "code"
-                    code = code_content.rstrip()
-
-                self.response_output.insert("end", "\n")
-                if language != "code":
-                    self.response_output.insert("end", f"Language: {language}\n", "language_tag")
-
-                # Insert code with styling
-                self.response_output.insert("end", code + "\n", "code_block")
-                self.response_output.insert("end", "\n")
-
-            # Handle bullet points and numbered lists
-            elif re.match(r'(\d+\.|-|•)\s', section):
-                self.response_output.insert("end", section)
-
-            # Regular text
-            else:
-                cleaned_text = section.strip()
-                if cleaned_text:
-                    self.response_output.insert("end", cleaned_text + "\n")
+        """Append response as formatted markdown right away (used for streamed fragments)"""
+        self.markdown.render_now(response)
 
     def copy_response(self):
         """Copy the current response to clipboard."""
@@ -498,25 +849,63 @@ class CTkMainWindow:
     def speak_response(self):
         """Toggle between reading and stopping the AI response using text-to-speech."""
         if self.speech_service.is_speaking:
+            self._speech_following = False
             self.speech_service.stop()
             self.speak_btn.configure(text="Read Response", fg_color=self.colors['accent'])
             self.set_status("Stopped reading")
             return
 
         response_text = self.response_output.get("0.0", "end").strip()
-        if response_text:
-            # Start speech in a separate thread to prevent UI freezing
-            threading.Thread(target=self.speech_service.speak, args=(response_text,), daemon=True).start()
-            self.speak_btn.configure(text="Stop Reading", fg_color=self.colors['primary'])
-            self.set_status("Reading response...")
-
-            # Add animation to the speak button
-            self.animate_speak_button()
+        streaming = self.jobs.active('gemini') is not None and self._stream_started
+        if streaming:
+            # Read what has arrived so far, then keep up with the stream
+            self.follow_stream(response_text)
+        elif response_text:
+            self.read_aloud(response_text)
         else:
             self.set_status("No response to read")
 
+    def read_aloud(self, text):
+        """Queue text on the speech worker (returns immediately) and show the reading state"""
+        try:
+            self.speech_service.speak(text)
+        except Exception as e:
+            self.show_speech_error(e)
+            return
+        self.start_reading_ui()
+
+    def follow_stream(self, text):
+        """Read the streaming response aloud, sentence by sentence as it arrives"""
+        try:
+            self.speech_service.begin_stream(text)
+        except Exception as e:
+            self.show_speech_error(e)
+            return
+        self._speech_following = True
+        self.start_reading_ui()
+
+    def show_speech_error(self, error):
+        self._speech_following = False
+        self.speak_btn.configure(text="Read Response", fg_color=self.colors['accent'])
+        self.set_status(f"Error: {str(error)}")
+
+    def stop_following_stream(self):
+        """Let speech finish the text received so far once the stream ends or fails"""
+        if self._speech_following:
+            self._speech_following = False
+            self.speech_service.end_stream()
+
+    def start_reading_ui(self):
+        self.speak_btn.configure(text="Stop Reading", fg_color=self.colors['primary'])
+        self.set_status("Reading response...")
+        self.animate_speak_button()
+
     def animate_speak_button(self):
         """Create a pulsing animation for the speak button while speaking"""
+        if self._speak_pulsing:
+            # One loop is already running and keeps going while speech continues
+            return
+        self._speak_pulsing = True
         original_color = self.colors['primary']  # Use primary color as base for stop button
 
         def pulse(count=0):
@@ -526,18 +915,30 @@ class CTkMainWindow:
                 self.speak_btn.configure(fg_color=color)
                 self.root.after(500, lambda: pulse(count + 1))
             else:
+                self._speak_pulsing = False
                 # Reset to accent color when stopped
                 self.speak_btn.configure(text="Read Response", fg_color=self.colors['accent'])
+                if self.speech_service.error is not None:
+                    # The engine failed to start after the text was queued
+                    self.show_speech_error(self.speech_service.error)
+                elif self.status_var.get() == "Reading response...":
+                    from app.core.speech import format_speech_stats
+                    details = format_speech_stats(self.speech_service.stats())
+                    self.set_status(f"Finished reading ({details})" if details else "Finished reading")
 
         pulse()
 
     def clear_output(self):
+        self.markdown.cancel()
         self.text_output.delete("0.0", "end")
         self.response_output.delete("0.0", "end")
         self.progress_var.set("")
         self.status_var.set("Output cleared")
-        # Stop any ongoing speech
-        self.speech_service.stop()
+        self.cancel_warmup()
+        # Stop any ongoing speech (without starting the engine just to stop it)
+        self._speech_following = False
+        if self._speech_service:
+            self._speech_service.stop()
 
         # Add a brief animation to confirm clear
         original_color = self.clear_btn.cget("fg_color")
@@ -546,4 +947,10 @@ class CTkMainWindow:
 
     def run(self):
         self.root.mainloop()
+        self.jobs.shutdown()
+        if self._history_store is not None:
+            # Commit captures still waiting in the write queue
+            self._history_store.close()
+        if self.watcher:
+            self.watcher.stop()
         self.hotkey_manager.stop_listening()
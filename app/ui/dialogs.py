@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import simpledialog, messagebox, ttk
-import keyboard
 from app.ui.ctk_theme import CTkTheme
 
 class PreferencesDialog:
@@ -41,6 +40,15 @@ class PreferencesDialog:
         )
         code_format_check.pack(anchor=tk.W, pady=5)
 
+        # Streaming option
+        streaming_var = tk.BooleanVar(value=self.config_manager.getboolean('Settings', 'streaming', fallback=True))
+        streaming_check = ttk.Checkbutton(
+            settings_frame,
+            text="Show AI responses as they are generated",
+            variable=streaming_var
+        )
+        streaming_check.pack(anchor=tk.W, pady=5)
+
         # Button container
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=(20, 0))
@@ -48,6 +56,7 @@ class PreferencesDialog:
         # Save button
         def save_preferences():
             self.config_manager.set('Settings', 'code_formatting', str(code_format_var.get()))
+            self.config_manager.set('Settings', 'streaming', str(streaming_var.get()))
             pref_window.destroy()
             self.status_callback("Preferences saved")
 
@@ -80,6 +89,8 @@ class HotkeyDialog:
         self.status_callback = status_callback
 
     def open(self):
+        import keyboard
+
         # Show dialog explaining how to set a new hotkey
         messagebox.showinfo("Change Hotkey",
                           f"Current hotkey is: {self.config_manager.get('API', 'hotkey')}\n\n"
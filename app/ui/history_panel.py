@@ -0,0 +1,185 @@
+import io
+import time
+import tkinter as tk
+import customtkinter as ctk
+
+# Results fetched per query; further pages load when the list is scrolled to the end
+PAGE_SIZE = 50
+# Typing pauses this long before a search runs
+SEARCH_DELAY_MS = 150
+# Scroll position (fraction of the list) that triggers loading the next page
+LOAD_MORE_AT = 0.9
+
+
+def format_entry(entry):
+    """One list line for a search result"""
+    created = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created']))
+    return f"{created}  [{entry['mode']}]  {entry['snippet']}"
+
+
+class HistoryPanel:
+    """Searchable list of past captures, shown in the History tab
+
+    The widgets are only created when the tab is first opened, and every
+    query runs on the job executor, so neither startup nor the Tk thread pays
+    for the history database. Results arrive a page at a time; the next page
+    is requested when the list is scrolled near its end.
+    """
+
+    def __init__(self, master, jobs, get_store, colors, on_restore):
+        """
+        Args:
+            master: Tab frame to build the panel in
+            jobs: JobExecutor used for queries
+            get_store: Callable returning the HistoryStore (called on a worker thread)
+            colors: Theme colours
+            on_restore: Called with a capture dict (text, response, ...) to show it in the main tabs
+        """
+        self.jobs = jobs
+        self.get_store = get_store
+        self.on_restore = on_restore
+        self.entries = []
+        self.selected = None
+        self._query = ""
+        self._exhausted = False
+        self._loading = False
+        self._search_after = None
+        self._thumbnail = None
+
+        master.grid_columnconfigure(0, weight=1)
+        master.grid_columnconfigure(1, weight=1)
+        master.grid_rowconfigure(1, weight=1)
+
+        self.search_entry = ctk.CTkEntry(master, placeholder_text="Search past captures and responses...")
+        self.search_entry.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 5))
+        self.search_entry.bind("<KeyRelease>", self.schedule_search)
+
+        list_frame = ctk.CTkFrame(master, corner_radius=8, border_width=1, border_color=colors['border'])
+        list_frame.grid(row=1, column=0, sticky="nsew", padx=(10, 5), pady=(0, 10))
+        list_frame.grid_columnconfigure(0, weight=1)
+        list_frame.grid_rowconfigure(0, weight=1)
+
+        self.scrollbar = ctk.CTkScrollbar(list_frame)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.listbox = tk.Listbox(
+            list_frame,
+            activestyle="none",
+            borderwidth=0,
+            highlightthickness=0,
+            font=("Segoe UI", 10),
+            yscrollcommand=self.on_scroll
+        )
+        self.listbox.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.scrollbar.configure(command=self.listbox.yview)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+
+        detail_frame = ctk.CTkFrame(master, fg_color="transparent")
+        detail_frame.grid(row=1, column=1, sticky="nsew", padx=(5, 10), pady=(0, 10))
+        detail_frame.grid_columnconfigure(0, weight=1)
+        detail_frame.grid_rowconfigure(1, weight=1)
+
+        self.thumbnail_label = ctk.CTkLabel(detail_frame, text="")
+        self.thumbnail_label.grid(row=0, column=0, sticky="w")
+
+        self.detail_output = ctk.CTkTextbox(
+            detail_frame,
+            wrap="word",
+            font=ctk.CTkFont(family="Segoe UI", size=11),
+            corner_radius=8,
+            border_width=1,
+            border_color=colors['border']
+        )
+        self.detail_output.grid(row=1, column=0, sticky="nsew", pady=5)
+
+        self.restore_btn = ctk.CTkButton(
+            detail_frame,
+            text="Show in Output Tabs",
+            command=self.restore_selected,
+            fg_color=colors['secondary'],
+            hover_color=colors['secondary_light'],
+            corner_radius=8,
+            height=30,
+            state="disabled"
+        )
+        self.restore_btn.grid(row=2, column=0, sticky="e")
+
+    def schedule_search(self, event=None):
+        if self._search_after is not None:
+            self.search_entry.after_cancel(self._search_after)
+        self._search_after = self.search_entry.after(SEARCH_DELAY_MS, self.refresh)
+
+    def refresh(self):
+        """Run the current query from the first page"""
+        self._search_after = None
+        self._query = self.search_entry.get()
+        self._exhausted = False
+        self._loading = True
+        query = self._query
+        self.jobs.submit(lambda job: self.get_store().search(query, PAGE_SIZE, 0), key='history_search',
+                         on_result=lambda rows: self.show_page(rows, reset=True),
+                         on_error=self.show_error)
+
+    def load_more(self):
+        if self._loading or self._exhausted:
+            return
+        self._loading = True
+        query, offset = self._query, len(self.entries)
+        self.jobs.submit(lambda job: self.get_store().search(query, PAGE_SIZE, offset), key='history_search',
+                         on_result=self.show_page, on_error=self.show_error)
+
+    def show_page(self, rows, reset=False):
+        self._loading = False
+        if reset:
+            self.entries = []
+            self.listbox.delete(0, "end")
+        self._exhausted = len(rows) < PAGE_SIZE
+        self.entries.extend(rows)
+        self.listbox.insert("end", *[format_entry(entry) for entry in rows])
+        if reset and not rows:
+            self.listbox.insert("end", "No matching captures" if self._query.strip() else "No captures yet")
+
+    def show_error(self, error):
+        self._loading = False
+        self.listbox.delete(0, "end")
+        self.listbox.insert("end", f"Error reading history: {str(error)}")
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) >= LOAD_MORE_AT and self.entries:
+            self.load_more()
+
+    def on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if not selection or selection[0] >= len(self.entries):
+            return
+        capture_id = self.entries[selection[0]]['id']
+
+        def load(job):
+            store = self.get_store()
+            return store.get(capture_id), store.thumbnail(capture_id)
+
+        self.jobs.submit(load, key='history_entry', on_result=self.show_entry, on_error=self.show_error)
+
+    def show_entry(self, loaded):
+        entry, thumbnail = loaded
+        self.selected = entry
+        self.detail_output.delete("0.0", "end")
+        if entry is None:
+            self.restore_btn.configure(state="disabled")
+            return
+
+        self.detail_output.insert("0.0", entry['text'])
+        if entry['response']:
+            self.detail_output.insert("end", "\n\nResponse:\n\n" + entry['response'])
+        self.restore_btn.configure(state="normal")
+
+        self._thumbnail = None
+        if thumbnail:
+            from PIL import Image
+            image = Image.open(io.BytesIO(thumbnail[0]))
+            self._thumbnail = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        self.thumbnail_label.configure(image=self._thumbnail)
+
+    def restore_selected(self):
+        if self.selected:
+            self.on_restore(self.selected)
@@ -0,0 +1,213 @@
+import re
+import textwrap
+
+TAG_HEADING = 'heading'
+TAG_CODE = 'code_block'
+TAG_LANGUAGE = 'language_tag'
+
+# Characters inserted per Tk call; larger documents continue on the next after() tick
+CHUNK_CHARS = 32_000
+
+# One compiled pattern finds the next block of any type; the body of a code
+# block is skipped with a single search for its closing fence, so the text is
+# scanned once. Fences may be indented (code under a numbered list item).
+_BLOCK_PATTERN = re.compile(
+    r'^(?P<indent>[ \t]*)```(?P<lang>[^\n`]*)\n?'
+    r'|^#{1,6}[ \t]+(?P<heading>[^\n]*)\n?'
+    r'|^(?P<item>[ \t]*(?:\d+\.|-|•)[ \t][^\n]*\n?)',
+    re.MULTILINE
+)
+_FENCE_END = re.compile(r'^[ \t]*```[^\n]*$\n?', re.MULTILINE)
+# Any line opening or closing a fence, as tokenize() pairs them
+_FENCE_LINE = re.compile(r'^[ \t]*```', re.MULTILINE)
+
+
+def configure_tags(text_widget):
+    """Create the tags used by the markdown runs on a Tk Text widget"""
+    text_widget.tag_configure(
+        TAG_HEADING,
+        font=("Segoe UI", 12, "bold"),
+        spacing1=10,
+        spacing3=5
+    )
+    text_widget.tag_configure(
+        TAG_CODE,
+        font=("Consolas", 10),
+        background="#F7F9FA",
+        foreground="#2C3E50",
+        spacing1=10,
+        spacing3=10,
+        relief="solid",
+        borderwidth=1
+    )
+    text_widget.tag_configure(
+        TAG_LANGUAGE,
+        font=("Segoe UI", 10, "italic"),
+        foreground="#666666"
+    )
+
+
+def tokenize(text):
+    """Turn markdown into tag runs in one pass
+
+    Headings lose their '#' markers, fenced code blocks become an optional
+    'Language: ...' line plus the code, list items are kept verbatim and
+    the text in between is stripped into paragraphs. Adjacent runs with the
+    same tag are merged, so the result holds as few runs as possible.
+
+    Args:
+        text: Markdown text
+
+    Returns:
+        list: (text, tag or None) runs in document order
+    """
+    runs = []
+
+    def emit(chunk, tag=None):
+        if runs and runs[-1][1] == tag:
+            runs[-1][0].append(chunk)
+        else:
+            runs.append(([chunk], tag))
+
+    def emit_paragraph(start, end):
+        paragraph = text[start:end].strip()
+        if paragraph:
+            emit(paragraph + "\n")
+
+    position = 0
+    while True:
+        match = _BLOCK_PATTERN.search(text, position)
+        if match is None:
+            break
+        emit_paragraph(position, match.start())
+        position = match.end()
+
+        if match.group('heading') is not None:
+            emit(match.group('heading').strip() + "\n", TAG_HEADING)
+        elif match.group('item') is not None:
+            item = match.group('item')
+            emit(item if item.endswith("\n") else item + "\n")
+        else:
+            # An unterminated fence (e.g. a truncated response) runs to the end of the text
+            end = _FENCE_END.search(text, position)
+            code = text[position:end.start() if end else len(text)]
+            position = end.end() if end else len(text)
+            if match.group('indent'):
+                code = textwrap.dedent(code)
+
+            language = match.group('lang').strip()
+            emit("\n")
+            if language:
+                emit(f"Language: {language}\n", TAG_LANGUAGE)
+            emit(code.rstrip() + "\n", TAG_CODE)
+            emit("\n")
+
+    emit_paragraph(position, len(text))
+    return [(''.join(chunks), tag) for chunks, tag in runs]
+
+
+def split_complete(text):
+    """Split streamed markdown into a part that can be formatted now and a pending tail
+
+    Only whole lines are formatted, and a code block is held back until its
+    closing fence has arrived. Fences are recognised exactly as tokenize()
+    recognises them: at the start of a line, optionally indented.
+
+    Returns:
+        tuple: (complete text, pending text)
+    """
+    boundary = text.rfind('\n') + 1
+    if boundary == 0:
+        return "", text
+
+    # An odd number of fences before the boundary means a code block is still open
+    fence_positions = [m.start() for m in _FENCE_LINE.finditer(text, 0, boundary)]
+    if len(fence_positions) % 2 == 1:
+        boundary = fence_positions[-1]
+
+    return text[:boundary], text[boundary:]
+
+
+def _insert_args(runs):
+    """Flatten runs into Text.insert(index, chars, tags, chars, tags, ...) arguments"""
+    args = []
+    for chunk, tag in runs:
+        args.append(chunk)
+        args.append((tag,) if tag else ())
+    return args
+
+
+def _split_runs(runs, chunk_chars):
+    """Group runs into batches of about chunk_chars characters, splitting long runs at line ends"""
+    batch, size = [], 0
+    for chunk, tag in runs:
+        while chunk:
+            room = chunk_chars - size
+            if len(chunk) <= room:
+                piece, chunk = chunk, ""
+            else:
+                cut = chunk.rfind("\n", 0, room) + 1 or room
+                piece, chunk = chunk[:cut], chunk[cut:]
+            batch.append((piece, tag))
+            size += len(piece)
+            if size >= chunk_chars:
+                yield batch
+                batch, size = [], 0
+    if batch:
+        yield batch
+
+
+def insert_runs(text_widget, runs):
+    """Insert tag runs at the end of a Text widget with a single Tk call"""
+    if runs:
+        text_widget.insert("end", *_insert_args(runs))
+
+
+class MarkdownRenderer:
+    """Renders markdown into a Tk Text widget in batches
+
+    Short documents are inserted immediately. Long ones are inserted
+    chunk_chars at a time, one batch per after() tick, so the UI keeps
+    handling events in between. Starting a new render (or cancel()) drops
+    the batches still pending from the previous one.
+    """
+
+    def __init__(self, text_widget, chunk_chars=CHUNK_CHARS):
+        self.text_widget = text_widget
+        self.chunk_chars = chunk_chars
+        self._generation = 0
+        configure_tags(text_widget)
+
+    def render(self, text, on_done=None):
+        """Append text as formatted markdown
+
+        Args:
+            text: Markdown text
+            on_done: Optional callback run once the last batch is inserted
+        """
+        self._generation += 1
+        generation = self._generation
+        batches = _split_runs(tokenize(text), self.chunk_chars)
+
+        def insert_next():
+            if generation != self._generation:
+                return
+            batch = next(batches, None)
+            if batch is None:
+                if on_done:
+                    on_done()
+                return
+            insert_runs(self.text_widget, batch)
+            if len(text) > self.chunk_chars:
+                self.text_widget.after(0, insert_next)
+            else:
+                insert_next()
+
+        insert_next()
+
+    def render_now(self, text):
+        """Append text as formatted markdown synchronously (for small, streamed fragments)"""
+        insert_runs(self.text_widget, tokenize(text))
+
+    def cancel(self):
+        self._generation += 1
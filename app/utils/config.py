@@ -40,6 +40,12 @@ class ConfigManager:
     def getboolean(self, section, key, fallback=None):
         return self.config.getboolean(section, key, fallback=fallback)
 
+    def getint(self, section, key, fallback=None):
+        return self.config.getint(section, key, fallback=fallback)
+
+    def getfloat(self, section, key, fallback=None):
+        return self.config.getfloat(section, key, fallback=fallback)
+
     def set(self, section, key, value):
         if section not in self.config:
             self.config[section] = {}
@@ -1,6 +1,5 @@
 import threading
 import time
-import keyboard
 
 class HotkeyManager:
     def __init__(self, config_manager):
@@ -16,6 +15,8 @@ class HotkeyManager:
         self.hotkey_thread.start()
 
     def listen_for_hotkey(self):
+        # Imported on the listener thread so loading the hook library doesn't delay the window
+        import keyboard
         hotkey = self.config_manager.get('API', 'hotkey')
         keyboard.add_hotkey(hotkey, self.callback)
 
@@ -0,0 +1,57 @@
+"""Benchmark screen capture rate for each capture backend
+
+Designed to run headless under Xvfb, e.g.:
+    xvfb-run -s "-screen 0 3840x2160x24" python benchmarks/bench_capture.py
+
+Reports frames per second for full-screen and region captures, plus the
+cost of turning a capture into a PIL image as ScreenshotTaker does.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.capture import MSSCaptureBackend, PILCaptureBackend
+from app.core.frame import Frame
+
+DURATION = 3.0
+REGION = (100, 100, 900, 700)
+
+
+def make_backends():
+    for name, factory in (('mss', MSSCaptureBackend), ('pil', PILCaptureBackend)):
+        try:
+            yield name, factory()
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
+
+
+def capture_rate(fn):
+    fn()  # warm up
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        fn()
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+def to_pil(backend, pixels):
+    return Frame(pixels, backend.channel_order).pil
+
+
+def main():
+    print(f"{'backend':>8} {'full fps':>9} {'region fps':>11} {'full+PIL fps':>13} {'frame':>12}")
+    for name, backend in make_backends():
+        frame = backend.grab()
+        full = capture_rate(lambda: backend.grab())
+        region = capture_rate(lambda: backend.grab(region=REGION))
+        with_pil = capture_rate(lambda: to_pil(backend, backend.grab()))
+        size = f"{frame.shape[1]}x{frame.shape[0]}"
+        print(f"{name:>8} {full:>9.1f} {region:>11.1f} {with_pil:>13.1f} {size:>12}")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
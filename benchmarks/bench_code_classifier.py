@@ -0,0 +1,134 @@
+"""Benchmark code detection on a labelled corpus
+
+Compares classify_code in app/core/code_classifier.py with the previous
+regex based OCRProcessor.detect_code_content, reproduced below as
+legacy_detect_code_content. benchmarks/data/code_samples.jsonl holds
+snippets of code, stack traces, programming questions and ordinary prose
+(articles, emails, recipes, UI text), one JSON object per line:
+
+    {"is_code": true, "language": "python", "text": "..."}
+
+Reports accuracy, precision and recall of the code/prose decision, how
+often the language is guessed right, and the median time to classify
+10 KB of code and of prose.
+
+    python benchmarks/bench_code_classifier.py [--verbose]
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.code_classifier import classify_code
+
+CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'code_samples.jsonl')
+TIMING_SIZE = 10 * 1024
+REPEATS = 200
+
+
+def legacy_detect_code_content(text):
+    """detect_code_content as it was before app/core/code_classifier.py"""
+    code_indicators = [
+        r'\b(function|def|class|import|from|var|const|let|for|while|if|else)\b',
+        r'[{};]\s*$',
+        r'(\w+)\((.*?)\)',
+        r'(error|exception|traceback|undefined|null|nil)\b',
+        r'how (do|to|can) I (code|program|implement|debug|fix)',
+        r'(syntax|runtime|compiler) error',
+        r'(algorithm|function|method|api|library)',
+        r'code (snippet|example|sample)',
+    ]
+
+    for pattern in code_indicators:
+        if re.search(pattern, text, re.IGNORECASE):
+            return True
+
+    return False
+
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding='utf-8') as corpus:
+        return [json.loads(line) for line in corpus if line.strip()]
+
+
+def score(samples, detect):
+    """Return (accuracy, precision, recall, false positives, misclassified samples)"""
+    true_positive = false_positive = false_negative = 0
+    wrong = []
+    for sample in samples:
+        predicted = detect(sample['text'])
+        if predicted and sample['is_code']:
+            true_positive += 1
+        elif predicted:
+            false_positive += 1
+        elif sample['is_code']:
+            false_negative += 1
+        if predicted != sample['is_code']:
+            wrong.append(sample)
+
+    correct = len(samples) - len(wrong)
+    precision = true_positive / (true_positive + false_positive) if true_positive + false_positive else 0.0
+    recall = true_positive / (true_positive + false_negative) if true_positive + false_negative else 0.0
+    return correct / len(samples), precision, recall, false_positive, wrong
+
+
+def repeat_to(samples, size):
+    text = '\n\n'.join(sample['text'] for sample in samples)
+    return (text * (size // len(text) + 1))[:size]
+
+
+def median_ms(detect, text):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        detect(text)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure code detection accuracy and speed")
+    parser.add_argument('--verbose', action='store_true', help="list misclassified samples")
+    args = parser.parse_args()
+
+    samples = load_corpus()
+    code_samples = [sample for sample in samples if sample['is_code']]
+    print(f"{len(samples)} samples: {len(code_samples)} code or coding questions, "
+          f"{len(samples) - len(code_samples)} prose\n")
+
+    detectors = [
+        ('legacy regexes', legacy_detect_code_content),
+        ('classify_code', lambda text: classify_code(text)['is_code']),
+    ]
+    code_text = repeat_to(code_samples, TIMING_SIZE)
+    prose_text = repeat_to([sample for sample in samples if not sample['is_code']], TIMING_SIZE)
+
+    print(f"{'detector':>16} {'accuracy':>9} {'precision':>10} {'recall':>7} {'prose as code':>14} "
+          f"{'10 KB code':>11} {'10 KB prose':>12}")
+    for name, detect in detectors:
+        accuracy, precision, recall, false_positives, wrong = score(samples, detect)
+        print(f"{name:>16} {accuracy:>8.1%} {precision:>10.1%} {recall:>7.1%} {false_positives:>14} "
+              f"{median_ms(detect, code_text):>8.3f} ms {median_ms(detect, prose_text):>9.3f} ms")
+        if args.verbose:
+            for sample in wrong:
+                print(f"    missed ({'code' if sample['is_code'] else 'prose'}): {sample['text'][:70]!r}")
+
+    labelled = [sample for sample in code_samples if sample.get('language')]
+    guessed = [classify_code(sample['text'])['language'] for sample in labelled]
+    right = sum(1 for sample, language in zip(labelled, guessed) if language == sample['language'])
+    unknown = sum(1 for language in guessed if language is None)
+    print(f"\nlanguage: {right}/{len(labelled)} right, {unknown} unknown, "
+          f"{len(labelled) - right - unknown} wrong")
+    if args.verbose:
+        for sample, language in zip(labelled, guessed):
+            if language != sample['language']:
+                print(f"    {sample['language']} guessed as {language}: {sample['text'][:60]!r}")
+
+
+if __name__ == "__main__":
+    main()
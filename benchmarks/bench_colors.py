@@ -0,0 +1,95 @@
+"""Benchmark ImageAnalyzer._analyze_colors against the original per-bin loop
+
+Run from the repository root:
+    python benchmarks/bench_colors.py
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.image_analysis import ImageAnalyzer, FrameContext
+
+SIZES = [(1920, 1080), (3840, 2160), (7680, 2160)]
+REPEATS = 20
+
+
+def legacy_analyze_colors(image):
+    """The original implementation: full-resolution hue histogram and a Python loop over bins"""
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    hist = cv2.calcHist([hsv], [0], None, [180], [0, 180])
+
+    dominant_colors = []
+    threshold = 0.1 * image.shape[0] * image.shape[1]
+
+    for i in range(len(hist)):
+        if hist[i] > threshold:
+            hue = i * 2
+            if 0 <= hue <= 30 or 330 <= hue <= 360:
+                dominant_colors.append('red')
+            elif 30 < hue <= 90:
+                dominant_colors.append('yellow')
+            elif 90 < hue <= 150:
+                dominant_colors.append('green')
+            elif 150 < hue <= 210:
+                dominant_colors.append('cyan')
+            elif 210 < hue <= 270:
+                dominant_colors.append('blue')
+            elif 270 < hue < 330:
+                dominant_colors.append('magenta')
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return {
+        'dominant_colors': list(set(dominant_colors)),
+        'brightness': float(np.mean(gray))
+    }
+
+
+def synthetic_screenshot(width, height, seed=0):
+    """Light gray window chrome with a dark editor pane and a few coloured widgets"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 236, dtype=np.uint8)
+    image[height // 10:, width // 5:] = (40, 34, 30)
+    for _ in range(40):
+        x, y = rng.integers(0, width - 200), rng.integers(0, height - 60)
+        image[y:y + 40, x:x + 160] = rng.integers(0, 256, size=3)
+    # Anti-aliasing style noise
+    noise = rng.integers(-6, 7, size=image.shape, dtype=np.int16)
+    return np.clip(image.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def analyze_colors(image):
+    # A fresh context per call so no derived representation is reused between runs
+    return ImageAnalyzer._analyze_colors(FrameContext.from_bgr(image))
+
+
+def time_call(fn, image):
+    fn(image)  # warm up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(image)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    print(f"{'size':>12} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for width, height in SIZES:
+        image = synthetic_screenshot(width, height)
+        legacy_ms = time_call(legacy_analyze_colors, image)
+        new_ms = time_call(analyze_colors, image)
+        size = f"{width}x{height}"
+        print(f"{size:>12} {legacy_ms:>10.2f} {new_ms:>8.2f} {legacy_ms / new_ms:>7.1f}x")
+
+    image = synthetic_screenshot(*SIZES[0])
+    print("\nLegacy dominant colors:", legacy_analyze_colors(image)['dominant_colors'])
+    print("New palette:")
+    for entry in analyze_colors(image)['palette']:
+        print(f"  {entry['hex']} {entry['name']:<8} {entry['coverage']:>5}%")
+
+
+if __name__ == "__main__":
+    main()
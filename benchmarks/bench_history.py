@@ -0,0 +1,97 @@
+"""Benchmark the capture history store
+
+Fills a temporary history database with synthetic OCR captures and
+responses through the batched writer, then times searches with the FTS5
+index against the same searches done with LIKE scans.
+
+    python benchmarks/bench_history.py [--captures 50000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.history import HistoryStore, fts_query
+
+PAGE = 50
+REPEATS = 20
+QUERIES = ['socket', 'thread pool', 'valueerror', 'rend', 'config parser timeout', 'token12345']
+
+VOCABULARY = (
+    "def class import return print value error list dict index thread pool queue socket render "
+    "python java widget config parser timeout request response cache frame window button layout "
+    "exception traceback module function variable string integer loop iterator generator"
+).split()
+
+
+def synthetic_capture(rng, i):
+    text = ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(40, 200))) + f" token{i}"
+    response = ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(80, 400)))
+    return text, response
+
+
+def time_queries(search):
+    rows = []
+    for query in QUERIES:
+        times = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            results = search(query)
+            times.append((time.perf_counter() - start) * 1000)
+        rows.append((query, len(results), statistics.median(times), max(times)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure history writes and search latency")
+    parser.add_argument('--captures', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.db'), max_entries=0)
+
+        start = time.perf_counter()
+        longest_call = 0
+        for i in range(args.captures):
+            text, response = synthetic_capture(rng, i)
+            call = time.perf_counter()
+            capture_id = store.record('auto', 'ocr', text)
+            store.set_response(capture_id, response)
+            longest_call = max(longest_call, time.perf_counter() - call)
+        queued = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+
+        print(f"{args.captures} captures: queued in {queued:.2f} s (slowest call {longest_call * 1000:.2f} ms), "
+              f"committed after {written:.2f} s ({args.captures / written:.0f} captures/s)")
+        print(f"database size {os.path.getsize(store.path) / 1e6:.1f} MB, full-text index: {store.full_text}\n")
+
+        def like_search(query):
+            words = fts_query(query).replace('"', '').replace('*', '').split()
+            condition = ' AND '.join(["(text LIKE ? OR response LIKE ?)"] * len(words))
+            parameters = [f'%{word}%' for word in words for _ in range(2)]
+            return store._read_conn.execute(
+                f"SELECT id FROM captures WHERE {condition} ORDER BY id DESC LIMIT ?", parameters + [PAGE]
+            ).fetchall()
+
+        fts = time_queries(lambda query: store.search(query, PAGE))
+        like = time_queries(like_search)
+
+        print(f"{'query':>24} {'results':>8} {'FTS5 median':>12} {'max':>8} {'LIKE median':>12}")
+        for (query, count, median, worst), (_, _, like_median, _) in zip(fts, like):
+            print(f"{query:>24} {count:>8} {median:>9.2f} ms {worst:>5.2f} ms {like_median:>9.2f} ms")
+
+        start = time.perf_counter()
+        store.search('', PAGE, offset=args.captures // 2)
+        print(f"\nrecent captures, page at offset {args.captures // 2}: {(time.perf_counter() - start) * 1000:.2f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Benchmark markdown rendering of large responses
+
+Compares the single-pass tokenizer and batched inserts in app/ui/markdown.py
+with the previous re.split based format_code_response, reproduced below as
+legacy_format_code_response. Reports parse time, number of Tk insert calls
+and, when a display is available (e.g. under xvfb-run), the total render
+time and the longest stretch the UI thread was blocked.
+
+    python benchmarks/bench_markdown.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.ui.markdown import MarkdownRenderer, configure_tags, tokenize, _split_runs, CHUNK_CHARS
+
+SIZES = [50_000, 200_000]
+REPEATS = 3
+
+
+def synthetic_response(size, seed=0):
+    """Gemini-style answer: headings, prose, lists and many fenced code blocks"""
+    parts = []
+    i = seed
+    while sum(len(p) for p in parts) < size:
+        i += 1
+        parts.append(f"## Step {i}: explanation\n")
+        parts.append("This part explains what the code below does and why it is written this way. " * 3 + "\n\n")
+        parts.append(f"1. First point about step {i}\n2. Second point\n- a bullet\n- another bullet\n\n")
+        body = '\n'.join(f"    result_{j} = compute(value_{j}, offset={j})  # line {j}" for j in range(40))
+        parts.append(f"```python\ndef step_{i}(value):\n{body}\n    return result_0\n```\n\n")
+    return ''.join(parts)
+
+
+def code_dump(size):
+    """One huge fenced block, e.g. a full file pasted back"""
+    lines = []
+    while sum(len(line) + 1 for line in lines) < size:
+        lines.append(f"    print('line {len(lines)}')  # padding to look like real code")
+    return "Here is the full file:\n\n```python\n" + '\n'.join(lines) + "\n```\n"
+
+
+def legacy_format_code_response(text_widget, response):
+    """format_code_response as it was before app/ui/markdown.py"""
+    configure_tags(text_widget)
+    sections = re.split(r'(#{1,6}\s.*?\n|```[\s\S]*?```|\d+\.\s.*?\n|•\s.*?\n|-\s.*?\n)', response)
+
+    for section in sections:
+        if not section or section.isspace():
+            continue
+        if re.match(r'#{1,6}\s', section):
+            cleaned_header = re.sub(r'#{1,6}\s', '', section).strip()
+            text_widget.insert("end", cleaned_header + "\n", "heading")
+        elif section.startswith('```'):
+            code_content = section.strip('`').strip()
+            lines = code_content.split('\n', 1)
+            if len(lines) > 1 and not lines[0].strip().isspace():
+                language = lines[0].strip()
+                code = lines[1].rstrip()
+            else:
+                language = "code"
+                code = code_content.rstrip()
+            text_widget.insert("end", "\n")
+            if language != "code":
+                text_widget.insert("end", f"Language: {language}\n", "language_tag")
+            text_widget.insert("end", code + "\n", "code_block")
+            text_widget.insert("end", "\n")
+        elif re.match(r'(\d+\.|-|•)\s', section):
+            text_widget.insert("end", section)
+        else:
+            cleaned_text = section.strip()
+            if cleaned_text:
+                text_widget.insert("end", cleaned_text + "\n")
+
+
+class CountingText:
+    """Stands in for a Text widget when no display is available; counts insert calls"""
+
+    def __init__(self):
+        self.inserts = 0
+
+    def insert(self, index, *args):
+        self.inserts += 1
+
+    def tag_configure(self, *args, **kwargs):
+        pass
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def bench_parse(name, text):
+    legacy_widget = CountingText()
+    legacy_ms = best_of(lambda: legacy_format_code_response(legacy_widget, text))
+    new_ms = best_of(lambda: list(_split_runs(tokenize(text), CHUNK_CHARS)))
+    batches = list(_split_runs(tokenize(text), CHUNK_CHARS))
+    print(f"{name:>16} {len(text) // 1000:>5} KB  parse: legacy {legacy_ms:>7.1f} ms "
+          f"({legacy_widget.inserts // REPEATS} inserts), single-pass {new_ms:>6.1f} ms ({len(batches)} inserts)")
+
+
+def bench_widget(root, name, text):
+    import tkinter as tk
+
+    widget = tk.Text(root)
+    widget.pack()
+    start = time.perf_counter()
+    legacy_format_code_response(widget, text)
+    root.update()
+    legacy_ms = (time.perf_counter() - start) * 1000
+    widget.destroy()
+
+    widget = tk.Text(root)
+    widget.pack()
+    renderer = MarkdownRenderer(widget)
+    done = []
+    start = time.perf_counter()
+    renderer.render(text, on_done=lambda: done.append(True))
+    # The first batch is inserted synchronously inside render()
+    longest = time.perf_counter() - start
+    while not done:
+        tick = time.perf_counter()
+        root.update()
+        longest = max(longest, time.perf_counter() - tick)
+    new_ms = (time.perf_counter() - start) * 1000
+    widget.destroy()
+
+    print(f"{name:>16} {len(text) // 1000:>5} KB  render: legacy {legacy_ms:>7.1f} ms blocked, "
+          f"batched {new_ms:>7.1f} ms total, longest tick {longest * 1000:.1f} ms")
+
+
+def main():
+    documents = [("mixed", synthetic_response(size)) for size in SIZES] + \
+                [("code dump", code_dump(size)) for size in SIZES]
+
+    for name, text in documents:
+        bench_parse(name, text)
+
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"\nNo display, skipping widget benchmark ({e})")
+        return
+
+    print()
+    for name, text in documents:
+        bench_widget(root, name, text)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark per-call overhead of the OCR backends
+
+Each available backend is timed on a tiny image (almost pure fixed
+overhead: process spawn, temp files, traineddata loading) and on a
+screen-sized text image.
+
+Run from the repository root:
+    python benchmarks/bench_ocr_backends.py
+"""
+import os
+import sys
+import time
+import statistics
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.ocr_backends import PytesseractBackend, TesserocrBackend, ProcessPoolBackend
+
+REPEATS = 20
+
+
+def text_image(width, height, lines):
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    for i in range(lines):
+        draw.text((20, 20 + i * 24), f"{i:03d} The quick brown fox jumps over the lazy dog", fill='black')
+    return image
+
+
+def make_backends():
+    factories = [
+        ('pytesseract', lambda: PytesseractBackend()),
+        ('tesserocr', lambda: TesserocrBackend(pool_size=1)),
+        ('process_pool', lambda: ProcessPoolBackend(workers=2)),
+    ]
+    for name, factory in factories:
+        try:
+            start = time.perf_counter()
+            backend = factory()
+            if hasattr(backend, 'warm_up'):
+                backend.warm_up()
+            yield name, backend, time.perf_counter() - start
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
+
+
+def time_backend(backend, image):
+    backend.image_to_string(image)  # first call outside the measurement
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        backend.image_to_string(image)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def main():
+    tiny = text_image(64, 32, 1)
+    screen = text_image(1920, 1080, 40)
+
+    print(f"{'backend':>14} {'startup ms':>11} {'tiny p50':>9} {'tiny min':>9} {'screen p50':>11}")
+    for name, backend, startup in make_backends():
+        tiny_p50, tiny_min = time_backend(backend, tiny)
+        screen_p50, _ = time_backend(backend, screen)
+        print(f"{name:>14} {startup * 1000:>11.0f} {tiny_p50:>9.1f} {tiny_min:>9.1f} {screen_p50:>11.1f}")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
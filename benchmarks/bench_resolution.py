@@ -0,0 +1,104 @@
+"""Benchmark ImageAnalyzer under different analysis resolution budgets
+
+Reports the analysis time for each budget and how far the results drift
+from the full-resolution analysis of the same frame.
+
+Run from the repository root, optionally with real screenshots:
+    python benchmarks/bench_resolution.py [screenshot.png ...]
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.image_analysis import ImageAnalyzer, FrameContext
+
+BUDGETS = [0, 4_000_000, 2_000_000, 1_000_000, 500_000]
+REPEATS = 5
+
+
+def synthetic_desktop(width, height, seed=0):
+    """Dual-pane desktop with text lines, buttons and a few circular icons"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 240, dtype=np.uint8)
+    image[:, width // 2:] = (37, 30, 30)
+    for y in range(60, height - 20, 28):
+        for pane, color in ((0, (20, 20, 20)), (width // 2, (210, 210, 210))):
+            words = ' '.join('x' * rng.integers(2, 9) for _ in range(rng.integers(3, 10)))
+            cv2.putText(image, words, (pane + 40, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 1, cv2.LINE_AA)
+    for _ in range(12):
+        x, y = int(rng.integers(50, width - 200)), int(rng.integers(50, height - 80))
+        cv2.rectangle(image, (x, y), (x + 140, y + 40), tuple(int(c) for c in rng.integers(0, 256, 3)), -1)
+    for _ in range(6):
+        center = (int(rng.integers(60, width - 60)), int(rng.integers(60, height - 60)))
+        cv2.circle(image, center, 24, (60, 140, 230), -1)
+    return image
+
+
+def analyze(bgr, budget):
+    ctx = FrameContext.from_bgr(bgr, max_pixels=budget)
+    start = time.perf_counter()
+    result = {name: analyzer(ctx) for name, analyzer in ImageAnalyzer._analyzers.items()}
+    elapsed = time.perf_counter() - start
+    metrics = {
+        'brightness': float(np.mean(ctx.gray)),
+        'edge_density': np.count_nonzero(ctx.edges) / ctx.edges.size,
+        'palette': {entry['name']: entry['coverage'] for entry in result['color_analysis']['palette']},
+        'shapes': set(result['objects']['detected_shapes']),
+        'complexity': result['composition']['complexity']
+    }
+    return elapsed, metrics
+
+
+def drift(reference, metrics):
+    names = set(reference['palette']) | set(metrics['palette'])
+    palette_drift = sum(abs(reference['palette'].get(n, 0) - metrics['palette'].get(n, 0)) for n in names)
+    union = reference['shapes'] | metrics['shapes']
+    shape_agreement = len(reference['shapes'] & metrics['shapes']) / len(union) if union else 1.0
+    return {
+        'brightness': abs(reference['brightness'] - metrics['brightness']),
+        'edge_density': abs(reference['edge_density'] - metrics['edge_density']),
+        'palette': palette_drift,
+        'shapes': shape_agreement,
+        'complexity': reference['complexity'] == metrics['complexity']
+    }
+
+
+def bench(name, bgr):
+    height, width = bgr.shape[:2]
+    print(f"\n{name} ({width}x{height}, {width * height / 1e6:.1f} MP)")
+    print(f"{'budget':>10} {'ms':>8} {'bright Δ':>9} {'edge Δ':>8} {'palette Δpp':>12} {'shapes J':>9} {'complexity':>11}")
+
+    reference = None
+    for budget in BUDGETS:
+        times = []
+        for _ in range(REPEATS):
+            elapsed, metrics = analyze(bgr, budget)
+            times.append(elapsed)
+        if reference is None:
+            reference = metrics
+        d = drift(reference, metrics)
+        label = 'full' if not budget else f"{budget / 1e6:.1f} MP"
+        print(f"{label:>10} {min(times) * 1000:>8.1f} {d['brightness']:>9.2f} {d['edge_density']:>8.4f} "
+              f"{d['palette']:>12.1f} {d['shapes']:>9.2f} {'same' if d['complexity'] else 'CHANGED':>11}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            bgr = cv2.imread(path, cv2.IMREAD_COLOR)
+            if bgr is None:
+                print(f"Could not read {path}")
+                continue
+            bench(os.path.basename(path), bgr)
+    else:
+        bench("synthetic 4K", synthetic_desktop(3840, 2160))
+        bench("synthetic dual 4K", synthetic_desktop(7680, 2160, seed=1))
+
+
+if __name__ == "__main__":
+    main()
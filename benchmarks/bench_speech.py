@@ -0,0 +1,240 @@
+"""Benchmark read-aloud latency against a fake pyttsx3 driver
+
+FakeEngine implements the parts of pyttsx3's Engine interface the speech
+worker uses. Each utterance costs a synthesis delay proportional to its
+length before the first word, then WORD_MS per word with 'started-word'
+callbacks, so no audio device or real driver is needed. Reports:
+
+  - time until the first word is heard, speaking the whole response as one
+    utterance (the previous SpeechService.speak) vs. sentence by sentence
+  - how long stop() takes to silence the engine mid-sentence
+  - time to first word while the response is still streaming in
+  - replaying a response from the audio cache, whose clips FakeEngine writes
+    as silent WAV files in save_to_file() and FakePlayer "plays" by waiting
+    for their duration
+  - time to first word of a new read started while the worker is filling
+    the audio cache in the background
+
+    python benchmarks/bench_speech.py
+"""
+import os
+import sys
+import time
+import wave
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.speech import SpeechWorker, split_sentences, format_speech_stats
+from app.core.audio_cache import AudioCache, wav_duration
+
+SYNTH_MS_PER_CHAR = 0.5
+WORD_MS = 20
+STREAM_CHUNK_CHARS = 40
+STREAM_CHUNK_MS = 30
+SAMPLE_RATE = 8000
+
+
+class FakeEngine:
+    """Stands in for pyttsx3.Engine; records when each word would be heard"""
+
+    def __init__(self):
+        self.properties = {'rate': 150, 'volume': 1.0, 'voice': None}
+        self.callbacks = {}
+        self.queued = []
+        self.words_heard = []
+        self._stopped = False
+
+    def connect(self, topic, callback):
+        self.callbacks.setdefault(topic, []).append(callback)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def say(self, text, name=None):
+        self.queued.append(text)
+
+    def save_to_file(self, text, filename, name=None):
+        self.queued.append((text, filename))
+
+    def stop(self):
+        self._stopped = True
+
+    def runAndWait(self):
+        self._stopped = False
+        while self.queued and not self._stopped:
+            text = self.queued.pop(0)
+            if isinstance(text, tuple):
+                # Like the espeak driver, synthesis to a file reports words too
+                for word in text[0].split():
+                    for callback in self.callbacks.get('started-word', []):
+                        callback(None, 0, len(word))
+                    if self._stopped:
+                        break
+                    time.sleep((len(word) + 1) * SYNTH_MS_PER_CHAR / 1000)
+                else:
+                    self._write_silence(*text)
+                continue
+            time.sleep(len(text) * SYNTH_MS_PER_CHAR / 1000)
+            location = 0
+            for word in text.split():
+                for callback in self.callbacks.get('started-word', []):
+                    callback(None, location, len(word))
+                if self._stopped:
+                    break
+                self.words_heard.append(time.perf_counter())
+                time.sleep(WORD_MS / 1000)
+                location += len(word) + 1
+        self.queued.clear()
+
+    @staticmethod
+    def _write_silence(text, filename):
+        frames = int(len(text.split()) * WORD_MS / 1000 * SAMPLE_RATE)
+        with wave.open(filename, 'wb') as clip:
+            clip.setnchannels(1)
+            clip.setsampwidth(2)
+            clip.setframerate(SAMPLE_RATE)
+            clip.writeframes(b'\0\0' * frames)
+
+
+class FakePlayer:
+    """Stands in for the platform audio player; playback starts immediately"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def play(self, path, should_stop):
+        self.engine.words_heard.append(time.perf_counter())
+        end = time.perf_counter() + wav_duration(path)
+        while time.perf_counter() < end:
+            if should_stop():
+                return False
+            time.sleep(0.005)
+        return True
+
+
+def sample_response(paragraphs=12):
+    paragraph = ("The function reads the configuration file and validates every section. "
+                 "Missing keys fall back to their defaults, so older files keep working. "
+                 "Finally the parsed values are cached for the rest of the session. ")
+    return '\n\n'.join(f"## Part {i}\n{paragraph}" for i in range(paragraphs))
+
+
+def new_worker(audio_cache=None):
+    engine = FakeEngine()
+    worker = SpeechWorker(lambda: engine, audio_cache=audio_cache,
+                          player=FakePlayer(engine) if audio_cache else None)
+    worker.wait_ready()
+    return worker, engine
+
+
+def wait_for_first_word(engine, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while not engine.words_heard and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    return engine.words_heard[0] if engine.words_heard else float('nan')
+
+
+def bench_whole_text(text):
+    engine = FakeEngine()
+    threading.Thread(target=lambda: (engine.say(text), engine.runAndWait()), daemon=True).start()
+    start = time.perf_counter()
+    first = wait_for_first_word(engine)
+    engine.stop()
+    return (first - start) * 1000
+
+
+def bench_sentences(text):
+    worker, engine = new_worker()
+    start = time.perf_counter()
+    worker.speak(text)
+    first = wait_for_first_word(engine)
+
+    # Stop partway through a sentence
+    time.sleep(WORD_MS * 3 / 1000)
+    worker.stop()
+    while worker.stats()['stop_ms'] is None:
+        time.sleep(0.001)
+    stats = worker.stats()
+    worker.close()
+    return (first - start) * 1000, stats
+
+
+def bench_stream(text):
+    worker, engine = new_worker()
+    start = time.perf_counter()
+    worker.begin_stream()
+    for offset in range(0, len(text), STREAM_CHUNK_CHARS):
+        worker.feed(text[offset:offset + STREAM_CHUNK_CHARS])
+        if engine.words_heard:
+            break
+        time.sleep(STREAM_CHUNK_MS / 1000)
+    worker.end_stream()
+    first = wait_for_first_word(engine)
+    worker.close()
+    return (first - start) * 1000
+
+
+def read_to_end(worker, engine, text):
+    engine.words_heard.clear()
+    start = time.perf_counter()
+    worker.speak(text)
+    first = wait_for_first_word(engine)
+    while worker.is_speaking:
+        time.sleep(0.005)
+    return (first - start) * 1000, (time.perf_counter() - start) * 1000
+
+
+def bench_replay(text):
+    with tempfile.TemporaryDirectory() as directory:
+        audio_cache = AudioCache(directory)
+        worker, engine = new_worker(audio_cache)
+        sentences = len(set(split_sentences(text)))
+
+        first_live, total_live = read_to_end(worker, engine, text)
+        # The worker caches the sentences once it is idle
+        while audio_cache.stats()['entries'] < sentences:
+            time.sleep(0.01)
+        first_cached, total_cached = read_to_end(worker, engine, text)
+        stats = worker.stats()
+        worker.close()
+    return (first_live, total_live), (first_cached, total_cached), stats
+
+
+def bench_read_during_fill(text):
+    with tempfile.TemporaryDirectory() as directory:
+        worker, engine = new_worker(AudioCache(directory))
+        read_to_end(worker, engine, text)
+        while worker._fill_generation is None:
+            time.sleep(0.001)
+        first, _ = read_to_end(worker, engine, "A new response arrived. It is read straight away.")
+        worker.close()
+    return first
+
+
+def main():
+    text = sample_response()
+    print(f"Response of {len(text)} characters, fake synthesis {SYNTH_MS_PER_CHAR} ms/char, {WORD_MS} ms/word\n")
+
+    whole_ms = bench_whole_text(text)
+    first_ms, stats = bench_sentences(text)
+    stream_ms = bench_stream(text)
+
+    print(f"first word, whole text as one utterance: {whole_ms:>7.0f} ms")
+    print(f"first word, sentence by sentence:        {first_ms:>7.0f} ms ({format_speech_stats(stats)})")
+    print(f"first word, following a stream:          {stream_ms:>7.0f} ms "
+          f"({STREAM_CHUNK_CHARS} chars every {STREAM_CHUNK_MS} ms)")
+
+    live, cached, stats = bench_replay(sample_response(paragraphs=3))
+    print(f"\nreplay, live synthesis:  first word {live[0]:>6.0f} ms, whole text {live[1]:>6.0f} ms")
+    print(f"replay, audio cache:     first word {cached[0]:>6.0f} ms, whole text {cached[1]:>6.0f} ms "
+          f"({format_speech_stats(stats)})")
+    print(f"new read while filling the cache: first word {bench_read_during_fill(sample_response(paragraphs=3)):>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
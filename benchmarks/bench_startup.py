@@ -0,0 +1,125 @@
+"""Benchmark cold start: import-time profile and time until the window is shown
+
+Each measurement runs in a fresh interpreter. Designed to run headless under
+Xvfb, e.g.:
+    xvfb-run python benchmarks/bench_startup.py
+
+Exits with status 1 when the median time-to-window or import time exceeds
+its budget, or when a heavy module (OpenCV, NumPy, the Gemini SDK, the
+speech engine, ...) is loaded before the window appears, so it can guard
+against startup regressions in CI.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+IMPORT_BUDGET_MS = 400
+WINDOW_BUDGET_MS = 1500
+RUNS = 5
+TOP_IMPORTS = 15
+
+# Modules that must only be loaded on first use, after the window is up
+DEFERRED_MODULES = (
+    'cv2', 'numpy', 'requests', 'mss', 'pytesseract', 'tesserocr',
+    'pyttsx3', 'google.generativeai'
+)
+
+UI_MODULES = 'import app.ui.ctk_main_window, app.utils.hotkey, app.core.clients'
+
+
+def child():
+    """Start the app in this process and report timings as JSON on stdout"""
+    start = time.perf_counter()
+    from app.core.clients import ClientRegistry
+    from app.utils.hotkey import HotkeyManager
+    from app.ui.ctk_main_window import CTkMainWindow
+    imported = time.perf_counter()
+
+    config_manager = ClientRegistry().config_manager()
+    window = CTkMainWindow(config_manager, HotkeyManager(config_manager))
+    # Process pending geometry and draw events, i.e. the window is on screen
+    window.root.update()
+    shown = time.perf_counter()
+
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+    print(json.dumps({
+        'import_ms': (imported - start) * 1000,
+        'window_ms': (shown - start) * 1000,
+        'loaded': loaded
+    }))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def import_profile():
+    """Return (module, self ms, cumulative ms) for each import, heaviest first"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', UI_MODULES],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+def measure_window():
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                            cwd=ROOT, capture_output=True, text=True, timeout=120)
+    for line in result.stdout.splitlines():
+        if line.startswith('{'):
+            return json.loads(line)
+    raise RuntimeError(f"Startup run failed:\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start and fail on regressions")
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--import-budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--window-budget-ms', type=float, default=WINDOW_BUDGET_MS)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    rows = import_profile()
+    print(f"Heaviest imports (self time), total {sum(row[1] for row in rows):.0f} ms:")
+    for name, self_ms, cumulative_ms in rows[:TOP_IMPORTS]:
+        print(f"  {self_ms:>8.1f} ms  {cumulative_ms:>8.1f} ms cumulative  {name}")
+
+    runs = [measure_window() for _ in range(args.runs)]
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    window_ms = statistics.median(run['window_ms'] for run in runs)
+    loaded = sorted({name for run in runs for name in run['loaded']})
+
+    print(f"\nMedian of {args.runs} runs: imports {import_ms:.0f} ms (budget {args.import_budget_ms:.0f}), "
+          f"time to window {window_ms:.0f} ms (budget {args.window_budget_ms:.0f})")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"imports took {import_ms:.0f} ms")
+    if window_ms > args.window_budget_ms:
+        failures.append(f"window took {window_ms:.0f} ms to appear")
+    if loaded:
+        failures.append(f"loaded before the window appeared: {', '.join(loaded)}")
+
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()